@@ -0,0 +1,201 @@
+#!/usr/bin/env python
+"""
+Measure the throughput and the memory used by every parser of the http
+access system (the ones in the _OBJECTS dictionaries of the parser modules),
+parsing the pages kept in the cache filled by the test suite (tests/.cache,
+by default); run the tests at least once to populate it.  No network access
+is needed.
+
+Every page is given, as bytes, to every parser, like the access system does;
+for every parser, the best time of the repetitions is used to compute the
+pages and MB parsed per second, and a further pass measures the peak of
+the memory allocated while parsing (with tracemalloc: the memory allocated
+by libxml2 for the trees built by lxml is not included).
+
+The results are written as JSON, to compare them across commits:
+
+    PYTHONPATH=. python benchmarks/bench_parsers.py -o before.json
+    (apply the changes)
+    PYTHONPATH=. python benchmarks/bench_parsers.py -o after.json --compare before.json
+
+With --compare, the exit status is 1 if a parser is slower than the given
+results by more than the threshold (20%, by default).
+
+Usage: PYTHONPATH=. python benchmarks/bench_parsers.py [-h] [-c DIR] [-r REPEAT] [-o FILE]
+    [--compare FILE] [--threshold RATIO] [parser ...]
+"""
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import time
+import timeit
+from argparse import ArgumentParser
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+from imdb import IMDb
+from imdb.parser.http import _ModuleProxy
+from imdb.parser.http.cache import FileSystemCache
+from imdb.parser.http.piculet import _USE_LXML
+
+
+ROOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+
+CACHE_DIR = os.path.join(ROOT_DIR, 'tests', '.cache')
+
+
+def load_pages(path):
+    """Return a list of (url, content, charset) for every cached page."""
+    pages = []
+    for response in FileSystemCache(path, ttl=None).iter_responses():
+        if response.url.startswith('parsed:') or not response.content:
+            continue
+        pages.append((response.url, response.content, response.charset or 'utf-8'))
+    return pages
+
+
+def get_parsers(names=None):
+    """Return a list of (name, parser) for the parsers of the http access
+    system, built by its proxies; names like "movieParser.movie_parser"
+    or "movieParser" select only some of them."""
+    ia = IMDb('http')
+    parsers = []
+    for proxy in vars(ia).values():
+        if not isinstance(proxy, _ModuleProxy):
+            continue
+        module = proxy._moduleName
+        for name in sorted(getattr(proxy, '_OBJECTS')):
+            fullName = '%s.%s' % (module, name)
+            if names and fullName not in names and module not in names:
+                continue
+            parsers.append((fullName, getattr(proxy, name)))
+    return sorted(parsers, key=lambda item: item[0])
+
+
+def parse_all(parser, pages):
+    """Parse every page with the parser; return the number of errors and
+    of the extracted keys."""
+    errors = keys = 0
+    for url, content, charset in pages:
+        try:
+            data = parser.parse(content, encoding=charset)['data']
+        except Exception:
+            errors += 1
+            continue
+        keys += len(data) if isinstance(data, dict) else 0
+    return errors, keys
+
+
+def measure(parser, pages, repeat):
+    """Return the measures of a parser over the pages."""
+    errors, keys = parse_all(parser, pages)
+    best = min(timeit.repeat(lambda: parse_all(parser, pages), number=1, repeat=repeat))
+    size = sum(len(content) for _, content, _ in pages)
+    result = {
+        'pages': len(pages),
+        'bytes': size,
+        'seconds': best,
+        'pages_per_sec': len(pages) / best if best else None,
+        'mb_per_sec': size / 1000000.0 / best if best else None,
+        'peak_memory_kb': None,
+        'errors': errors,
+        'keys': keys
+    }
+    if tracemalloc is not None:
+        tracemalloc.start()
+        try:
+            parse_all(parser, pages)
+            result['peak_memory_kb'] = tracemalloc.get_traced_memory()[1] / 1024.0
+        finally:
+            tracemalloc.stop()
+    return result
+
+
+def get_commit():
+    """Return the current git commit, if known."""
+    try:
+        out = subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR,
+                                      stderr=subprocess.STDOUT)
+    except Exception:
+        return None
+    return out.decode('ascii', 'replace').strip()
+
+
+def compare(results, previous, threshold):
+    """Print the changes from the previous results; return the names of
+    the parsers slower by more than the threshold."""
+    slower = []
+    print('%-60s %10s %10s' % ('parser', 'time', 'memory'), file=sys.stderr)
+    for name, entry in sorted(results['parsers'].items()):
+        old = previous.get('parsers', {}).get(name)
+        if not old or not old.get('seconds'):
+            continue
+        ratio = entry['seconds'] / old['seconds']
+        memory = '-'
+        if entry['peak_memory_kb'] and old.get('peak_memory_kb'):
+            memory = '%+.1f%%' % ((entry['peak_memory_kb'] / old['peak_memory_kb'] - 1) * 100)
+        flag = ''
+        if ratio > 1 + threshold:
+            flag = ' SLOWER'
+            slower.append(name)
+        print('%-60s %+9.1f%% %10s%s' % (name, (ratio - 1) * 100, memory, flag), file=sys.stderr)
+    return slower
+
+
+def main(argv=None):
+    parser = ArgumentParser(description='benchmark of the parsers, over the cached pages')
+    parser.add_argument('names', nargs='*', metavar='parser',
+                        help='parsers to measure, like "movieParser.movie_parser" or "movieParser"')
+    parser.add_argument('-c', '--cache', default=CACHE_DIR, help='directory of the cached pages')
+    parser.add_argument('-r', '--repeat', type=int, default=3, help='repetitions of the measures')
+    parser.add_argument('-o', '--output', help='file to write the JSON results to (default: stdout)')
+    parser.add_argument('--compare', help='JSON results to compare with')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='slowdown reported as a regression (default: 0.2)')
+    args = parser.parse_args(argv)
+    if not os.path.isdir(args.cache):
+        print('no cached pages in %s: run the test suite first' % args.cache, file=sys.stderr)
+        sys.exit(2)
+    logging.disable(logging.CRITICAL)
+    pages = load_pages(args.cache)
+    results = {
+        'commit': get_commit(),
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'lxml': _USE_LXML,
+        'pages': len(pages),
+        'bytes': sum(len(content) for _, content, _ in pages),
+        'repeat': args.repeat,
+        'parsers': {}
+    }
+    print('%-60s %10s %8s %10s' % ('parser', 'pages/s', 'MB/s', 'peak KB'), file=sys.stderr)
+    for name, instance in get_parsers(set(args.names)):
+        entry = results['parsers'][name] = measure(instance, pages, args.repeat)
+        print('%-60s %10.1f %8.2f %10s' % (name, entry['pages_per_sec'] or 0, entry['mb_per_sec'] or 0,
+                                           '%.0f' % entry['peak_memory_kb'] if entry['peak_memory_kb'] else '-'),
+              file=sys.stderr)
+    output = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+        if compare(results, previous, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
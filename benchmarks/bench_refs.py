@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+"""
+Compare the tagging of the references to titles and names (the "(qv)"
+references added by DOMParserBase.add_refs when getRefs is on) done with
+the old alternation regular expression and with RefsMatcher.
+
+The pages are read from the cache filled by the test suite (tests/.cache,
+by default); run the tests at least once to populate it.
+
+Usage: PYTHONPATH=. python benchmarks/bench_refs.py [cache directory] [repetitions]
+"""
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import os
+import re
+import sys
+import timeit
+
+from imdb.parser.http.cache import FileSystemCache
+from imdb.parser.http.utils import DOMParserBase, RefsMatcher, _gather_refs, _putRefs
+
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'tests', '.cache')
+
+
+def regex_put_refs(data, titles, names):
+    """The add_refs implementation based on regular expressions."""
+    re_titles = re.compile(r'(%s)' % '|'.join(re.escape(x) for x in titles), re.U) if titles else None
+    re_names = re.compile(r'(%s)' % '|'.join(re.escape(x) for x in names), re.U) if names else None
+    for i, text in enumerate(data['quotes']):
+        if re_names:
+            text = re_names.sub(r"'\1' (qv)", text)
+        if re_titles:
+            text = re_titles.sub(r'_\1_ (qv)', text)
+        data['quotes'][i] = text
+
+
+def matcher_put_refs(data, titles, names):
+    """The add_refs implementation based on RefsMatcher."""
+    _putRefs(data, RefsMatcher(titles), RefsMatcher(names))
+
+
+def load_pages(path):
+    """Return a list of (url, titles, names, strings) for every cached page
+    with some references."""
+    pages = []
+    parser = DOMParserBase()
+    for response in FileSystemCache(path, ttl=None).iter_responses():
+        if response.url.startswith('parsed:'):
+            continue
+        html = response.content.decode(response.charset or 'utf-8', 'replace')
+        dom = parser.get_dom(html)
+        namesRefs, titlesRefs = _gather_refs(dom)
+        titles = list(titlesRefs)
+        names = list(namesRefs)
+        if not (titles or names):
+            continue
+        strings = [t.strip() for t in dom.xpath('//body//text()') if t.strip()]
+        pages.append((response.url, titles, names, strings))
+    return pages
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else CACHE_DIR
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    if not os.path.isdir(path):
+        print('no cached pages in %s: run the test suite first' % path)
+        sys.exit(1)
+    pages = load_pages(path)
+    totals = [0.0, 0.0]
+    print('%-60s %6s %8s %10s %10s' % ('page', 'refs', 'strings', 'regex', 'matcher'))
+    for url, titles, names, strings in pages:
+        results = []
+        times = []
+        for funct in (regex_put_refs, matcher_put_refs):
+            def run():
+                data = {'quotes': list(strings)}
+                funct(data, titles, names)
+                return data
+            results.append(run())
+            times.append(min(timeit.repeat(run, number=1, repeat=repeat)))
+        if results[0] != results[1]:
+            print('different results for %s' % url)
+            sys.exit(2)
+        totals[0] += times[0]
+        totals[1] += times[1]
+        print('%-60s %6d %8d %8.2fms %8.2fms' % (url[-60:], len(titles) + len(names), len(strings),
+                                                 times[0] * 1000, times[1] * 1000))
+    print('%d pages; regex: %.2fms, matcher: %.2fms' % (len(pages), totals[0] * 1000, totals[1] * 1000))
+
+
+if __name__ == '__main__':
+    main()
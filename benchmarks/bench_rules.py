@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+"""
+Compare the extraction of the data done interpreting the piculet rules
+(Rules.extract) and running the plans compiled from them (Rules.compile,
+used by DOMParserBase.parse_dom), for every parser of
+imdb.parser.http.movieParser.
+
+The pages are read from the cache filled by the test suite (tests/.cache,
+by default); run the tests at least once to populate it.  Every page is
+given to every parser, so also the time spent by the rules that don't
+match anything is measured.
+
+Usage: PYTHONPATH=. python benchmarks/bench_rules.py [cache directory] [repetitions]
+"""
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import logging
+import os
+import sys
+import timeit
+
+from imdb.parser.http import movieParser
+from imdb.parser.http.cache import FileSystemCache
+from imdb.parser.http.piculet import Rules
+
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'tests', '.cache')
+
+
+def load_pages(path):
+    """Return a list of (url, html) for every cached page."""
+    pages = []
+    for response in FileSystemCache(path, ttl=None).iter_responses():
+        if response.url.startswith('parsed:'):
+            continue
+        pages.append((response.url, response.content.decode(response.charset or 'utf-8', 'replace')))
+    return pages
+
+
+def get_parsers():
+    """Return an instance of every parser of the movieParser module."""
+    parsers = {}
+    for (cls,), _ in movieParser._OBJECTS.values():
+        parsers[cls.__name__] = cls()
+    return [parsers[name] for name in sorted(parsers)]
+
+
+def get_doms(parser, pages):
+    """Return the doms of the pages, as they are given to parse_dom."""
+    doms = []
+    for url, html in pages:
+        html = parser.preprocess_string(html).replace('&nbsp;', ' ')
+        dom = parser.get_dom(html)
+        if dom is not None:
+            doms.append(parser.preprocess_dom(dom))
+    return doms
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else CACHE_DIR
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    if not os.path.isdir(path):
+        print('no cached pages in %s: run the test suite first' % path)
+        sys.exit(1)
+    logging.disable(logging.CRITICAL)
+    pages = load_pages(path)
+    totals = [0.0, 0.0]
+    print('%-40s %10s %10s %8s' % ('parser', 'extract', 'compiled', 'speedup'))
+    for parser in get_parsers():
+        doms = get_doms(parser, pages)
+        rules = parser.rules
+        results = []
+        times = []
+        for funct in (lambda dom: Rules(rules).extract(dom), parser._get_rules_plan(rules)):
+            def run():
+                return [funct(dom) for dom in doms]
+            results.append(run())
+            times.append(min(timeit.repeat(run, number=1, repeat=repeat)))
+        if results[0] != results[1]:
+            print('different results for %s' % parser.__class__.__name__)
+            sys.exit(2)
+        totals[0] += times[0]
+        totals[1] += times[1]
+        print('%-40s %8.2fms %8.2fms %7.2fx' % (parser.__class__.__name__, times[0] * 1000, times[1] * 1000,
+                                                times[0] / (times[1] or 1e-9)))
+    print('%d pages; extract: %.2fms, compiled: %.2fms' % (len(pages), totals[0] * 1000, totals[1] * 1000))
+
+
+if __name__ == '__main__':
+    main()
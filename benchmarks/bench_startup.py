@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+"""
+Measure the time spent to start using IMDbPY: "import imdb; imdb.IMDb()"
+is run in a new interpreter with the -X importtime option (Python 3.7 or
+later), and the cumulative import times of the modules are collected.
+
+The modules are compiled before the measurements, so that the time spent
+compiling a changed source is not counted; the best of the repetitions
+is reported for the whole startup and for the slowest modules.
+
+Usage: PYTHONPATH=. python benchmarks/bench_startup.py [repetitions] [number of modules]
+"""
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import compileall
+import os
+import subprocess
+import sys
+import timeit
+
+
+ROOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+
+STATEMENT = 'import imdb; imdb.IMDb()'
+
+
+def run_importtime():
+    """Run the statement in a new interpreter, and return a dictionary
+    of the cumulative import times (in seconds) of the modules, and the
+    total time spent by the interpreter."""
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    env['PYTHONPATH'] = os.pathsep.join([ROOT_DIR] + [p for p in env.get('PYTHONPATH', '').split(os.pathsep) if p])
+    start = timeit.default_timer()
+    proc = subprocess.Popen([sys.executable, '-X', 'importtime', '-c', STATEMENT],
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=env)
+    _, err = proc.communicate()
+    elapsed = timeit.default_timer() - start
+    if proc.returncode != 0:
+        print(err.decode('utf-8', 'replace'))
+        sys.exit(2)
+    times = {}
+    for line in err.decode('utf-8', 'replace').splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative) / 1000000.0
+    return times, elapsed
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    top = int(sys.argv[2]) if len(sys.argv) > 2 else 15
+    compileall.compile_dir(os.path.join(ROOT_DIR, 'imdb'), quiet=1)
+    best = {}
+    elapsed = []
+    for _ in range(repeat):
+        times, total = run_importtime()
+        elapsed.append(total)
+        for name, value in times.items():
+            best[name] = min(value, best.get(name, value))
+    print('%-50s %10s' % ('module', 'cumulative'))
+    for name in sorted(best, key=best.get, reverse=True)[:top]:
+        print('%-50s %8.2fms' % (name, best[name] * 1000))
+    parsers = sorted(name for name in best if name.endswith('Parser') and name.startswith('imdb.parser.'))
+    print('parser modules imported: %s' % (', '.join(parsers) or 'none'))
+    print('%s: import imdb %.2fms, interpreter %.2fms' % (STATEMENT, best.get('imdb', 0) * 1000,
+                                                          min(elapsed) * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -31,7 +31,6 @@ __version__ = VERSION = '6.9dev20200322'
 import logging
 import os
 import sys
-from pkgutil import find_loader
 from types import MethodType, FunctionType
 
 import imdb._logging
@@ -43,12 +42,6 @@ from imdb.utils import build_company_name, build_name, build_title
 PY2 = sys.hexversion < 0x3000000
 
 
-if PY2:
-    import ConfigParser as configparser
-else:
-    import configparser
-
-
 _imdb_logger = logging.getLogger('imdbpy')
 _aux_logger = logging.getLogger('imdbpy.aux')
 
@@ -88,73 +81,56 @@ imdbURL_find = imdbURL_base + 'find?%s'
 confFileName = 'imdbpy.cfg'
 
 
-class ConfigParserWithCase(configparser.ConfigParser):
-    """A case-sensitive parser for configuration files."""
-    def __init__(self, defaults=None, confFile=None, *args, **kwds):
-        """Initialize the parser.
-
-        *defaults* -- defaults values.
-        *confFile* -- the file (or list of files) to parse."""
-        if PY2:
-            configparser.ConfigParser.__init__(self, defaults=defaults)
-        else:
-            super(configparser.ConfigParser, self).__init__(defaults=defaults)
-        if confFile is None:
-            dotFileName = '.' + confFileName
-            # Current and home directory.
-            confFile = [os.path.join(os.getcwd(), confFileName),
-                        os.path.join(os.getcwd(), dotFileName),
-                        os.path.join(os.path.expanduser('~'), confFileName),
-                        os.path.join(os.path.expanduser('~'), dotFileName)]
-            if os.name == 'posix':
-                sep = getattr(os.path, 'sep', '/')
-                # /etc/ and /etc/conf.d/
-                confFile.append(os.path.join(sep, 'etc', confFileName))
-                confFile.append(os.path.join(sep, 'etc', 'conf.d', confFileName))
-            else:
-                # etc subdirectory of sys.prefix, for non-unix systems.
-                confFile.append(os.path.join(sys.prefix, 'etc', confFileName))
-        for fname in confFile:
-            try:
-                self.read(fname)
-            except (configparser.MissingSectionHeaderError,
-                    configparser.ParsingError) as e:
-                _aux_logger.warn('Troubles reading config file: %s' % e)
-            # Stop at the first valid file.
-            if self.has_section('imdbpy'):
-                break
-
-    def optionxform(self, optionstr):
-        """Option names are case sensitive."""
-        return optionstr
-
-    def _manageValue(self, value):
-        """Custom substitutions for values."""
-        if not isinstance(value, str):
-            return value
-        vlower = value.lower()
-        if vlower in ('1', 'on', 'false', '0', 'off', 'yes', 'no', 'true'):
-            return self._convert_to_boolean(vlower)
-        elif vlower == 'none':
-            return None
-        return value
-
-    def get(self, section, option, *args, **kwds):
-        """Return the value of an option from a given section."""
-        value = configparser.ConfigParser.get(self, section, option, *args, **kwds)
-        return self._manageValue(value)
-
-    def items(self, section, *args, **kwds):
-        """Return a list of (key, value) tuples of items of the
-        given section."""
-        if section != 'DEFAULT' and not self.has_section(section):
-            return []
-        keys = configparser.ConfigParser.options(self, section)
-        return [(k, self.get(section, k, *args, **kwds)) for k in keys]
-
-    def getDict(self, section):
-        """Return a dictionary of items of the specified section."""
-        return dict(self.items(section))
+def _config_files():
+    """Return the list of the default configuration files, in the
+    order they are read."""
+    dotFileName = '.' + confFileName
+    # Current and home directory.
+    confFile = [os.path.join(os.getcwd(), confFileName),
+                os.path.join(os.getcwd(), dotFileName),
+                os.path.join(os.path.expanduser('~'), confFileName),
+                os.path.join(os.path.expanduser('~'), dotFileName)]
+    if os.name == 'posix':
+        sep = getattr(os.path, 'sep', '/')
+        # /etc/ and /etc/conf.d/
+        confFile.append(os.path.join(sep, 'etc', confFileName))
+        confFile.append(os.path.join(sep, 'etc', 'conf.d', confFileName))
+    else:
+        # etc subdirectory of sys.prefix, for non-unix systems.
+        confFile.append(os.path.join(sys.prefix, 'etc', confFileName))
+    return confFile
+
+
+# Options read from the default configuration files, by the
+# modification time and size of the files.
+_config_cache = {}
+
+
+def _read_config(*arguments, **keywords):
+    """Return a dictionary with the options of the 'imdbpy' section of the
+    configuration files; the arguments are passed to ConfigParserWithCase.
+    The default files are parsed only if some of them exist, and the
+    options are cached until the files are changed."""
+    if arguments or keywords.get('defaults') is not None or keywords.get('confFile') is not None:
+        from imdb._config import ConfigParserWithCase
+        return ConfigParserWithCase(*arguments, **keywords).getDict('imdbpy')
+    state = []
+    for fname in _config_files():
+        try:
+            stat = os.stat(fname)
+        except OSError:
+            continue
+        state.append((fname, stat.st_mtime, stat.st_size))
+    if not state:
+        return {}
+    state = tuple(state)
+    options = _config_cache.get(state)
+    if options is None:
+        from imdb._config import ConfigParserWithCase
+        options = ConfigParserWithCase(confFile=[s[0] for s in state]).getDict('imdbpy')
+        _config_cache.clear()
+        _config_cache[state] = options
+    return dict(options)
 
 
 def IMDb(accessSystem=None, *arguments, **keywords):
@@ -163,9 +139,8 @@ def IMDb(accessSystem=None, *arguments, **keywords):
     the preferred access system."""
     if accessSystem is None or accessSystem in ('auto', 'config'):
         try:
-            cfg_file = ConfigParserWithCase(*arguments, **keywords)
             # Parameters set by the code take precedence.
-            kwds = cfg_file.getDict('imdbpy')
+            kwds = _read_config(*arguments, **keywords)
             if 'accessSystem' in kwds:
                 accessSystem = kwds['accessSystem']
                 del kwds['accessSystem']
@@ -194,6 +169,12 @@ def IMDb(accessSystem=None, *arguments, **keywords):
     if accessSystem in ('http', 'https', 'web', 'html'):
         from .parser.http import IMDbHTTPAccessSystem
         return IMDbHTTPAccessSystem(*arguments, **keywords)
+    if accessSystem in ('async', 'asyncio', 'aiohttp'):
+        try:
+            from .parser.http.aio import AsyncIMDbHTTPAccessSystem
+        except ImportError:
+            raise IMDbError('the async access system requires Python 3.5+ and aiohttp')
+        return AsyncIMDbHTTPAccessSystem(*arguments, **keywords)
     if accessSystem in ('s3', 's3dataset', 'imdbws'):
         from .parser.s3 import IMDbS3AccessSystem
         return IMDbS3AccessSystem(*arguments, **keywords)
@@ -209,6 +190,7 @@ def IMDb(accessSystem=None, *arguments, **keywords):
 
 def available_access_systems():
     """Return the list of available data access systems."""
+    from pkgutil import find_loader
     asList = []
     if find_loader('imdb.parser.http') is not None:
         asList.append('http')
@@ -217,6 +199,19 @@ def available_access_systems():
     return asList
 
 
+if sys.version_info >= (3, 7):
+    def __getattr__(name):
+        """Import the parser of the configuration files only when used."""
+        if name == 'ConfigParserWithCase':
+            from imdb._config import ConfigParserWithCase
+            return ConfigParserWithCase
+        raise AttributeError("module 'imdb' has no attribute '%s'" % name)
+else:
+    # Module attributes can't be computed (PEP 562): import it now.
+    from imdb import _config
+    ConfigParserWithCase = _config.ConfigParserWithCase
+
+
 # XXX: I'm not sure this is a good guess.
 #      I suppose that an argument of the IMDb function can be used to
 #      set a default encoding for the output, and then Movie, Person and
@@ -384,7 +379,7 @@ class IMDbBase:
         """Return the list of info set available for companies."""
         return self._get_infoset('get_company_')
 
-    def get_movie(self, movieID, info=Movie.Movie.default_info, modFunct=None):
+    def get_movie(self, movieID, info=Movie.Movie.default_info, modFunct=None, keys=None):
         """Return a Movie object for the given movieID.
 
         The movieID is something used to univocally identify a movie;
@@ -394,14 +389,17 @@ class IMDbBase:
         info is the list of sets of information to retrieve.
 
         If specified, modFunct will be the function used by the Movie
-        object when accessing its text fields (like 'plot')."""
+        object when accessing its text fields (like 'plot').
+
+        If keys is set, only the given keys are retrieved (see the
+        update method)."""
         movieID = self._normalize_movieID(movieID)
         movieID = self._get_real_movieID(movieID)
         movie = Movie.Movie(movieID=movieID, accessSystem=self.accessSystem)
         modFunct = modFunct or self._defModFunct
         if modFunct is not None:
             movie.set_mod_funct(modFunct)
-        self.update(movie, info)
+        self.update(movie, info, keys=keys)
         return movie
 
     get_episode = get_movie
@@ -664,14 +662,19 @@ class IMDbBase:
         # XXX: not really useful...
         return Company.Company(accessSystem=self.accessSystem, *arguments, **keywords)
 
-    def update(self, mop, info=None, override=0):
+    def update(self, mop, info=None, override=0, keys=None):
         """Given a Movie, Person, Character or Company object with only
         partial information, retrieve the required set of information.
 
         info is the list of sets of information to retrieve.
 
         If override is set, the information are retrieved and updated
-        even if they're already in the object."""
+        even if they're already in the object.
+
+        If keys is set, only the given keys are stored in the object
+        (and, if the access system supports it, only the parts of the
+        pages needed to get them are parsed); since the information sets
+        are incomplete, they're not added to the current info."""
         # XXX: should this be a method of the Movie/Person/Character/Company
         #      classes?  NO!  What for instances created by external functions?
         mopID = None
@@ -740,16 +743,20 @@ class IMDbBase:
                 # If requested by the user, reraise the exception.
                 if self._reraise_exceptions:
                     raise
-            keys = None
+            retKeys = None
             if 'data' in ret:
-                res.update(ret['data'])
-                if isinstance(ret['data'], dict):
-                    keys = list(ret['data'].keys())
-            if 'info sets' in ret:
-                for ri in ret['info sets']:
-                    mop.add_to_current_info(ri, keys, mainInfoset=i)
-            else:
-                mop.add_to_current_info(i, keys)
+                data = ret['data']
+                if keys and isinstance(data, dict):
+                    data = dict((k, v) for k, v in data.items() if k in keys)
+                res.update(data)
+                if isinstance(data, dict):
+                    retKeys = list(data.keys())
+            if not keys:
+                if 'info sets' in ret:
+                    for ri in ret['info sets']:
+                        mop.add_to_current_info(ri, retKeys, mainInfoset=i)
+                else:
+                    mop.add_to_current_info(i, retKeys)
             if 'titlesRefs' in ret:
                 mop.update_titlesRefs(ret['titlesRefs'])
             if 'namesRefs' in ret:
@@ -758,13 +765,17 @@ class IMDbBase:
                 mop.update_charactersRefs(ret['charactersRefs'])
         mop.set_data(res, override=0)
 
-    def update_series_seasons(self, mop, season_nums, override=0):
+    def update_series_seasons(self, mop, season_nums, override=0, incremental=False):
         """Given a Movie object with only retrieve the season data.
 
         season_nums is the list of the specific seasons to retrieve.
 
         If override is set, the information are retrieved and updated
-        even if they're already in the object."""
+        even if they're already in the object.
+
+        If incremental is set, only the seasons missing from the
+        'episodes' key of the object are retrieved, and merged with
+        the existing ones."""
         mopID = None
         if isinstance(mop, Movie.Movie):
             mopID = mop.movieID
@@ -780,8 +791,11 @@ class IMDbBase:
         info = 'episodes'
 
         res = {}
-        
-        if info in mop.current_info and not override:
+
+        skip_seasons = None
+        if incremental and not override:
+            skip_seasons = list((mop.get('episodes') or {}).keys())
+        elif info in mop.current_info and not override:
             return
         _imdb_logger.debug('retrieving "%s" info set', info)
         try:
@@ -789,9 +803,12 @@ class IMDbBase:
         except AttributeError:
             _imdb_logger.error('unknown information set "%s"', info)
             # Keeps going.
-            method = lambda *x: {}
+            method = lambda *x, **kwds: {}
         try:
-            ret = method(mopID, season_nums)
+            if skip_seasons:
+                ret = method(mopID, season_nums, skip_seasons=skip_seasons)
+            else:
+                ret = method(mopID, season_nums)
         except Exception:
             _imdb_logger.critical(
                 'caught an exception retrieving or parsing "%s" info set'
@@ -807,6 +824,13 @@ class IMDbBase:
             res.update(ret['data'])
             if isinstance(ret['data'], dict):
                 keys = list(ret['data'].keys())
+        if skip_seasons:
+            # Merge the new seasons with the ones already in the object.
+            episodes = dict(mop.get('episodes') or {})
+            episodes.update(res.get('episodes') or {})
+            res['episodes'] = episodes
+            res['number of episodes'] = sum(len(eps) for eps in episodes.values())
+            keys = list(res.keys())
         if 'info sets' in ret:
             for ri in ret['info sets']:
                 mop.add_to_current_info(ri, keys, mainInfoset=info)
@@ -0,0 +1,91 @@
+# Copyright 2004-2020 Davide Alberani <da@erlug.linux.it>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+
+"""
+This module provides the parser of the configuration files used by the
+:func:`imdb.IMDb` function; it's imported only when a configuration file
+is found, since the configparser module is not needed otherwise.
+"""
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import logging
+
+from imdb import PY2, _config_files
+
+if PY2:
+    import ConfigParser as configparser
+else:
+    import configparser
+
+
+_aux_logger = logging.getLogger('imdbpy.aux')
+
+
+class ConfigParserWithCase(configparser.ConfigParser):
+    """A case-sensitive parser for configuration files."""
+    def __init__(self, defaults=None, confFile=None, *args, **kwds):
+        """Initialize the parser.
+
+        *defaults* -- defaults values.
+        *confFile* -- the file (or list of files) to parse."""
+        if PY2:
+            configparser.ConfigParser.__init__(self, defaults=defaults)
+        else:
+            super(configparser.ConfigParser, self).__init__(defaults=defaults)
+        if confFile is None:
+            confFile = _config_files()
+        for fname in confFile:
+            try:
+                self.read(fname)
+            except (configparser.MissingSectionHeaderError,
+                    configparser.ParsingError) as e:
+                _aux_logger.warn('Troubles reading config file: %s' % e)
+            # Stop at the first valid file.
+            if self.has_section('imdbpy'):
+                break
+
+    def optionxform(self, optionstr):
+        """Option names are case sensitive."""
+        return optionstr
+
+    def _manageValue(self, value):
+        """Custom substitutions for values."""
+        if not isinstance(value, str):
+            return value
+        vlower = value.lower()
+        if vlower in ('1', 'on', 'false', '0', 'off', 'yes', 'no', 'true'):
+            return self._convert_to_boolean(vlower)
+        elif vlower == 'none':
+            return None
+        return value
+
+    def get(self, section, option, *args, **kwds):
+        """Return the value of an option from a given section."""
+        value = configparser.ConfigParser.get(self, section, option, *args, **kwds)
+        return self._manageValue(value)
+
+    def items(self, section, *args, **kwds):
+        """Return a list of (key, value) tuples of items of the
+        given section."""
+        if section != 'DEFAULT' and not self.has_section(section):
+            return []
+        keys = configparser.ConfigParser.options(self, section)
+        return [(k, self.get(section, k, *args, **kwds)) for k in keys]
+
+    def getDict(self, section):
+        """Return a dictionary of items of the specified section."""
+        return dict(self.items(section))
@@ -29,31 +29,44 @@ from __future__ import absolute_import, division, print_function, unicode_litera
 import logging
 import socket
 import ssl
+import threading
+import time
+import zlib
 from codecs import lookup
 import warnings
+from contextlib import contextmanager
+from functools import partial
+from importlib import import_module
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+except ImportError:
+    # Python 2 without the futures package.
+    ThreadPoolExecutor = None
 
 from imdb import PY2
-from imdb import IMDbBase
+from imdb import IMDbBase, Movie, Person
 from imdb.utils import analyze_title
 from imdb._exceptions import IMDbDataAccessError, IMDbParserError
 
-from . import (
-    companyParser,
-    movieParser,
-    personParser,
-    searchMovieParser,
-    searchMovieAdvancedParser,
-    searchPersonParser,
-    searchCompanyParser,
-    searchKeywordParser,
-    topBottomParser
-)
+from .cache import CachedResponse, ParseCache, ResponseCache, make_cache
+from . import timing
+from .parsepool import ParsePool
+from .timing import TimingStats
+
+from .throttling import CircuitBreaker, RetryPolicy, get_error_info, get_rate_limiter
 
 if PY2:
     from urllib import quote_plus
     from urllib2 import HTTPSHandler, ProxyHandler, build_opener
+    from urlparse import urlparse
 else:
-    from urllib.parse import quote_plus
+    from urllib.parse import quote_plus, urlparse
     from urllib.request import HTTPSHandler, ProxyHandler, build_opener
 
 # Logger for miscellaneous functions.
@@ -61,20 +74,29 @@ _aux_logger = logging.getLogger('imdbpy.parser.http.aux')
 
 
 class _ModuleProxy:
-    """A proxy to instantiate and access parsers."""
-    def __init__(self, module, defaultKeys=None):
-        """Initialize a proxy for the given module; defaultKeys, if set,
-        muste be a dictionary of values to set for instanced objects."""
+    """A proxy to instantiate and access parsers; the module of the parsers
+    is imported only when one of them is used for the first time."""
+    def __init__(self, moduleName, defaultKeys=None):
+        """Initialize a proxy for the module with the given name, in this
+        package; defaultKeys, if set, muste be a dictionary of values
+        to set for instanced objects."""
         if defaultKeys is None:
             defaultKeys = {}
         self._defaultKeys = defaultKeys
-        self._module = module
+        self._moduleName = moduleName
 
     def __getattr__(self, name):
         """Called only when no look-up is found."""
-        _sm = self._module
+        if name.startswith('__'):
+            raise AttributeError(name)
+        _sm = self.__dict__.get('_module')
+        if _sm is None:
+            _sm = import_module('.' + self._moduleName, __name__)
+            self._module = _sm
         # Read the _OBJECTS dictionary to build the asked parser.
         if name in _sm._OBJECTS:
+            # The parsers keep the state of a page in the context of
+            # a single call: the same instance is used by every thread.
             _entry = _sm._OBJECTS[name]
             # Initialize the parser.
             kwds = {}
@@ -85,18 +107,102 @@ class _ModuleProxy:
             # Set attribute to the object.
             for key in attrsToSet:
                 setattr(obj, key, attrsToSet[key])
+            # Used to build the same parser in the processes of a ParsePool.
+            obj._objectName = (_sm.__name__, name)
             setattr(self, name, obj)
             return obj
         return getattr(_sm, name)
 
 
+# Size of the chunks read from the network.
+_CHUNK_SIZE = 64 * 1024
+
+# Content codings understood by IMDbURLopener.
+ACCEPT_ENCODING = 'gzip, deflate, br' if brotli is not None else 'gzip, deflate'
+_DECODING_ERRORS = (zlib.error,) if brotli is None else (zlib.error, brotli.error)
+
+
+class _Decompressor(object):
+    """Incrementally decode a content compressed with gzip, deflate
+    or (if the brotli package is installed) br."""
+    def __init__(self, encoding):
+        self.encoding = encoding
+        if encoding == 'br':
+            self._decompressor = brotli.Decompressor()
+        elif encoding == 'deflate':
+            # Some servers send raw deflate data, without the zlib header:
+            # the format is detected looking at the first chunk.
+            self._decompressor = None
+        else:
+            self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+    def decompress(self, chunk):
+        if self._decompressor is None:
+            wbits = zlib.MAX_WBITS
+            if chunk[:1] and (ord(chunk[:1]) & 0x0f) != 8:
+                wbits = -zlib.MAX_WBITS
+            self._decompressor = zlib.decompressobj(wbits)
+        if self.encoding == 'br':
+            return self._decompressor.process(chunk)
+        return self._decompressor.decompress(chunk)
+
+    def flush(self):
+        if self._decompressor is None or self.encoding == 'br':
+            return b''
+        # The content may be truncated (e.g. by a Range header):
+        # return what was decoded so far.
+        return self._decompressor.flush()
+
+
+def read_content(response, encoding=None, consumer=None):
+    """Read the whole body of the given response, decoding it as it
+    arrives if compressed with one of the supported content codings.
+
+    If consumer is set, its feed method is called with every decoded
+    chunk; the reading stops as soon as it returns True."""
+    encoding = (encoding or '').strip().lower()
+    decompressor = None
+    if encoding in ('x-gzip', 'gzip', 'deflate') or (encoding == 'br' and brotli is not None):
+        decompressor = _Decompressor(encoding.replace('x-', ''))
+    else:
+        if encoding not in ('', 'identity'):
+            _aux_logger.warning('unsupported content encoding: %s', encoding)
+        if consumer is None:
+            return response.read()
+    chunks = []
+    try:
+        while True:
+            chunk = response.read(_CHUNK_SIZE)
+            if not chunk:
+                break
+            if decompressor is not None:
+                chunk = decompressor.decompress(chunk)
+            chunks.append(chunk)
+            if consumer is not None and consumer.feed(chunk):
+                return b''.join(chunks)
+        if decompressor is not None:
+            chunk = decompressor.flush()
+            chunks.append(chunk)
+            if consumer is not None:
+                consumer.feed(chunk)
+    except _DECODING_ERRORS as e:
+        raise IMDbDataAccessError(
+            {'errmsg': 'unable to decode a %s content: %s' % (encoding, e),
+             'exception type': e.__class__.__name__,
+             'original exception': e}
+        )
+    return b''.join(chunks)
+
+
 class _FakeURLOpener(object):
     """Fake URLOpener object, used to return empty strings instead of
     errors.
     """
-    def __init__(self, url, headers):
-        self.url = url
+    def __init__(self, url, headers, code=404):
+        # The handlers receive a Request object, instead of the URL.
+        self.url = getattr(url, 'full_url', url)
         self.headers = headers
+        self.code = code
 
     def read(self, *args, **kwds):
         return ''
@@ -123,6 +229,9 @@ class IMDbHTTPSHandler(HTTPSHandler, object):
                 self._logger.warn('404 code returned for %s: %s (headers: %s)',
                                   url, errmsg, headers)
             return _FakeURLOpener(url, headers)
+        if errcode == 304:
+            # Not modified: the cached copy of the page is still valid.
+            return _FakeURLOpener(url, headers, code=304)
         raise IMDbDataAccessError(
             {'url': 'http:%s' % url,
              'errcode': errcode,
@@ -149,19 +258,32 @@ class IMDbHTTPSHandler(HTTPSHandler, object):
         )
 
 
-class IMDbURLopener:
+class IMDbURLopener(object):
     """Fetch web pages and handle errors."""
     _logger = logging.getLogger('imdbpy.parser.http.urlopener')
 
     def __init__(self, *args, **kwargs):
-        self._last_url = ''
+        self._local = threading.local()
         self.https_handler = IMDbHTTPSHandler(logger=self._logger)
         self.proxies = {}
+        self.cache = None
+        # Maximum number of requests per second to the same host (None
+        # for no limit), and size of the bursts.
+        self.rateLimit = None
+        self.rateBurst = None
+        self.retryPolicy = RetryPolicy()
+        # Consecutive failures before the requests to a host are suspended,
+        # and for how many seconds.
+        self.failureThreshold = 5
+        self.recoveryTimeout = 30
+        # Circuit breakers of this opener, by host.
+        self.circuitBreakers = {}
         self.addheaders = []
         for header in ('User-Agent', 'User-agent', 'user-agent'):
             self.del_header(header)
         self.set_header('User-Agent', 'Mozilla/5.0')
         self.set_header('Accept-Language', 'en-us,en;q=0.5')
+        self.set_header('Accept-Encoding', ACCEPT_ENCODING)
 
     def get_proxy(self):
         """Return the used proxy, or an empty string."""
@@ -198,14 +320,73 @@ class IMDbURLopener:
                 del self.addheaders[index]
                 break
 
-    def retrieve_unicode(self, url, size=-1):
-        """Retrieves the given URL, and returns a unicode string,
-        trying to guess the encoding of the data (assuming utf8
-        by default)"""
+    def _get_last_url(self):
+        return getattr(self._local, 'last_url', '')
+
+    def _set_last_url(self, url):
+        self._local.last_url = url
+
+    # The last retrieved URL is kept per-thread, so that concurrent
+    # requests don't overwrite each other's value.
+    _last_url = property(_get_last_url, _set_last_url)
+
+    def decode_content(self, content, server_encode=None):
+        """Return the given page as a unicode string, using the encoding
+        declared by the server or, if missing, by the content-type HTML
+        meta tag (assuming utf8 by default)."""
+        if isinstance(content, str):
+            return content
+        clock = timing.start(timing.page_name(self._last_url or ''))
+        content = str(content, self.get_encoding(content, server_encode), 'replace')
+        if clock is not None:
+            clock.lap('decode', len(content))
+        return content
+
+    def get_encoding(self, content, server_encode=None):
+        """Return the encoding of the given page (as bytes), declared
+        by the server or, if missing, by the content-type HTML meta tag
+        (assuming utf8 by default)."""
         encode = None
+        # Otherwise, look at the content-type HTML meta tag.
+        if server_encode is None and content:
+            begin_h = content.find(b'text/html; charset=')
+            if begin_h != -1:
+                end_h = content[19 + begin_h:].find(b'"')
+                if end_h != -1:
+                    server_encode = content[19 + begin_h:19 + begin_h + end_h]
+                    if not PY2:
+                        server_encode = server_encode.decode('ascii', 'replace')
+        if server_encode:
+            try:
+                if lookup(server_encode):
+                    encode = server_encode
+            except (LookupError, ValueError, TypeError):
+                pass
+        if encode is None:
+            encode = 'utf8'
+            # The detection of the encoding is error prone...
+            self._logger.warning('Unable to detect the encoding of the retrieved page [%s];'
+                                 ' falling back to default utf8.', encode)
+        return encode
+
+    def set_cache(self, cache):
+        """Set the cache used to store the retrieved pages; it can be
+        an instance of imdb.parser.http.cache.ResponseCache, a string
+        (see imdb.parser.http.cache.make_cache) or None, to disable it."""
+        self.cache = make_cache(cache)
+
+    def fetch(self, url, size=-1, headers=None, consumer=None):
+        """Retrieve the given URL, sending the optional extra headers;
+        return a tuple with the content (as bytes), the charset declared
+        by the server, the headers of the response, the final URL and
+        the HTTP status code.
+
+        If consumer is set, it's reset with the charset of the page and
+        then fed with the content while it's read (see read_content)."""
+        extra_headers = list((headers or {}).items())
+        if size != -1:
+            extra_headers.append(('Range', 'bytes=0-%d' % size))
         try:
-            if size != -1:
-                self.set_header('Range', 'bytes=0-%d' % size)
             handlers = []
             if 'http' in self.proxies:
                 proxy_handler = ProxyHandler({
@@ -215,51 +396,158 @@ class IMDbURLopener:
                 handlers.append(proxy_handler)
             handlers.append(self.https_handler)
             uopener = build_opener(*handlers)
-            uopener.addheaders = list(self.addheaders)
+            uopener.addheaders = list(self.addheaders) + extra_headers
             response = uopener.open(url)
-            content = response.read()
-            self._last_url = response.url
             # Maybe the server is so nice to tell us the charset...
             if PY2:
                 server_encode = response.headers.getparam('charset') or None
             else:
                 server_encode = response.headers.get_content_charset(None)
-            # Otherwise, look at the content-type HTML meta tag.
-            if server_encode is None and content:
-                begin_h = content.find(b'text/html; charset=')
-                if begin_h != -1:
-                    end_h = content[19 + begin_h:].find('"')
-                    if end_h != -1:
-                        server_encode = content[19 + begin_h:19 + begin_h + end_h]
-            if server_encode:
-                try:
-                    if lookup(server_encode):
-                        encode = server_encode
-                except (LookupError, ValueError, TypeError):
-                    pass
-            if size != -1:
-                self.del_header('Range')
+            if consumer is not None:
+                consumer.reset(server_encode)
+            content = read_content(response, response.headers.get('Content-Encoding'), consumer)
+            code = getattr(response, 'code', None) or 200
             response.close()
         except IOError as e:
-            if size != -1:
-                # Ensure that the Range header is removed.
-                self.del_header('Range')
+            if getattr(e, 'code', None) == 304:
+                # Not modified: the cached copy of the page is still valid.
+                return b'', None, e.headers, url, 304
             raise IMDbDataAccessError(
                 {'errcode': e.errno,
-                 'errmsg': str(e.strerror),
+                 'errmsg': str(e.strerror or e),
+                 'headers': getattr(e, 'headers', None),
                  'url': url,
                  'proxy': self.get_proxy(),
                  'exception type': 'IOError',
                  'original exception': e}
             )
-        if encode is None:
-            encode = 'utf8'
-            # The detection of the encoding is error prone...
-            self._logger.warn('Unable to detect the encoding of the retrieved page [%s];'
-                              ' falling back to default utf8.', encode)
-        if isinstance(content, str):
-            return content
-        return str(content, encode, 'replace')
+        return content, server_encode, response.headers, response.url, code
+
+    def get_circuit_breaker(self, host):
+        """Return the circuit breaker of the requests to the given host."""
+        breaker = self.circuitBreakers.get(host)
+        if breaker is None:
+            breaker = self.circuitBreakers.setdefault(
+                host, CircuitBreaker(self.failureThreshold, self.recoveryTimeout))
+        return breaker
+
+    def fetch_with_retries(self, fetch, url, size=-1, headers=None):
+        """Call the given fetch function, respecting the rate limit of
+        the host and retrying the transient errors (network errors, "429 Too
+        Many Requests" and server errors); a request that still fails after
+        the retries counts as a failure for the circuit breaker of the host."""
+        host = urlparse(url).netloc
+        breaker = self.get_circuit_breaker(host)
+        limiter = None
+        if self.rateLimit:
+            limiter = get_rate_limiter(host, self.rateLimit, self.rateBurst)
+        breaker.check(url)
+        attempt = 0
+        while True:
+            if limiter is not None:
+                limiter.acquire()
+            try:
+                ret = fetch(url, size, headers)
+            except IMDbDataAccessError as e:
+                status, retryAfter = get_error_info(e)
+                if not self.retryPolicy.is_transient(status):
+                    # The server answered: it's not failing.
+                    breaker.success()
+                    raise
+                if status == 429 and limiter is not None:
+                    limiter.throttle(retryAfter)
+                delay = self.retryPolicy.get_delay(attempt, retryAfter)
+                if delay is None:
+                    breaker.failure()
+                    raise
+                self._logger.warning('error %s retrieving %s; retrying in %.2f seconds',
+                                     status or 'connecting', url, delay)
+                time.sleep(delay)
+                attempt += 1
+                continue
+            breaker.success()
+            if limiter is not None:
+                limiter.success()
+            return ret
+
+    def retrieve(self, url, size=-1, fetch=None, consumer=None):
+        """Retrieve the given URL, using the cache if set; return a tuple
+        with the content (as bytes) and the charset declared by the server.
+
+        fetch, if set, is the function used in place of the fetch method
+        to download the page.
+
+        consumer, if set, is fed with the content of the page (see the
+        fetch method); the returned content is truncated if the consumer
+        stopped the download, and in this case it's not cached."""
+        clock = timing.start(timing.page_name(url))
+        content, server_encode = self._retrieve(url, size, fetch, consumer)
+        if clock is not None:
+            clock.lap('retrieve', len(content or b''))
+        return content, server_encode
+
+    def _retrieve(self, url, size, fetch, consumer):
+        """Retrieve the given URL (see the retrieve method)."""
+        streaming = False
+        if fetch is None:
+            fetch = self.fetch
+            if consumer is not None:
+                fetch = partial(self.fetch, consumer=consumer)
+                streaming = True
+        cache = self.cache
+        if cache is None:
+            content, server_encode, headers, last_url, code = \
+                self.fetch_with_retries(fetch, url, size)
+            self._last_url = last_url
+            if consumer is not None and not streaming:
+                self._feed(consumer, content, server_encode)
+            return content, server_encode
+        cache_url = url if size == -1 else '%s#bytes=0-%d' % (url, size)
+        cached = cache.get(cache_url)
+        if cached is not None and cache.is_fresh(cached):
+            cache.count('hits')
+            self._last_url = cached.finalURL
+            self._feed(consumer, cached.content, cached.charset)
+            return cached.content, cached.charset
+        conditional = {}
+        if cached is not None:
+            if cached.etag:
+                conditional['If-None-Match'] = cached.etag
+            if cached.lastModified:
+                conditional['If-Modified-Since'] = cached.lastModified
+        content, server_encode, headers, last_url, code = \
+            self.fetch_with_retries(fetch, url, size, conditional)
+        if code == 304 and cached is not None:
+            cache.count('revalidated')
+            cached.stored = time.time()
+            cache.set(cached)
+            self._last_url = cached.finalURL
+            self._feed(consumer, cached.content, cached.charset)
+            return cached.content, cached.charset
+        cache.count('misses')
+        self._last_url = last_url
+        if consumer is not None and not streaming:
+            self._feed(consumer, content, server_encode)
+        # Errors (404 pages are returned as empty strings) and truncated
+        # pages are not stored.
+        if content and 200 <= code < 300 and not getattr(consumer, 'stopped', False):
+            cache.set(CachedResponse(cache_url, content, charset=server_encode,
+                                     etag=headers.get('ETag'),
+                                     lastModified=headers.get('Last-Modified'),
+                                     finalURL=last_url))
+        return content, server_encode
+
+    def _feed(self, consumer, content, charset):
+        """Feed the consumer with a page that was not downloaded."""
+        if consumer is not None:
+            consumer.reset(charset)
+            consumer.feed(content)
+
+    def retrieve_unicode(self, url, size=-1, consumer=None):
+        """Retrieves the given URL, and returns a unicode string,
+        trying to guess the encoding of the data (assuming utf8
+        by default)"""
+        return self.decode_content(*self.retrieve(url, size=size, consumer=consumer))
 
 
 class IMDbHTTPAccessSystem(IMDbBase):
@@ -269,27 +557,68 @@ class IMDbHTTPAccessSystem(IMDbBase):
     _http_logger = logging.getLogger('imdbpy.parser.http')
 
     def __init__(self, adultSearch=True, proxy=-1, cookie_id=-1,
-                 timeout=30, cookie_uu=None, *arguments, **keywords):
-        """Initialize the access system."""
+                 timeout=30, cookie_uu=None, cache=None, cacheSize=None,
+                 rateLimit=None, maxRetries=3, maxWorkers=8, parseCache=None,
+                 jsonLD=False, parseProcesses=None, timings=None, *arguments, **keywords):
+        """Initialize the access system.
+
+        *cache* -- the cache used to store the retrieved pages (see the
+                   set_cache method); by default, no cache is used.
+        *cacheSize* -- maximum size, in bytes, of the cache, when
+                       described by a string.
+        *rateLimit* -- maximum number of requests per second to the
+                       web server (no limit, by default).
+        *maxRetries* -- number of times a request is retried, in case
+                        of transient errors.
+        *maxWorkers* -- maximum number of pages retrieved concurrently
+                        (e.g. the seasons of a series).
+        *parseCache* -- the cache used to store the parsed pages (see the
+                        set_parse_cache method); by default, no cache
+                        is used.
+        *jsonLD* -- if true, the main information about movies and persons
+                    is taken from the structured data embedded in their
+                    pages, and only the keys found there are set,
+                    unless other keys are requested.
+        *parseProcesses* -- if set, the pages are parsed by a pool of
+                            this number of processes (see the
+                            set_parse_processes method).
+        *timings* -- if set, the time spent retrieving and parsing the
+                     pages is recorded (see the set_timings method)."""
         IMDbBase.__init__(self, *arguments, **keywords)
         self.urlOpener = IMDbURLopener()
         self._getRefs = True
         self._mdparse = False
+        self._jsonLD = bool(jsonLD)
+        self._maxWorkers = int(maxWorkers or 1)
+        # Pages parsed during the current update, per-thread.
+        self._memo = threading.local()
         self.set_timeout(timeout)
         if proxy != -1:
             self.set_proxy(proxy)
+        if cache:
+            self.set_cache(cache, cacheSize)
+        self._parseCache = None
+        if parseCache:
+            self.set_parse_cache(parseCache)
+        self._parsePool = None
+        if parseProcesses:
+            self.set_parse_processes(parseProcesses)
+        self.set_throttling(rateLimit=rateLimit, maxRetries=maxRetries)
+        if timings:
+            self.set_timings(timings)
         _def = {'_modFunct': self._defModFunct, '_as': self.accessSystem}
 
         # Proxy objects.
-        self.smProxy = _ModuleProxy(searchMovieParser, defaultKeys=_def)
-        self.smaProxy = _ModuleProxy(searchMovieAdvancedParser, defaultKeys=_def)
-        self.spProxy = _ModuleProxy(searchPersonParser, defaultKeys=_def)
-        self.scompProxy = _ModuleProxy(searchCompanyParser, defaultKeys=_def)
-        self.skProxy = _ModuleProxy(searchKeywordParser, defaultKeys=_def)
-        self.mProxy = _ModuleProxy(movieParser, defaultKeys=_def)
-        self.pProxy = _ModuleProxy(personParser, defaultKeys=_def)
-        self.compProxy = _ModuleProxy(companyParser, defaultKeys=_def)
-        self.topBottomProxy = _ModuleProxy(topBottomParser, defaultKeys=_def)
+        self.smProxy = _ModuleProxy('searchMovieParser', defaultKeys=_def)
+        self.smaProxy = _ModuleProxy('searchMovieAdvancedParser', defaultKeys=_def)
+        self.spProxy = _ModuleProxy('searchPersonParser', defaultKeys=_def)
+        self.scompProxy = _ModuleProxy('searchCompanyParser', defaultKeys=_def)
+        self.skProxy = _ModuleProxy('searchKeywordParser', defaultKeys=_def)
+        self.mProxy = _ModuleProxy('movieParser', defaultKeys=_def)
+        self.jldProxy = _ModuleProxy('jsonldParser', defaultKeys=_def)
+        self.pProxy = _ModuleProxy('personParser', defaultKeys=_def)
+        self.compProxy = _ModuleProxy('companyParser', defaultKeys=_def)
+        self.topBottomProxy = _ModuleProxy('topBottomParser', defaultKeys=_def)
 
     def _normalize_movieID(self, movieID):
         """Normalize the given movieID."""
@@ -344,6 +673,93 @@ class IMDbHTTPAccessSystem(IMDbBase):
         """
         self.urlOpener.set_proxy(proxy)
 
+    def set_cache(self, cache, maxSize=None):
+        """Set the cache used to store the retrieved pages.
+
+        It can be an instance of imdb.parser.http.cache.ResponseCache,
+        the string "memory", a string like "sqlite:/path/to/file.db",
+        the path of a directory, or None to disable the cache; maxSize
+        is used only when the cache is described by a string."""
+        if cache and not isinstance(cache, ResponseCache):
+            kwds = {}
+            if maxSize:
+                kwds['maxSize'] = int(maxSize)
+            cache = make_cache(cache, **kwds)
+        self.urlOpener.set_cache(cache or None)
+
+    def set_parse_cache(self, cache, maxSize=None):
+        """Set the cache used to store the results of the parsers, so that
+        unchanged pages are not parsed again.
+
+        Like for set_cache, it can be an instance of
+        imdb.parser.http.cache.ResponseCache, the string "memory", a string
+        like "sqlite:/path/to/file.db", the path of a directory, or None
+        to disable the cache."""
+        if cache and not isinstance(cache, ResponseCache):
+            kwds = {'ttl': None}
+            if maxSize:
+                kwds['maxSize'] = int(maxSize)
+            cache = make_cache(cache, **kwds)
+        self._parseCache = ParseCache(cache) if cache else None
+
+    def set_parse_processes(self, processes):
+        """Parse the retrieved pages in a pool of processes; processes
+        is the number of workers (True for the number of processors),
+        or None to parse in the calling thread.
+
+        The pages are still retrieved by the calling threads, that wait
+        for the results: to parse many pages at the same time, use more
+        threads, e.g. with the get_movies and get_people methods."""
+        if self._parsePool is not None:
+            self._parsePool.shutdown(wait=False)
+            self._parsePool = None
+        if processes:
+            processes = None if processes is True else int(processes)
+            self._parsePool = ParsePool(processes)
+
+    def set_timings(self, timings):
+        """Record the time spent retrieving and parsing the pages, by stage,
+        kind of page, parser and rule (see imdb.parser.http.timing); the
+        TimingStats instance in use is returned.
+
+        timings can be an instance of imdb.parser.http.timing.TimingStats,
+        True for a new one, a function called with every record, or None
+        to stop recording.  The times are recorded for every access
+        system of this process, but not in a pool of processes."""
+        if timings is True:
+            timings = TimingStats()
+        elif timings and not isinstance(timings, TimingStats):
+            timings = TimingStats(callback=timings)
+        timing.set_stats(timings or None)
+        return timing.get_stats()
+
+    def set_throttling(self, rateLimit=None, rateBurst=None, maxRetries=3,
+                       retryBackoff=0.5, failureThreshold=5, recoveryTimeout=30):
+        """Set how the requests to the web server are throttled.
+
+        *rateLimit* -- maximum number of requests per second to the same
+                       host (None for no limit); the limit is shared
+                       by every thread.
+        *rateBurst* -- number of requests that can be sent at once
+                       (by default, the same as rateLimit).
+        *maxRetries* -- number of times a request is retried, in case of
+                        network errors, "429 Too Many Requests" or server
+                        errors.
+        *retryBackoff* -- base time, in seconds, to wait before a retry;
+                          it's doubled at every attempt.
+        *failureThreshold* -- consecutive failed requests before the
+                              requests of this instance to a host
+                              are suspended...
+        *recoveryTimeout* -- ...for this number of seconds."""
+        opener = self.urlOpener
+        opener.rateLimit = float(rateLimit) if rateLimit else None
+        opener.rateBurst = int(rateBurst) if rateBurst else None
+        opener.retryPolicy = RetryPolicy(maxRetries=int(maxRetries or 0),
+                                         backoff=float(retryBackoff))
+        opener.failureThreshold = int(failureThreshold)
+        opener.recoveryTimeout = float(recoveryTimeout)
+        opener.circuitBreakers = {}
+
     def set_timeout(self, timeout):
         """Set the default timeout, in seconds, of the connection."""
         try:
@@ -370,27 +786,230 @@ class IMDbHTTPAccessSystem(IMDbBase):
         or cookies.txt file."""
         return
 
-    def _retrieve(self, url, size=-1, _noCookies=False):
-        """Retrieve the given URL."""
+    def _retrieve_raw(self, url, size=-1, consumer=None):
+        """Retrieve the given URL; return a tuple with the content (as bytes)
+        and the charset declared by the server. The consumer, if set,
+        is fed with the content (see IMDbURLopener.retrieve)."""
         self._http_logger.debug('fetching url %s (size: %d)', url, size)
-        ret = self.urlOpener.retrieve_unicode(url, size=size)
+        return self.urlOpener.retrieve(url, size=size, consumer=consumer)
+
+    def _retrieve(self, url, size=-1, _noCookies=False, consumer=None):
+        """Retrieve the given URL, as a unicode string."""
+        ret = self.urlOpener.decode_content(*self._retrieve_raw(url, size=size, consumer=consumer))
         if PY2 and isinstance(ret, str):
             ret = ret.decode('utf-8')
         return ret
 
-    def _get_search_content(self, kind, ton, results):
+    def _retrieve_page(self, url):
+        """Retrieve the given URL, to be parsed; return a tuple with the
+        content and its encoding. The content is not decoded: the parsers
+        read the bytes directly, when possible."""
+        if PY2:
+            return self._retrieve(url), None
+        content, server_encode = self._retrieve_raw(url)
+        if not content or not isinstance(content, bytes):
+            return self.urlOpener.decode_content(content, server_encode), None
+        return content, self.urlOpener.get_encoding(content, server_encode)
+
+    @contextmanager
+    def _memo_scope(self, keys=None):
+        """Within this context, every page is retrieved and parsed at most
+        once (see _parse_page); scopes can be nested.
+
+        If keys is set, the parsers only extract the given keys."""
+        if getattr(self._memo, 'pages', None) is not None:
+            yield
+            return
+        self._memo.pages = {}
+        self._memo.keys = tuple(sorted(set(keys))) if keys else None
+        try:
+            yield
+        finally:
+            self._memo.pages = None
+            self._memo.keys = None
+
+    def _parse_page(self, parser, url, **kwds):
+        """Retrieve the given URL and parse it with the given parser
+        (and keyword arguments); inside a _memo_scope the result is reused
+        by following calls with the same arguments."""
+        if kwds.get('keys'):
+            kwds['keys'] = tuple(sorted(set(kwds['keys'])))
+        else:
+            kwds.pop('keys', None)
+            keys = getattr(self._memo, 'keys', None)
+            if keys:
+                kwds['keys'] = keys
+        memo = getattr(self._memo, 'pages', None)
+        if memo is None:
+            return self._parse_content(parser, url, self._retrieve_page(url), **kwds)
+        key = (url, parser.__class__.__name__, tuple(sorted(kwds.items())))
+        ret = memo.get(key)
+        if ret is None:
+            # The same page can be parsed by more parsers.
+            page = memo.get(url)
+            if page is None:
+                page = memo[url] = self._retrieve_page(url)
+            ret = memo[key] = self._parse_content(parser, url, page, **kwds)
+        # Callers are free to modify the first levels of the result.
+        ret = dict(ret)
+        if isinstance(ret.get('data'), dict):
+            ret['data'] = dict(ret['data'])
+        return ret
+
+    def _parse_content(self, parser, url, page, **kwds):
+        """Parse the content of the given URL (a tuple with the content and
+        its encoding, see _retrieve_page), unless the result is already in
+        the cache of parsed pages."""
+        cont, encoding = page
+        parseCache = self._parseCache
+        if parseCache is None or not cont:
+            return self._run_parser(parser, cont, encoding, kwds)
+        ret = parseCache.get(parser, url, cont, kwds)
+        if ret is None:
+            ret = self._run_parser(parser, cont, encoding, kwds)
+            parseCache.set(parser, url, cont, kwds, ret)
+        return ret
+
+    def _run_parser(self, parser, cont, encoding, kwds):
+        """Parse the content with the given parser, in the pool of
+        processes if it's set."""
+        if self._parsePool is not None and cont:
+            ret = self._parsePool.parse(parser, cont, encoding, **kwds)
+            if ret is not None:
+                return ret
+        return parser.parse(cont, encoding=encoding, **kwds)
+
+    def update(self, mop, info=None, override=0, keys=None):
+        """Given a Movie, Person, Character or Company object with only
+        partial information, retrieve the required set of information.
+
+        info is the list of sets of information to retrieve.
+
+        If override is set, the information are retrieved and updated
+        even if they're already in the object.
+
+        If keys is set, only the rules needed to get the given keys
+        are applied by the parsers.
+
+        Every page is retrieved and parsed at most once."""
+        with self._memo_scope(keys):
+            return IMDbBase.update(self, mop, info=info, override=override, keys=keys)
+
+    def update_series_seasons(self, mop, season_nums, override=0, incremental=False):
+        """Given a Movie object with only retrieve the season data.
+
+        season_nums is the list of the specific seasons to retrieve.
+
+        If override is set, the information are retrieved and updated
+        even if they're already in the object.
+
+        If incremental is set, only the seasons missing from the
+        'episodes' key of the object are retrieved."""
+        with self._memo_scope():
+            return IMDbBase.update_series_seasons(self, mop, season_nums, override=override,
+                                                  incremental=incremental)
+
+    def _iter_concurrently(self, funct, iterable, workers=None):
+        """Call funct with every item of the iterable, using up to workers
+        threads (by default, maxWorkers); the results are yielded as soon
+        as they're ready, in no particular order."""
+        workers = int(workers or self._maxWorkers)
+        if workers <= 1 or ThreadPoolExecutor is None:
+            for item in iterable:
+                yield funct(item)
+            return
+        executor = ThreadPoolExecutor(max_workers=workers)
+        pending = set()
+        try:
+            for item in iterable:
+                pending.add(executor.submit(funct, item))
+                if len(pending) < workers:
+                    continue
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        finally:
+            # The caller may stop iterating before the end.
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def get_movies(self, movieIDs, info=Movie.Movie.default_info, modFunct=None,
+                   workers=None, keys=None):
+        """Iterate over the Movie objects for the given movieIDs.
+
+        The movies are retrieved concurrently, using up to workers threads
+        (by default, maxWorkers), and are returned as soon as they're
+        complete, in no particular order.
+
+        info is the list of sets of information to retrieve.
+
+        If specified, modFunct will be the function used by the Movie
+        objects when accessing their text fields (like 'plot').
+
+        If keys is set, only the given keys are retrieved."""
+        return self._iter_concurrently(lambda movieID: self.get_movie(movieID, info, modFunct, keys=keys),
+                                       movieIDs, workers=workers)
+
+    def get_people(self, personIDs, info=Person.Person.default_info, modFunct=None,
+                   workers=None):
+        """Iterate over the Person objects for the given personIDs.
+
+        The people are retrieved concurrently, using up to workers threads
+        (by default, maxWorkers), and are returned as soon as they're
+        complete, in no particular order.
+
+        info is the list of sets of information to retrieve.
+
+        If specified, modFunct will be the function used by the Person
+        objects when accessing their text fields (like 'mini biography')."""
+        return self._iter_concurrently(lambda personID: self.get_person(personID, info, modFunct),
+                                       personIDs, workers=workers)
+
+    def _run_concurrently(self, funct, argsList):
+        """Call funct with each of the tuples of arguments in argsList,
+        using up to maxWorkers threads; return the list of results,
+        in the same order."""
+        argsList = list(argsList)
+        if self._maxWorkers <= 1 or len(argsList) <= 1 or ThreadPoolExecutor is None:
+            return [funct(*args) for args in argsList]
+        workers = min(self._maxWorkers, len(argsList))
+        memo = getattr(self._memo, 'pages', None)
+        keys = getattr(self._memo, 'keys', None)
+
+        def call(*args):
+            # Share the memo of the calling thread.
+            self._memo.pages = memo
+            self._memo.keys = keys
+            try:
+                return funct(*args)
+            finally:
+                self._memo.pages = None
+                self._memo.keys = None
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(call, *args) for args in argsList]
+            return [future.result() for future in futures]
+
+    def _get_search_content(self, kind, ton, results, stream=None):
         """Retrieve the web page for a given search.
         kind can be 'tt' (for titles), 'nm' (for names),
         or 'co' (for companies).
         ton is the title or the name to search.
-        results is the maximum number of results to be retrieved."""
+        results is the maximum number of results to be retrieved.
+        stream, if set, is the DOMStream fed with the page, that stops
+        the download once the wanted results were read."""
         if PY2:
             params = 'q=%s&s=%s' % (quote_plus(ton.encode('utf8'), safe=''.encode('utf8')), kind.encode('utf8'))
         else:
             params = 'q=%s&s=%s' % (quote_plus(ton, safe=''), kind)
         if kind == 'ep':
             params = params.replace('s=ep&', 's=tt&ttype=ep&', 1)
-        cont = self._retrieve(self.urls['find'] % params)
+        cont = self._retrieve(self.urls['find'] % params, consumer=stream)
         # print 'URL:', imdbURL_find % params
         if cont.find('Your search returned more than') == -1 or \
                 cont.find("displayed the exact matches") == -1:
@@ -399,11 +1018,22 @@ class IMDbHTTPAccessSystem(IMDbBase):
         # titles or names contain the string we're looking for.
         params = 'q=%s&ls=%s&lm=0' % (quote_plus(ton, safe=''), kind)
         size = 131072 + results * 512
-        return self._retrieve(self.urls['find'] % params, size=size)
+        return self._retrieve(self.urls['find'] % params, size=size, consumer=stream)
+
+    def _parse_search(self, parser, kind, ton, results, **kwds):
+        """Retrieve and parse the web page for a given search; if the parser
+        supports it, the page is parsed while it's downloaded, stopping
+        as soon as enough results were found."""
+        stream = parser.get_stream(results)
+        cont = self._get_search_content(kind, ton, results, stream=stream)
+        if kind == 'co':
+            kwds['url'] = self.urlOpener._last_url
+        if stream is not None:
+            return parser.parse_stream(stream, results=results, **kwds)['data']
+        return parser.parse(cont, results=results, **kwds)['data']
 
     def _search_movie(self, title, results):
-        cont = self._get_search_content('tt', title, results)
-        return self.smProxy.search_movie_parser.parse(cont, results=results)['data']
+        return self._parse_search(self.smProxy.search_movie_parser, 'tt', title, results)
 
     def _get_search_movie_advanced_content(self, title=None, adult=None, results=None,
                                            sort=None, sort_dir=None):
@@ -432,62 +1062,102 @@ class IMDbHTTPAccessSystem(IMDbBase):
         t_dict = analyze_title(title)
         if t_dict['kind'] == 'episode':
             title = t_dict['title']
-        cont = self._get_search_content('ep', title, results)
-        return self.smProxy.search_movie_parser.parse(cont, results=results)['data']
+        return self._parse_search(self.smProxy.search_movie_parser, 'ep', title, results)
+
+    def _parse_jsonld_page(self, parser, url, fallback, fallbackURL):
+        """Parse the structured data of the given URL, if the keys requested
+        in the current update are all among the ones it can provide; the
+        requested keys that are missing from the page are taken calling the
+        fallback function with the keys argument.
+
+        In every other case (no keys requested, or keys the structured data
+        can't provide) the fallback function is called with keys=None and
+        its values win: the structured data only fills the keys it lacks,
+        and only if fallbackURL is the same page, so that no further
+        request is made."""
+        keys = getattr(self._memo, 'keys', None)
+        if not keys or not set(keys).issubset(parser.jsonKeys):
+            ret = fallback(keys=None)
+            if fallbackURL == url:
+                data = dict(self._parse_page(parser, url).get('data') or {})
+                data.update(ret.get('data') or {})
+                ret['data'] = data
+            return ret
+        ret = self._parse_page(parser, url)
+        data = ret.get('data')
+        if not data:
+            return fallback(keys=None)
+        missing = [key for key in keys if key not in data]
+        if missing:
+            fbRet = fallback(keys=missing)
+            data = dict(data)
+            data.update(fbRet.get('data') or {})
+            ret['data'] = data
+            for refs in ('titlesRefs', 'namesRefs'):
+                if fbRet.get(refs):
+                    ret[refs] = fbRet[refs]
+        return ret
 
     def get_movie_main(self, movieID):
-        cont = self._retrieve(self.urls['movie_main'] % movieID + 'reference')
-        return self.mProxy.movie_parser.parse(cont, mdparse=self._mdparse)
+        url = self.urls['movie_main'] % movieID + 'reference'
+        if self._jsonLD:
+            return self._parse_jsonld_page(
+                self.jldProxy.movie_parser, self.urls['movie_main'] % movieID,
+                lambda keys: self._parse_page(self.mProxy.movie_parser, url,
+                                              mdparse=self._mdparse, keys=keys),
+                url
+            )
+        return self._parse_page(self.mProxy.movie_parser, url, mdparse=self._mdparse)
 
     def get_movie_recommendations(self, movieID):
-        cont = self._retrieve(self.urls['movie_main'] % movieID)
+        url = self.urls['movie_main'] % movieID
         r = {'info sets': ('recommendations',), 'data': {}}
-        ret = self.mProxy.movie_parser.parse(cont, mdparse=self._mdparse)
+        ret = self._parse_page(self.mProxy.movie_parser, url, mdparse=self._mdparse)
         if 'data' in ret and 'recommendations' in ret['data'] and ret['data']['recommendations']:
             r['data']['recommendations'] = ret['data']['recommendations']
         return r
 
     def get_movie_full_credits(self, movieID):
-        cont = self._retrieve(self.urls['movie_main'] % movieID + 'fullcredits')
-        return self.mProxy.full_credits_parser.parse(cont)
+        url = self.urls['movie_main'] % movieID + 'fullcredits'
+        return self._parse_page(self.mProxy.full_credits_parser, url)
 
     def get_movie_plot(self, movieID):
-        cont = self._retrieve(self.urls['movie_main'] % movieID + 'plotsummary')
-        ret = self.mProxy.plot_parser.parse(cont, getRefs=self._getRefs)
+        url = self.urls['movie_main'] % movieID + 'plotsummary'
+        ret = self._parse_page(self.mProxy.plot_parser, url, getRefs=self._getRefs)
         ret['info sets'] = ('plot', 'synopsis')
         return ret
 
     def get_movie_awards(self, movieID):
-        cont = self._retrieve(self.urls['movie_main'] % movieID + 'awards')
-        return self.mProxy.movie_awards_parser.parse(cont)
+        url = self.urls['movie_main'] % movieID + 'awards'
+        return self._parse_page(self.mProxy.movie_awards_parser, url)
 
     def get_movie_taglines(self, movieID):
-        cont = self._retrieve(self.urls['movie_main'] % movieID + 'taglines')
-        return self.mProxy.taglines_parser.parse(cont)
+        url = self.urls['movie_main'] % movieID + 'taglines'
+        return self._parse_page(self.mProxy.taglines_parser, url)
 
     def get_movie_keywords(self, movieID):
-        cont = self._retrieve(self.urls['movie_main'] % movieID + 'keywords')
-        return self.mProxy.keywords_parser.parse(cont)
+        url = self.urls['movie_main'] % movieID + 'keywords'
+        return self._parse_page(self.mProxy.keywords_parser, url)
 
     def get_movie_alternate_versions(self, movieID):
-        cont = self._retrieve(self.urls['movie_main'] % movieID + 'alternateversions')
-        return self.mProxy.alternateversions_parser.parse(cont, getRefs=self._getRefs)
+        url = self.urls['movie_main'] % movieID + 'alternateversions'
+        return self._parse_page(self.mProxy.alternateversions_parser, url, getRefs=self._getRefs)
 
     def get_movie_crazy_credits(self, movieID):
-        cont = self._retrieve(self.urls['movie_main'] % movieID + 'crazycredits')
-        return self.mProxy.crazycredits_parser.parse(cont, getRefs=self._getRefs)
+        url = self.urls['movie_main'] % movieID + 'crazycredits'
+        return self._parse_page(self.mProxy.crazycredits_parser, url, getRefs=self._getRefs)
 
     def get_movie_goofs(self, movieID):
-        cont = self._retrieve(self.urls['movie_main'] % movieID + 'goofs')
-        return self.mProxy.goofs_parser.parse(cont, getRefs=self._getRefs)
+        url = self.urls['movie_main'] % movieID + 'goofs'
+        return self._parse_page(self.mProxy.goofs_parser, url, getRefs=self._getRefs)
 
     def get_movie_quotes(self, movieID):
-        cont = self._retrieve(self.urls['movie_main'] % movieID + 'quotes')
-        return self.mProxy.quotes_parser.parse(cont, getRefs=self._getRefs)
+        url = self.urls['movie_main'] % movieID + 'quotes'
+        return self._parse_page(self.mProxy.quotes_parser, url, getRefs=self._getRefs)
 
     def get_movie_release_dates(self, movieID):
-        cont = self._retrieve(self.urls['movie_main'] % movieID + 'releaseinfo')
-        ret = self.mProxy.releasedates_parser.parse(cont)
+        url = self.urls['movie_main'] % movieID + 'releaseinfo'
+        ret = self._parse_page(self.mProxy.releasedates_parser, url)
         ret['info sets'] = ('release dates', 'akas')
         return ret
 
@@ -496,86 +1166,86 @@ class IMDbHTTPAccessSystem(IMDbBase):
     get_movie_release_info = get_movie_release_dates
 
     def get_movie_vote_details(self, movieID):
-        cont = self._retrieve(self.urls['movie_main'] % movieID + 'ratings')
-        return self.mProxy.ratings_parser.parse(cont)
+        url = self.urls['movie_main'] % movieID + 'ratings'
+        return self._parse_page(self.mProxy.ratings_parser, url)
 
     def get_movie_trivia(self, movieID):
-        cont = self._retrieve(self.urls['movie_main'] % movieID + 'trivia')
-        return self.mProxy.trivia_parser.parse(cont, getRefs=self._getRefs)
+        url = self.urls['movie_main'] % movieID + 'trivia'
+        return self._parse_page(self.mProxy.trivia_parser, url, getRefs=self._getRefs)
 
     def get_movie_connections(self, movieID):
-        cont = self._retrieve(self.urls['movie_main'] % movieID + 'movieconnections')
-        return self.mProxy.connections_parser.parse(cont)
+        url = self.urls['movie_main'] % movieID + 'movieconnections'
+        return self._parse_page(self.mProxy.connections_parser, url)
 
     def get_movie_technical(self, movieID):
-        cont = self._retrieve(self.urls['movie_main'] % movieID + 'technical')
-        return self.mProxy.tech_parser.parse(cont)
+        url = self.urls['movie_main'] % movieID + 'technical'
+        return self._parse_page(self.mProxy.tech_parser, url)
 
     def get_movie_locations(self, movieID):
-        cont = self._retrieve(self.urls['movie_main'] % movieID + 'locations')
-        return self.mProxy.locations_parser.parse(cont)
+        url = self.urls['movie_main'] % movieID + 'locations'
+        return self._parse_page(self.mProxy.locations_parser, url)
 
     def get_movie_soundtrack(self, movieID):
-        cont = self._retrieve(self.urls['movie_main'] % movieID + 'soundtrack')
-        return self.mProxy.soundtrack_parser.parse(cont)
+        url = self.urls['movie_main'] % movieID + 'soundtrack'
+        return self._parse_page(self.mProxy.soundtrack_parser, url)
 
     def get_movie_reviews(self, movieID):
-        cont = self._retrieve(self.urls['movie_main'] % movieID + 'reviews?count=9999999&start=0')
-        return self.mProxy.reviews_parser.parse(cont)
+        url = self.urls['movie_main'] % movieID + 'reviews?count=9999999&start=0'
+        return self._parse_page(self.mProxy.reviews_parser, url)
 
     def get_movie_critic_reviews(self, movieID):
-        cont = self._retrieve(self.urls['movie_main'] % movieID + 'criticreviews')
-        return self.mProxy.criticrev_parser.parse(cont)
+        url = self.urls['movie_main'] % movieID + 'criticreviews'
+        return self._parse_page(self.mProxy.criticrev_parser, url)
 
     def get_movie_external_reviews(self, movieID):
-        cont = self._retrieve(self.urls['movie_main'] % movieID + 'externalreviews')
-        return self.mProxy.externalrev_parser.parse(cont)
+        url = self.urls['movie_main'] % movieID + 'externalreviews'
+        return self._parse_page(self.mProxy.externalrev_parser, url)
 
     def get_movie_external_sites(self, movieID):
-        cont = self._retrieve(self.urls['movie_main'] % movieID + 'externalsites')
-        ret = self.mProxy.externalsites_parser.parse(cont)
+        url = self.urls['movie_main'] % movieID + 'externalsites'
+        ret = self._parse_page(self.mProxy.externalsites_parser, url)
         ret['info sets'] = ('external sites', 'misc sites', 'sound clips',
                             'video sites', 'photo sites', 'official sites')
         return ret
 
     def get_movie_official_sites(self, movieID):
-        cont = self._retrieve(self.urls['movie_main'] % movieID + 'officialsites')
-        ret = self.mProxy.officialsites_parser.parse(cont)
+        url = self.urls['movie_main'] % movieID + 'officialsites'
+        ret = self._parse_page(self.mProxy.officialsites_parser, url)
         ret['info sets'] = ('external sites', 'misc sites', 'sound clips',
                             'video sites', 'photo sites', 'official sites')
         return ret
 
     def get_movie_misc_sites(self, movieID):
-        cont = self._retrieve(self.urls['movie_main'] % movieID + 'miscsites')
-        ret = self.mProxy.misclinks_parser.parse(cont)
+        url = self.urls['movie_main'] % movieID + 'miscsites'
+        ret = self._parse_page(self.mProxy.misclinks_parser, url)
         ret['info sets'] = ('external sites', 'misc sites', 'sound clips',
                             'video sites', 'photo sites', 'official sites')
         return ret
 
     def get_movie_sound_clips(self, movieID):
-        cont = self._retrieve(self.urls['movie_main'] % movieID + 'soundsites')
-        ret = self.mProxy.soundclips_parser.parse(cont)
+        url = self.urls['movie_main'] % movieID + 'soundsites'
+        ret = self._parse_page(self.mProxy.soundclips_parser, url)
         ret['info sets'] = ('external sites', 'misc sites', 'sound clips',
                             'video sites', 'photo sites', 'official sites')
         return ret
 
     def get_movie_video_clips(self, movieID):
-        cont = self._retrieve(self.urls['movie_main'] % movieID + 'videosites')
-        ret = self.mProxy.videoclips_parser.parse(cont)
+        url = self.urls['movie_main'] % movieID + 'videosites'
+        ret = self._parse_page(self.mProxy.videoclips_parser, url)
         ret['info sets'] = ('external sites', 'misc sites', 'sound clips',
                             'video sites', 'photo sites', 'official sites')
         return ret
 
     def get_movie_photo_sites(self, movieID):
-        cont = self._retrieve(self.urls['movie_main'] % movieID + 'photosites')
-        ret = self.mProxy.photosites_parser.parse(cont)
+        url = self.urls['movie_main'] % movieID + 'photosites'
+        ret = self._parse_page(self.mProxy.photosites_parser, url)
         ret['info sets'] = ('external sites', 'misc sites', 'sound clips',
                             'video sites', 'photo sites', 'official sites')
         return ret
 
     def get_movie_news(self, movieID):
-        cont = self._retrieve(self.urls['movie_main'] % movieID + 'news')
-        return self.mProxy.news_parser.parse(cont, getRefs=self._getRefs)
+        url = self.urls['movie_main'] % movieID + 'news'
+        return self._parse_page(self.mProxy.news_parser, url, getRefs=self._getRefs)
 
     def _purge_seasons_data(self, data_d):
         if '_current_season' in data_d['data']:
@@ -584,46 +1254,68 @@ class IMDbHTTPAccessSystem(IMDbBase):
             del data_d['data']['_seasons']
         return data_d
 
-    def get_movie_episodes(self, movieID, season_nums='all'):
-        cont = self._retrieve(self.urls['movie_main'] % movieID + 'episodes')
-        temp_d = self.mProxy.season_episodes_parser.parse(cont)
+    def _get_movie_season(self, movieID, season):
+        """Return the episodes of a single season."""
+        url = self.urls['movie_main'] % movieID + 'episodes?season=' + str(season)
+        return self._purge_seasons_data(
+            self._parse_page(self.mProxy.season_episodes_parser, url)
+        )
+
+    def get_movie_episodes(self, movieID, season_nums='all', skip_seasons=None):
+        """Return the episodes of the series; season_nums can be a season,
+        a list of seasons or 'all'; the seasons in skip_seasons are
+        not retrieved.
+
+        The seasons are retrieved concurrently, and merged in order."""
+        url = self.urls['movie_main'] % movieID + 'episodes'
+        temp_d = self._parse_page(self.mProxy.season_episodes_parser, url)
         if not isinstance(season_nums, list):
             if season_nums != 'all':
                 season_nums = [season_nums]
-        if not temp_d and 'data' in temp_d:
+        if not (temp_d and 'data' in temp_d):
             return {}
-            
+
         _seasons = temp_d['data'].get('_seasons') or []
-        
+        skip_seasons = skip_seasons or ()
+        seasons = [season for season in _seasons
+                   if (season_nums == 'all' or season in season_nums) and season not in skip_seasons]
+        # The main page of the episodes already contains a season.
+        current_season = temp_d['data'].get('_current_season')
+        pages = {}
+        if current_season in seasons:
+            pages[current_season] = self._purge_seasons_data(temp_d)
+        to_fetch = [season for season in seasons if season not in pages]
+        pages.update(zip(to_fetch, self._run_concurrently(
+            self._get_movie_season, [(movieID, season) for season in to_fetch])))
+
         nr_eps = 0
         data_d = dict()
 
-        for season in _seasons:
-            if season_nums != 'all' and season not in season_nums:
-                continue
-            cont = self._retrieve(
-                self.urls['movie_main'] % movieID + 'episodes?season=' + str(season)
-            )
-            other_d = self.mProxy.season_episodes_parser.parse(cont)
-            other_d = self._purge_seasons_data(other_d)
+        for season in seasons:
+            other_d = pages[season]
             other_d['data'].setdefault('episodes', {})
-            if not (other_d and other_d['data'] and other_d['data']['episodes'][season]):
+            if not (other_d and other_d['data'] and other_d['data']['episodes'].get(season)):
                 continue
             nr_eps += len(other_d['data']['episodes'].get(season) or [])
             if data_d:
                 data_d['data']['episodes'][season] = other_d['data']['episodes'][season]
             else:
                 data_d = other_d
+                # The other seasons are added to a copy: the parsed
+                # page can be reused in the current update.
+                data_d['data']['episodes'] = dict(data_d['data']['episodes'])
+        if not data_d:
+            return {}
         data_d['data']['number of episodes'] = nr_eps
         return data_d
 
     def get_movie_faqs(self, movieID):
-        cont = self._retrieve(self.urls['movie_main'] % movieID + 'faq')
-        return self.mProxy.movie_faqs_parser.parse(cont, getRefs=self._getRefs)
+        url = self.urls['movie_main'] % movieID + 'faq'
+        return self._parse_page(self.mProxy.movie_faqs_parser, url, getRefs=self._getRefs)
 
     def get_movie_airing(self, movieID):
-        cont = self._retrieve(self.urls['movie_main'] % movieID + 'tvschedule')
-        return self.mProxy.airing_parser.parse(cont)
+        url = self.urls['movie_main'] % movieID + 'tvschedule'
+        return self._parse_page(self.mProxy.airing_parser, url)
 
     get_movie_tv_schedule = get_movie_airing
 
@@ -631,63 +1323,73 @@ class IMDbHTTPAccessSystem(IMDbBase):
         return self.get_movie_plot(movieID)
 
     def get_movie_parents_guide(self, movieID):
-        cont = self._retrieve(self.urls['movie_main'] % movieID + 'parentalguide')
-        return self.mProxy.parentsguide_parser.parse(cont)
+        url = self.urls['movie_main'] % movieID + 'parentalguide'
+        return self._parse_page(self.mProxy.parentsguide_parser, url)
 
     def _search_person(self, name, results):
-        cont = self._get_search_content('nm', name, results)
-        return self.spProxy.search_person_parser.parse(cont, results=results)['data']
+        return self._parse_search(self.spProxy.search_person_parser, 'nm', name, results)
 
     def get_person_main(self, personID):
-        cont = self._retrieve(self.urls['person_main'] % personID)
-        ret = self.pProxy.maindetails_parser.parse(cont)
+        url = self.urls['person_main'] % personID
+        if self._jsonLD:
+            ret = self._parse_jsonld_page(
+                self.jldProxy.person_parser, url,
+                lambda keys: self._parse_page(self.pProxy.maindetails_parser, url, keys=keys),
+                url
+            )
+            if 'filmography' not in ret['data']:
+                return ret
+        else:
+            ret = self._parse_page(self.pProxy.maindetails_parser, url)
         ret['info sets'] = ('main', 'filmography')
         return ret
 
     def get_person_filmography(self, personID):
+        if self._jsonLD:
+            url = self.urls['person_main'] % personID
+            ret = self._parse_page(self.pProxy.maindetails_parser, url)
+            ret['info sets'] = ('main', 'filmography')
+            return ret
         return self.get_person_main(personID)
 
     def get_person_biography(self, personID):
-        cont = self._retrieve(self.urls['person_main'] % personID + 'bio')
-        return self.pProxy.bio_parser.parse(cont, getRefs=self._getRefs)
+        url = self.urls['person_main'] % personID + 'bio'
+        return self._parse_page(self.pProxy.bio_parser, url, getRefs=self._getRefs)
 
     def get_person_awards(self, personID):
-        cont = self._retrieve(self.urls['person_main'] % personID + 'awards')
-        return self.pProxy.person_awards_parser.parse(cont)
+        url = self.urls['person_main'] % personID + 'awards'
+        return self._parse_page(self.pProxy.person_awards_parser, url)
 
     def get_person_other_works(self, personID):
-        cont = self._retrieve(self.urls['person_main'] % personID + 'otherworks')
-        return self.pProxy.otherworks_parser.parse(cont, getRefs=self._getRefs)
+        url = self.urls['person_main'] % personID + 'otherworks'
+        return self._parse_page(self.pProxy.otherworks_parser, url, getRefs=self._getRefs)
 
     def get_person_publicity(self, personID):
-        cont = self._retrieve(self.urls['person_main'] % personID + 'publicity')
-        return self.pProxy.publicity_parser.parse(cont)
+        url = self.urls['person_main'] % personID + 'publicity'
+        return self._parse_page(self.pProxy.publicity_parser, url)
 
     def get_person_official_sites(self, personID):
-        cont = self._retrieve(self.urls['person_main'] % personID + 'officialsites')
-        return self.pProxy.person_officialsites_parser.parse(cont)
+        url = self.urls['person_main'] % personID + 'officialsites'
+        return self._parse_page(self.pProxy.person_officialsites_parser, url)
 
     def get_person_news(self, personID):
-        cont = self._retrieve(self.urls['person_main'] % personID + 'news')
-        return self.pProxy.news_parser.parse(cont)
+        url = self.urls['person_main'] % personID + 'news'
+        return self._parse_page(self.pProxy.news_parser, url)
 
     def get_person_genres_links(self, personID):
-        cont = self._retrieve(self.urls['person_main'] % personID + 'filmogenre')
-        return self.pProxy.person_genres_parser.parse(cont)
+        url = self.urls['person_main'] % personID + 'filmogenre'
+        return self._parse_page(self.pProxy.person_genres_parser, url)
 
     def get_person_keywords_links(self, personID):
-        cont = self._retrieve(self.urls['person_main'] % personID + 'filmokey')
-        return self.pProxy.person_keywords_parser.parse(cont)
+        url = self.urls['person_main'] % personID + 'filmokey'
+        return self._parse_page(self.pProxy.person_keywords_parser, url)
 
     def _search_company(self, name, results):
-        cont = self._get_search_content('co', name, results)
-        url = self.urlOpener._last_url
-        return self.scompProxy.search_company_parser.parse(cont, url=url,
-                                                           results=results)['data']
+        return self._parse_search(self.scompProxy.search_company_parser, 'co', name, results)
 
     def get_company_main(self, companyID):
-        cont = self._retrieve(self.urls['company_main'] % companyID)
-        ret = self.compProxy.company_main_parser.parse(cont)
+        url = self.urls['company_main'] % companyID
+        ret = self._parse_page(self.compProxy.company_main_parser, url)
         return ret
 
     def _search_keyword(self, keyword, results):
@@ -696,12 +1398,11 @@ class IMDbHTTPAccessSystem(IMDbBase):
         #      E.g.: http://www.imdb.com/keyword/fianc%E9/
         #      will return a 500 Internal Server Error: Redirect Recursion.
         try:
-            cont = self._get_search_content('kw', keyword, results)
+            return self._parse_search(self.skProxy.search_keyword_parser, 'kw', keyword, results)
         except IMDbDataAccessError:
             self._http_logger.warn('unable to search for keyword %s', keyword,
                                    exc_info=True)
             return []
-        return self.skProxy.search_keyword_parser.parse(cont, results=results)['data']
 
     def _get_keyword(self, keyword, results, page=None):
         try:
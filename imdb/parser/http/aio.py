@@ -0,0 +1,437 @@
+# Copyright 2020 Davide Alberani <da@erlug.linux.it>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+
+"""
+This module provides the AsyncIMDbHTTPAccessSystem class, used to access
+IMDb's data through the web interface from asyncio code.
+
+Pages are downloaded with aiohttp, using a pool of persistent connections
+and a semaphore to limit the number of concurrent requests; the pages are
+then parsed by the same parsers used by
+:class:`imdb.parser.http.IMDbHTTPAccessSystem`, in a pool of threads,
+so that the event loop is never blocked.
+
+Every update (e.g. a call of get_movie) runs in one of these threads,
+that stays blocked while the event loop downloads the pages it needs:
+the number of updates in progress is limited by the number of threads
+(the workers argument), and every one of them costs a thread.
+
+Example::
+
+    import asyncio
+    from imdb.parser.http.aio import AsyncIMDbHTTPAccessSystem
+
+    async def main():
+        async with AsyncIMDbHTTPAccessSystem(concurrency=200) as ia:
+            movies = await asyncio.gather(*[ia.get_movie(movieID)
+                                            for movieID in movieIDs])
+
+This module requires Python 3.5 or later, and the aiohttp package.
+"""
+
+import asyncio
+import collections
+import logging
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import aiohttp
+
+from imdb import Character, Company, IMDbBase, Movie, Person
+from imdb._exceptions import IMDbDataAccessError
+
+from . import IMDbHTTPAccessSystem
+
+
+# Python 3.7 or later; before, get_event_loop returns the running loop
+# when called from a coroutine.
+_get_running_loop = getattr(asyncio, 'get_running_loop', asyncio.get_event_loop)
+
+
+class AsyncIMDbHTTPAccessSystem(IMDbHTTPAccessSystem):
+    """The class used to access IMDb's data through the web, from asyncio code.
+
+    The methods used to fetch or search data are coroutines; every other
+    method behaves like the ones of IMDbHTTPAccessSystem."""
+
+    _aio_logger = logging.getLogger('imdbpy.parser.http.aio')
+
+    def __init__(self, concurrency=100, workers=None, *arguments, **keywords):
+        """Initialize the access system.
+
+        *concurrency* -- maximum number of requests in flight (and size
+                         of the connection pool).
+        *workers* -- number of threads used to parse the pages (by default,
+                     the same as concurrency); every update in progress
+                     holds one of them, blocked while its pages are
+                     downloaded, so this is also the maximum number
+                     of updates in progress."""
+        self._timeout = None
+        IMDbHTTPAccessSystem.__init__(self, *arguments, **keywords)
+        try:
+            concurrency = int(concurrency)
+        except (TypeError, ValueError):
+            concurrency = 100
+        if concurrency < 1:
+            concurrency = 100
+        self._concurrency = concurrency
+        try:
+            workers = int(workers)
+        except (TypeError, ValueError):
+            workers = concurrency
+        if workers < 1:
+            workers = concurrency
+        # While a page is being downloaded, the thread that asked for it
+        # is waiting for it: to keep 'concurrency' requests in flight,
+        # the same number of threads is needed.
+        self._workers = workers
+        self._executor = None
+        self._session = None
+        self._semaphore = None
+        self._local = threading.local()
+
+    def set_timeout(self, timeout):
+        """Set the default timeout, in seconds, of the connection."""
+        IMDbHTTPAccessSystem.set_timeout(self, timeout)
+        self._timeout = socket.getdefaulttimeout()
+
+    def _get_session(self):
+        """Return the HTTP session, creating it if needed; it must be
+        called from a coroutine."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self._concurrency, ssl=False)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self._timeout)
+            )
+            self._semaphore = asyncio.Semaphore(self._concurrency)
+        return self._session
+
+    def _get_executor(self):
+        """Return the pool of threads used to parse the pages."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._workers)
+        return self._executor
+
+    async def close(self):
+        """Close the HTTP connections and stop the parsing threads."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    async def _aretrieve(self, url, size=-1, extraHeaders=None):
+        """Retrieve the given URL; return a tuple with the raw content,
+        the charset declared by the server, the headers of the response,
+        the final URL and the HTTP status code."""
+        headers = dict(self.urlOpener.addheaders)
+        headers.update(extraHeaders or {})
+        if size != -1:
+            headers['Range'] = 'bytes=0-%d' % size
+        proxy = self.urlOpener.get_proxy() or None
+        session = self._get_session()
+        async with self._semaphore:
+            try:
+                async with session.get(url, headers=headers, proxy=proxy) as response:
+                    if response.status == 404:
+                        self._aio_logger.warning('404 code returned for %s', url)
+                        return '', None, response.headers, str(response.url), 404
+                    if response.status >= 400:
+                        raise IMDbDataAccessError(
+                            {'url': url,
+                             'errcode': response.status,
+                             'errmsg': response.reason,
+                             'headers': dict(response.headers),
+                             'error type': 'http_error_default',
+                             'proxy': self.get_proxy()}
+                        )
+                    content = await response.read()
+                    return (content, response.charset, response.headers,
+                            str(response.url), response.status)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                raise IMDbDataAccessError(
+                    {'errmsg': str(e),
+                     'url': url,
+                     'proxy': self.get_proxy(),
+                     'exception type': e.__class__.__name__,
+                     'original exception': e}
+                )
+
+    def _retrieve_raw(self, url, size=-1, consumer=None):
+        """Retrieve the given URL.
+
+        This is called by the parsing threads: the download is scheduled
+        in the event loop, and the thread waits for its result; the
+        consumer, if set, is fed with the whole page."""
+        loop = getattr(self._local, 'loop', None)
+        if loop is None:
+            # Not called from a parsing thread: just block.
+            return IMDbHTTPAccessSystem._retrieve_raw(self, url, size=size, consumer=consumer)
+        self._http_logger.debug('fetching url %s (size: %d)', url, size)
+
+        def fetch(url, size=-1, headers=None):
+            coro = self._aretrieve(url, size=size, extraHeaders=headers)
+            return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+        return self.urlOpener.retrieve(url, size=size, fetch=fetch, consumer=consumer)
+
+    def _call_in_thread(self, loop, funct, args):
+        """Run the given function in a parsing thread."""
+        self._local.loop = loop
+        try:
+            return funct(self, *args)
+        finally:
+            self._local.loop = None
+
+    def _run_concurrently(self, funct, argsList):
+        """Call funct with each of the tuples of arguments in argsList,
+        in a pool of threads; the pages are still downloaded by the
+        event loop."""
+        loop = getattr(self._local, 'loop', None)
+        if loop is None:
+            return IMDbHTTPAccessSystem._run_concurrently(self, funct, argsList)
+
+        def call(*args):
+            self._local.loop = loop
+            try:
+                return funct(*args)
+            finally:
+                self._local.loop = None
+
+        return IMDbHTTPAccessSystem._run_concurrently(self, call, argsList)
+
+    async def _run(self, funct, *args):
+        """Run a (blocking) method of IMDbHTTPAccessSystem in a parsing
+        thread, and return its result."""
+        loop = _get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), self._call_in_thread,
+                                          loop, funct, args)
+
+    async def update(self, mop, info=None, override=0, keys=None):
+        """Given a Movie, Person, Character or Company object with only
+        partial information, retrieve the required set of information.
+
+        info is the list of sets of information to retrieve.
+
+        If override is set, the information are retrieved and updated
+        even if they're already in the object.
+
+        If keys is set, only the given keys are retrieved."""
+        await self._run(IMDbHTTPAccessSystem.update, mop, info, override, keys)
+
+    async def update_series_seasons(self, mop, season_nums, override=0, incremental=False):
+        """Given a Movie object with only retrieve the season data.
+
+        season_nums is the list of the specific seasons to retrieve.
+
+        If override is set, the information are retrieved and updated
+        even if they're already in the object.
+
+        If incremental is set, only the seasons missing from the
+        'episodes' key of the object are retrieved."""
+        await self._run(IMDbHTTPAccessSystem.update_series_seasons, mop, season_nums,
+                        override, incremental)
+
+    async def get_movie(self, movieID, info=Movie.Movie.default_info, modFunct=None, keys=None):
+        """Return a Movie object for the given movieID.
+
+        info is the list of sets of information to retrieve.
+
+        If specified, modFunct will be the function used by the Movie
+        object when accessing its text fields (like 'plot').
+
+        If keys is set, only the given keys are retrieved."""
+        movieID = self._normalize_movieID(movieID)
+        movieID = self._get_real_movieID(movieID)
+        movie = Movie.Movie(movieID=movieID, accessSystem=self.accessSystem)
+        modFunct = modFunct or self._defModFunct
+        if modFunct is not None:
+            movie.set_mod_funct(modFunct)
+        await self.update(movie, info, keys=keys)
+        return movie
+
+    get_episode = get_movie
+
+    async def get_person(self, personID, info=Person.Person.default_info, modFunct=None):
+        """Return a Person object for the given personID.
+
+        info is the list of sets of information to retrieve.
+
+        If specified, modFunct will be the function used by the Person
+        object when accessing its text fields (like 'mini biography')."""
+        personID = self._normalize_personID(personID)
+        personID = self._get_real_personID(personID)
+        person = Person.Person(personID=personID, accessSystem=self.accessSystem)
+        modFunct = modFunct or self._defModFunct
+        if modFunct is not None:
+            person.set_mod_funct(modFunct)
+        await self.update(person, info)
+        return person
+
+    def _as_completed(self, funct, items, limit=None):
+        """Return an iterator over awaitables, each returning the result of
+        the coroutine function funct called with one of the items, in the
+        order they're complete; it must be used from a coroutine.
+
+        At most limit calls (by default, the number of workers) are in
+        progress at the same time: the items are taken from their iterable
+        only when the previous calls are complete."""
+        items = iter(items)
+        limit = limit or self._workers
+        # Items taken from the iterable but not started yet, running calls
+        # and the complete ones, not returned yet.
+        waiting = collections.deque()
+        pending = set()
+        done = collections.deque()
+        taken = 0
+
+        def fill():
+            nonlocal taken
+            for task in [task for task in pending if task.done()]:
+                pending.discard(task)
+                done.append(task)
+            while len(pending) < limit:
+                if waiting:
+                    item = waiting.popleft()
+                else:
+                    try:
+                        item = next(items)
+                    except StopIteration:
+                        return
+                    taken += 1
+                pending.add(asyncio.ensure_future(funct(item)))
+
+        async def next_result():
+            fill()
+            while not done:
+                await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                fill()
+            return done.popleft().result()
+
+        # An awaitable for every item: if they're not awaited one by one,
+        # the items are taken in advance, but still started by fill.
+        yielded = 0
+        while True:
+            if yielded == taken:
+                try:
+                    waiting.append(next(items))
+                except StopIteration:
+                    return
+                taken += 1
+            fill()
+            yielded += 1
+            yield next_result()
+
+    def get_movies(self, movieIDs, info=Movie.Movie.default_info, modFunct=None,
+                   workers=None, keys=None):
+        """Return an iterator over awaitables, each returning one of the
+        Movie objects for the given movieIDs, in the order they're complete::
+
+            for movie in ia.get_movies(movieIDs):
+                movie = await movie
+
+        movieIDs can be any iterable, consumed while the movies are
+        retrieved; at most workers (by default, the number of workers
+        of the access system) movies are retrieved at the same time."""
+        return self._as_completed(lambda movieID: self.get_movie(movieID, info, modFunct, keys=keys),
+                                  movieIDs, workers)
+
+    def get_people(self, personIDs, info=Person.Person.default_info, modFunct=None,
+                   workers=None):
+        """Return an iterator over awaitables, each returning one of the
+        Person objects for the given personIDs, in the order they're complete;
+        personIDs is consumed and limited like the movieIDs of get_movies."""
+        return self._as_completed(lambda personID: self.get_person(personID, info, modFunct),
+                                  personIDs, workers)
+
+    async def get_character(self, characterID, info=Character.Character.default_info,
+                            modFunct=None):
+        """Return a Character object for the given characterID."""
+        characterID = self._normalize_characterID(characterID)
+        characterID = self._get_real_characterID(characterID)
+        character = Character.Character(characterID=characterID,
+                                        accessSystem=self.accessSystem)
+        modFunct = modFunct or self._defModFunct
+        if modFunct is not None:
+            character.set_mod_funct(modFunct)
+        await self.update(character, info)
+        return character
+
+    async def get_company(self, companyID, info=Company.Company.default_info,
+                          modFunct=None):
+        """Return a Company object for the given companyID.
+
+        info is the list of sets of information to retrieve."""
+        companyID = self._normalize_companyID(companyID)
+        companyID = self._get_real_companyID(companyID)
+        company = Company.Company(companyID=companyID, accessSystem=self.accessSystem)
+        modFunct = modFunct or self._defModFunct
+        if modFunct is not None:
+            company.set_mod_funct(modFunct)
+        await self.update(company, info)
+        return company
+
+    async def search_movie(self, title, results=None, _episodes=False):
+        """Return a list of Movie objects for a query for the given title.
+        The results argument is the maximum number of results to return."""
+        return await self._run(IMDbBase.search_movie, title, results, _episodes)
+
+    async def search_episode(self, title, results=None):
+        """Return a list of Movie objects for a query for the given title;
+        this method searches only for titles of tv (mini) series' episodes."""
+        return await self.search_movie(title, results=results, _episodes=True)
+
+    async def search_movie_advanced(self, title=None, adult=None, results=None,
+                                    sort=None, sort_dir=None):
+        """Return a list of Movie objects for a query for the given title.
+        The results argument is the maximum number of results to return."""
+        return await self._run(IMDbBase.search_movie_advanced, title, adult, results,
+                               sort, sort_dir)
+
+    async def search_person(self, name, results=None):
+        """Return a list of Person objects for a query for the given name.
+        The results argument is the maximum number of results to return."""
+        return await self._run(IMDbBase.search_person, name, results)
+
+    async def search_company(self, name, results=None):
+        """Return a list of Company objects for a query for the given name.
+        The results argument is the maximum number of results to return."""
+        return await self._run(IMDbBase.search_company, name, results)
+
+    async def search_keyword(self, keyword, results=None):
+        """Search for existing keywords, similar to the given one."""
+        return await self._run(IMDbBase.search_keyword, keyword, results)
+
+    async def get_keyword(self, keyword, results=None, page=None):
+        """Return a list of movies for the given keyword."""
+        return await self._run(IMDbBase.get_keyword, keyword, results, page)
+
+    async def get_top250_movies(self):
+        """Return the list of the top 250 movies."""
+        return await self._run(IMDbBase.get_top250_movies)
+
+    async def get_bottom100_movies(self):
+        """Return the list of the bottom 100 movies."""
+        return await self._run(IMDbBase.get_bottom100_movies)
@@ -0,0 +1,628 @@
+# Copyright 2020 Davide Alberani <da@erlug.linux.it>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+
+"""
+This module provides the caches used by :class:`imdb.parser.http.IMDbURLopener`
+to store the retrieved web pages.
+
+Three backends are available: :class:`MemoryCache`, :class:`FileSystemCache`
+and :class:`SQLiteCache`. Every one of them is bounded in size (the least
+recently used pages are evicted first), and considers a page fresh for
+a time that depends on its URL (see :data:`DEFAULT_TTL`).
+Stale pages are revalidated with the web server, using the ETag and
+Last-Modified headers, when available.
+
+The same backends can store the results of the parsers (see
+:class:`ParseCache`), so that unchanged pages are not parsed again.
+
+Example::
+
+    from imdb import IMDb
+    from imdb.parser.http.cache import FileSystemCache
+
+    ia = IMDb(cache=FileSystemCache('~/.cache/imdbpy', maxSize=512 * 1024 * 1024))
+    ...
+    print(ia.urlOpener.cache.get_stats())
+"""
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import inspect
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from hashlib import md5, sha1
+
+from imdb import PY2, VERSION
+
+if PY2:
+    _integer_types = (int, long)  # noqa: F821
+else:
+    _integer_types = (int,)
+
+_logger = logging.getLogger('imdbpy.parser.http.cache')
+
+_HOUR = 60 * 60
+_DAY = 24 * _HOUR
+
+# Time, in seconds, a page is considered fresh: the first pattern
+# matching the URL wins; None means that the page never expires.
+DEFAULT_TTL = [
+    (r'/chart/', 6 * _HOUR),
+    (r'/find\?|/search/', _DAY),
+    (r'/(news|reviews|criticreviews|ratings|tvschedule)\b', _DAY),
+    (r'/(bio|awards|otherworks|publicity|trivia|goofs|quotes|'
+     r'alternateversions|crazycredits|movieconnections|locations|technical|'
+     r'soundtrack|taglines|keywords|faq|parentalguide)\b', 30 * _DAY),
+    (r'', 7 * _DAY)
+]
+
+
+class CachedResponse(object):
+    """A web page stored in a cache."""
+    def __init__(self, url, content, charset=None, etag=None, lastModified=None,
+                 finalURL=None, stored=None):
+        self.url = url
+        self.content = content
+        self.charset = charset
+        self.etag = etag
+        self.lastModified = lastModified
+        self.finalURL = finalURL or url
+        if stored is None:
+            stored = time.time()
+        self.stored = stored
+
+    def get_meta(self):
+        """Return a dictionary with everything but the content."""
+        return {'url': self.url, 'charset': self.charset, 'etag': self.etag,
+                'lastModified': self.lastModified, 'finalURL': self.finalURL,
+                'stored': self.stored}
+
+    @classmethod
+    def from_meta(cls, meta, content):
+        """Build a response from its metadata and content."""
+        return cls(content=content, **meta)
+
+    def can_revalidate(self):
+        """Return true if the page can be checked with a conditional request."""
+        return bool(self.etag or self.lastModified)
+
+    def __len__(self):
+        return len(self.content)
+
+
+class ResponseCache(object):
+    """Base class for the caches of web pages.
+
+    *maxSize* -- maximum size of the stored pages, in bytes (None
+                 for no limit).
+    *ttl* -- a number of seconds (or None to never expire the pages), or a
+             list of (regular expression, seconds) tuples, searched in order
+             in the URL of the page; by default, DEFAULT_TTL is used.
+
+    Subclasses must implement _get, _set, _delete, _clear and _keys_by_age."""
+    def __init__(self, maxSize=None, ttl=DEFAULT_TTL):
+        if maxSize is not None:
+            maxSize = int(maxSize)
+        self.maxSize = maxSize
+        if ttl is None or isinstance(ttl, (int, float)):
+            ttl = [('', ttl)]
+        self.ttl = [(re.compile(pattern), seconds) for pattern, seconds in ttl]
+        self._lock = threading.RLock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        """Reset the counters of hits and misses."""
+        self.stats = {'hits': 0, 'misses': 0, 'revalidated': 0,
+                      'stored': 0, 'evicted': 0}
+
+    def get_stats(self):
+        """Return a dictionary with the counters of hits and misses."""
+        stats = dict(self.stats)
+        lookups = stats['hits'] + stats['misses'] + stats['revalidated']
+        stats['hit ratio'] = (stats['hits'] + stats['revalidated']) / lookups if lookups else 0.0
+        return stats
+
+    def count(self, event):
+        """Increment one of the counters."""
+        with self._lock:
+            self.stats[event] += 1
+
+    @staticmethod
+    def make_key(url):
+        """Return the key used to store a page."""
+        return md5(url.encode('utf-8')).hexdigest()
+
+    def get_ttl(self, url):
+        """Return the number of seconds a page is considered fresh."""
+        for pattern, seconds in self.ttl:
+            if pattern.search(url):
+                return seconds
+        return None
+
+    def is_fresh(self, response, now=None):
+        """Return true if the response doesn't need to be revalidated."""
+        ttl = self.get_ttl(response.url)
+        if ttl is None:
+            return True
+        if now is None:
+            now = time.time()
+        return response.stored + ttl > now
+
+    def get(self, url):
+        """Return the stored response for the given URL (fresh or not),
+        or None."""
+        try:
+            return self._get(self.make_key(url))
+        except Exception:
+            _logger.warning('unable to read %s from the cache', url, exc_info=True)
+            return None
+
+    def set(self, response):
+        """Store a response."""
+        try:
+            with self._lock:
+                self._set(self.make_key(response.url), response)
+                self.count('stored')
+                self._evict()
+        except Exception:
+            _logger.warning('unable to store %s in the cache', response.url, exc_info=True)
+
+    def delete(self, url):
+        """Remove the response for the given URL."""
+        with self._lock:
+            self._delete(self.make_key(url))
+
+    def clear(self):
+        """Remove every stored response."""
+        with self._lock:
+            self._clear()
+
+    def _evict(self):
+        """Remove the least recently used responses, until the
+        cache fits its maximum size."""
+        if self.maxSize is None:
+            return
+        size = self.size()
+        if size <= self.maxSize:
+            return
+        for key, length in self._keys_by_age():
+            self._delete(key)
+            self.count('evicted')
+            size -= length
+            if size <= self.maxSize:
+                break
+
+    def size(self):
+        """Return the size of the stored pages, in bytes."""
+        raise NotImplementedError('override this method')
+
+    def _get(self, key):
+        raise NotImplementedError('override this method')
+
+    def _set(self, key, response):
+        raise NotImplementedError('override this method')
+
+    def _delete(self, key):
+        raise NotImplementedError('override this method')
+
+    def _clear(self):
+        raise NotImplementedError('override this method')
+
+    def _keys_by_age(self):
+        """Return (key, size) tuples, least recently used first."""
+        raise NotImplementedError('override this method')
+
+
+class MemoryCache(ResponseCache):
+    """A cache that keeps the pages in memory."""
+    def __init__(self, maxSize=64 * 1024 * 1024, ttl=DEFAULT_TTL):
+        super(MemoryCache, self).__init__(maxSize=maxSize, ttl=ttl)
+        self._data = OrderedDict()
+        self._size = 0
+
+    def size(self):
+        return self._size
+
+    def _get(self, key):
+        with self._lock:
+            response = self._data.get(key)
+            if response is not None:
+                # Mark it as the most recently used.
+                del self._data[key]
+                self._data[key] = response
+            return response
+
+    def _set(self, key, response):
+        self._delete(key)
+        self._data[key] = response
+        self._size += len(response)
+
+    def _delete(self, key):
+        response = self._data.pop(key, None)
+        if response is not None:
+            self._size -= len(response)
+
+    def _clear(self):
+        self._data.clear()
+        self._size = 0
+
+    def _keys_by_age(self):
+        return [(key, len(response)) for key, response in list(self._data.items())]
+
+
+class FileSystemCache(ResponseCache):
+    """A cache that stores every page in a file of the given directory,
+    along with a .meta file describing it."""
+    def __init__(self, path, maxSize=None, ttl=DEFAULT_TTL):
+        super(FileSystemCache, self).__init__(maxSize=maxSize, ttl=ttl)
+        self.path = os.path.abspath(os.path.expanduser(path))
+        if not os.path.isdir(self.path):
+            os.makedirs(self.path)
+        self._index = None
+
+    def _get_index(self):
+        """Return a dictionary with the size and the access time of every
+        stored page; it's read from the disk only once."""
+        if self._index is None:
+            index = {}
+            for fname in os.listdir(self.path):
+                if not fname.endswith('.meta'):
+                    continue
+                key = fname[:-5]
+                try:
+                    st = os.stat(os.path.join(self.path, key))
+                except OSError:
+                    continue
+                index[key] = [st.st_size, st.st_atime]
+            self._index = index
+        return self._index
+
+    def size(self):
+        with self._lock:
+            return sum(size for size, atime in self._get_index().values())
+
+    def iter_responses(self):
+        """Iterate over the stored responses."""
+        for fname in sorted(os.listdir(self.path)):
+            if fname.endswith('.meta'):
+                response = self._get(fname[:-5], touch=False)
+                if response is not None:
+                    yield response
+
+    def _get(self, key, touch=True):
+        fname = os.path.join(self.path, key)
+        try:
+            with open(fname + '.meta', 'r') as f:
+                meta = json.load(f)
+            with open(fname, 'rb') as f:
+                content = f.read()
+        except (IOError, OSError, ValueError):
+            return None
+        if touch:
+            with self._lock:
+                entry = self._get_index().get(key)
+                if entry is not None:
+                    entry[1] = time.time()
+        return CachedResponse.from_meta(meta, content)
+
+    def _set(self, key, response):
+        fname = os.path.join(self.path, key)
+        # Write to temporary files, so that readers never see a partial page.
+        tmp_suffix = '.%d.%d.tmp' % (os.getpid(), threading.current_thread().ident)
+        with open(fname + tmp_suffix, 'wb') as f:
+            f.write(response.content)
+        os.rename(fname + tmp_suffix, fname)
+        with open(fname + '.meta' + tmp_suffix, 'w') as f:
+            json.dump(response.get_meta(), f)
+        os.rename(fname + '.meta' + tmp_suffix, fname + '.meta')
+        self._get_index()[key] = [len(response), time.time()]
+
+    def _delete(self, key):
+        fname = os.path.join(self.path, key)
+        for name in (fname + '.meta', fname):
+            try:
+                os.remove(name)
+            except OSError:
+                pass
+        self._get_index().pop(key, None)
+
+    def _clear(self):
+        for key in list(self._get_index().keys()):
+            self._delete(key)
+
+    def _keys_by_age(self):
+        index = self._get_index()
+        return [(key, index[key][0]) for key in sorted(index, key=lambda k: index[k][1])]
+
+
+class SQLiteCache(ResponseCache):
+    """A cache that stores the pages in a SQLite database."""
+    def __init__(self, path, maxSize=None, ttl=DEFAULT_TTL):
+        super(SQLiteCache, self).__init__(maxSize=maxSize, ttl=ttl)
+        self.path = path
+        if path != ':memory:':
+            self.path = os.path.abspath(os.path.expanduser(path))
+        # Imported here, since it's not needed by the other caches.
+        import sqlite3
+        self._binary = sqlite3.Binary
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS responses ('
+                'key TEXT PRIMARY KEY, meta TEXT, content BLOB, '
+                'size INTEGER, accessed REAL)'
+            )
+            self._conn.execute(
+                'CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)'
+            )
+            self._conn.commit()
+
+    def size(self):
+        with self._lock:
+            row = self._conn.execute('SELECT SUM(size) FROM responses').fetchone()
+        return row[0] or 0
+
+    def _get(self, key):
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT meta, content FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute('UPDATE responses SET accessed = ? WHERE key = ?',
+                               (time.time(), key))
+            self._conn.commit()
+        return CachedResponse.from_meta(json.loads(row[0]), bytes(row[1]))
+
+    def _set(self, key, response):
+        self._conn.execute(
+            'INSERT OR REPLACE INTO responses (key, meta, content, size, accessed) '
+            'VALUES (?, ?, ?, ?, ?)',
+            (key, json.dumps(response.get_meta()), self._binary(response.content),
+             len(response), time.time())
+        )
+        self._conn.commit()
+
+    def _delete(self, key):
+        self._conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+        self._conn.commit()
+
+    def _clear(self):
+        self._conn.execute('DELETE FROM responses')
+        self._conn.commit()
+
+    def _keys_by_age(self):
+        return self._conn.execute(
+            'SELECT key, size FROM responses ORDER BY accessed'
+        ).fetchall()
+
+    def close(self):
+        """Close the database."""
+        self._conn.close()
+
+
+def make_cache(spec, **kwds):
+    """Return a cache from the given description; it can be an instance of
+    ResponseCache, or a string: "memory", "sqlite:PATH" or the path of
+    a directory (optionally prefixed by "file:")."""
+    if spec is None or isinstance(spec, ResponseCache):
+        return spec
+    if spec == 'memory':
+        return MemoryCache(**kwds)
+    if spec.startswith('sqlite:'):
+        return SQLiteCache(spec[7:], **kwds)
+    if spec.startswith('file:'):
+        spec = spec[5:]
+    return FileSystemCache(spec, **kwds)
+
+
+_containers = None
+
+
+def _get_containers():
+    """Return the classes and the functions that can be stored in
+    a parsed result, by name."""
+    global _containers
+    if _containers is None:
+        from imdb import utils
+        from imdb.Character import Character
+        from imdb.Company import Company
+        from imdb.Movie import Movie
+        from imdb.Person import Person
+        _containers = dict((obj.__name__, obj) for obj in (
+            Character, Company, Movie, Person, utils.RolesList, utils.modNull, utils.modClearRefs,
+            utils.modClearTitleRefs, utils.modClearNameRefs, utils.modClearCharacterRefs))
+    return _containers
+
+
+# Keys of the dictionaries describing what JSON can't represent.
+_MARKERS = ('__tuple__', '__items__', '__object__', '__ref__', '__modFunct__')
+
+
+def _encode_result(obj, modFunct):
+    """Convert a parsed result into data that can be stored as JSON; the
+    modFunct of the parser is replaced by a marker.  Raise a TypeError for
+    the values that can't be converted."""
+    if obj is None or isinstance(obj, (bool, float, str) + _integer_types) or (PY2 and isinstance(obj, unicode)):
+        return obj
+    if type(obj) is list:
+        return [_encode_result(item, modFunct) for item in obj]
+    if type(obj) is tuple:
+        return {'__tuple__': [_encode_result(item, modFunct) for item in obj]}
+    if type(obj) is dict:
+        if all(isinstance(key, str) and key not in _MARKERS for key in obj):
+            return dict((key, _encode_result(value, modFunct)) for key, value in obj.items())
+        return {'__items__': [[_encode_result(key, modFunct), _encode_result(value, modFunct)]
+                              for key, value in obj.items()]}
+    if obj is modFunct:
+        return {'__modFunct__': None}
+    containers = _get_containers()
+    name = getattr(obj, '__name__', None) or obj.__class__.__name__
+    if containers.get(name) is obj:
+        return {'__ref__': name}
+    cls = obj.__class__
+    if containers.get(cls.__name__) is cls:
+        # Objects of IMDbPY, and lists of them (like RolesList) with their attributes.
+        state = [list(obj), vars(obj)] if isinstance(obj, list) else vars(obj)
+        return {'__object__': [cls.__name__, _encode_result(state, modFunct)]}
+    raise TypeError('unable to store %r' % (obj,))
+
+
+def _decode_result(obj, modFunct):
+    """Convert the data stored by _encode_result back into a result,
+    using the modFunct of the current parser."""
+    if isinstance(obj, list):
+        return [_decode_result(item, modFunct) for item in obj]
+    if not isinstance(obj, dict):
+        return obj
+    if len(obj) == 1:
+        key, value = list(obj.items())[0]
+        if key == '__tuple__':
+            return tuple(_decode_result(item, modFunct) for item in value)
+        if key == '__items__':
+            return dict((_decode_result(k, modFunct), _decode_result(v, modFunct)) for k, v in value)
+        if key == '__modFunct__':
+            return modFunct
+        if key == '__ref__':
+            return _get_containers()[value]
+        if key == '__object__':
+            name, state = value
+            cls = _get_containers()[name]
+            if not isinstance(cls, type):
+                raise ValueError('%s is not a class' % name)
+            state = _decode_result(state, modFunct)
+            if issubclass(cls, list):
+                instance = cls(state[0])
+                instance.__dict__.update(state[1])
+            else:
+                instance = cls.__new__(cls)
+                instance.__dict__.update(state)
+            return instance
+    return dict((key, _decode_result(value, modFunct)) for key, value in obj.items())
+
+
+_parserVersions = {}
+
+
+def _get_source_digest(cls):
+    """Return a hash of the source code of the modules defining the given
+    parser class (and its base classes), the rules engine and the
+    utilities of IMDbPY."""
+    digest = sha1(VERSION.encode('ascii'))
+    names = set(klass.__module__ for klass in cls.__mro__)
+    names.update(['imdb.utils', 'imdb.parser.http.utils', 'imdb.parser.http.piculet'])
+    for name in sorted(names):
+        digest.update(name.encode('utf-8'))
+        try:
+            with open(inspect.getsourcefile(sys.modules[name]), 'rb') as f:
+                digest.update(f.read())
+        except (KeyError, TypeError, IOError, OSError):
+            # Built-in modules, or no source code available.
+            continue
+    return digest.hexdigest()[:16]
+
+
+class ParseCache(object):
+    """A cache for the results of the parsers, stored in a ResponseCache.
+
+    Results are identified by the URL of the page, the parser (and
+    its version), the arguments of the parse method and a hash of the
+    content of the page: when the page is unchanged, the parse is skipped.
+
+    The version of a parser is a hash of the source code of the modules
+    defining it (and of the rest of the parsing code), followed by the
+    _version attribute of the parser: any change to the parser invalidates
+    its stored results.  Without the source code, only the version of
+    IMDbPY is considered.
+
+    The results are stored as JSON, and only the objects of IMDbPY (movies,
+    persons, characters and companies) are rebuilt from them: loading
+    a result never runs any code, even from a shared cache.
+
+    The same ResponseCache can store both the pages and the results: the
+    results have their own counters of hits and misses (see get_stats),
+    while the ones of the pages are left untouched."""
+    def __init__(self, cache):
+        self.cache = cache
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        """Reset the counters of hits and misses."""
+        self.stats = {'hits': 0, 'misses': 0, 'stored': 0}
+
+    def count(self, event):
+        """Increment one of the counters."""
+        with self._lock:
+            self.stats[event] += 1
+
+    @staticmethod
+    def get_parser_version(parser):
+        """Return the version of the given parser."""
+        cls = parser.__class__
+        digest = _parserVersions.get(cls)
+        if digest is None:
+            digest = _parserVersions[cls] = _get_source_digest(cls)
+        return '%s.%s' % (digest, getattr(parser, '_version', 0))
+
+    def make_url(self, parser, url, content, kwds):
+        """Return the URL under which the result is stored."""
+        if not isinstance(content, bytes):
+            content = content.encode('utf-8')
+        return 'parsed:%s:%s:%s:%s:%r' % (
+            parser.__class__.__name__, self.get_parser_version(parser),
+            sha1(content).hexdigest(), url, sorted(kwds.items())
+        )
+
+    def get(self, parser, url, content, kwds):
+        """Return the stored result, or None."""
+        response = self.cache.get(self.make_url(parser, url, content, kwds))
+        if response is None:
+            self.count('misses')
+            return None
+        try:
+            result = _decode_result(json.loads(response.content.decode('utf-8')), parser._modFunct)
+        except Exception:
+            _logger.warning('unable to load a parsed result for %s', url, exc_info=True)
+            self.count('misses')
+            return None
+        self.count('hits')
+        return result
+
+    def set(self, parser, url, content, kwds, result):
+        """Store a result."""
+        try:
+            stored = json.dumps(_encode_result(result, parser._modFunct), separators=(',', ':'))
+        except Exception:
+            _logger.warning('unable to store a parsed result for %s', url, exc_info=True)
+            return
+        self.cache.set(CachedResponse(self.make_url(parser, url, content, kwds),
+                                      stored.encode('utf-8'), charset='utf-8'))
+        self.count('stored')
+
+    def get_stats(self):
+        """Return a dictionary with the counters of hits and misses of
+        the results."""
+        stats = dict(self.stats)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit ratio'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
@@ -0,0 +1,245 @@
+# Copyright 2020 Davide Alberani <da@erlug.linux.it>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+
+"""
+This module provides the classes (and the instances) that are used to parse
+the structured data (JSON-LD) embedded in the IMDb pages on the www.imdb.com
+server about a movie or a person.
+
+For example, for "The Matrix" the referred page would be:
+
+main
+    https://www.imdb.com/title/tt0133093/
+
+The data is located with a simple scan of the page, without building
+a DOM; it contains only a subset of the information found by the parsers
+of the :mod:`imdb.parser.http.movieParser` and
+:mod:`imdb.parser.http.personParser` modules, but it's much cheaper to get.
+"""
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import json
+import re
+
+from imdb import PY2
+from imdb.Person import Person
+
+from . import timing
+from .utils import DOMParserBase, analyze_imdbid
+
+
+if PY2:
+    from HTMLParser import HTMLParser
+    unescape = HTMLParser().unescape
+else:
+    from html import unescape
+
+
+_MARKER = 'application/ld+json'
+_END_TAG = '>'
+_END_SCRIPT = '</script>'
+
+# Kinds of titles, from the JSON-LD types.
+KIND_MAP = {
+    'Movie': 'movie',
+    'TVMovie': 'tv movie',
+    'TVSeries': 'tv series',
+    'TVEpisode': 'episode',
+    'VideoGame': 'video game'
+}
+
+_re_duration = re.compile(r'^PT(?:(\d+)H)?(?:(\d+)M)?')
+
+
+def extract_jsonld(content):
+    """Return the decoded JSON-LD blocks found in the given page
+    (a string or bytes), as a list."""
+    marker = _MARKER
+    endTag = _END_TAG
+    endScript = _END_SCRIPT
+    if isinstance(content, bytes):
+        marker = marker.encode('ascii')
+        endTag = endTag.encode('ascii')
+        endScript = endScript.encode('ascii')
+    blocks = []
+    pos = content.find(marker)
+    while pos != -1:
+        start = content.find(endTag, pos) + 1
+        end = content.find(endScript, start)
+        if start == 0 or end == -1:
+            break
+        block = content[start:end]
+        if isinstance(block, bytes):
+            block = block.decode('utf-8', 'replace')
+        try:
+            blocks.append(json.loads(block))
+        except ValueError:
+            pass
+        pos = content.find(marker, end)
+    return blocks
+
+
+def _unescape(text):
+    """Strings in the JSON-LD data may contain HTML entities."""
+    if not text:
+        return text
+    text = text.strip()
+    if '&' in text:
+        text = unescape(text)
+    return text
+
+
+def _as_list(value):
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return value
+    return [value]
+
+
+class JSONLDParserBase(DOMParserBase):
+    """Base parser for the JSON-LD data embedded in a page; it shares the
+    interface of the DOM parsers, but no DOM is built."""
+    # The JSON-LD types handled by the parser.
+    _types = ()
+    # The keys that can be found in the JSON-LD data.
+    jsonKeys = ()
+
+    def parse(self, html_string, getRefs=None, keys=None, **kwds):
+        """Return the dictionary generated from the JSON-LD data of
+        the given page; if keys is set, only the given keys are kept."""
+        caller = self._start(getRefs, keys)
+        clock = timing.start(self._cname)
+        try:
+            data = {}
+            if html_string:
+                for block in extract_jsonld(html_string):
+                    if isinstance(block, dict) and block.get('@type') in self._types:
+                        try:
+                            data = self.process_jsonld(block)
+                        except Exception:
+                            self._logger.error('%s: caught exception processing JSON-LD data',
+                                               self._cname, exc_info=True)
+                        break
+            if self._keys:
+                data = dict((k, v) for k, v in data.items() if k in self._keys)
+            self.set_objects_params(data)
+            if clock is not None:
+                clock.lap('rules', len(html_string or ''), len(data))
+            return {'data': data, 'titlesRefs': {}, 'namesRefs': {}}
+        finally:
+            self._end(caller)
+
+    def process_jsonld(self, block):
+        """Return the data from the given JSON-LD block."""
+        return {}
+
+    def _build_persons(self, value):
+        """Return a list of Person instances, from the given JSON-LD data."""
+        persons = []
+        for item in _as_list(value):
+            if not isinstance(item, dict) or item.get('@type') != 'Person':
+                continue
+            personID = analyze_imdbid(item.get('url'))
+            name = _unescape(item.get('name'))
+            if personID and name:
+                persons.append(Person(personID=personID, name=name))
+        return persons
+
+
+class JSONLDMovieParser(JSONLDParserBase):
+    """Parser for the JSON-LD data of the main page of a given movie.
+
+    Example::
+
+        jparser = JSONLDMovieParser()
+        result = jparser.parse(main_html_string)
+    """
+    _types = tuple(KIND_MAP)
+    jsonKeys = ('title', 'year', 'kind', 'genres', 'rating', 'votes', 'director',
+                'writer', 'plot outline', 'cover url', 'runtimes', 'imdbID')
+
+    def process_jsonld(self, block):
+        data = {}
+        title = _unescape(block.get('name'))
+        if title:
+            data['title'] = title
+        published = block.get('datePublished') or ''
+        if published[:4].isdigit():
+            data['year'] = int(published[:4])
+        data['kind'] = KIND_MAP.get(block.get('@type'), 'movie')
+        genres = [_unescape(g) for g in _as_list(block.get('genre')) if g]
+        if genres:
+            data['genres'] = genres
+        rating = block.get('aggregateRating') or {}
+        try:
+            if rating.get('ratingValue'):
+                data['rating'] = float(rating['ratingValue'])
+            if rating.get('ratingCount'):
+                data['votes'] = int(rating['ratingCount'])
+        except (TypeError, ValueError):
+            pass
+        for key, jsonKey in (('director', 'director'), ('writer', 'creator')):
+            persons = self._build_persons(block.get(jsonKey))
+            if persons:
+                data[key] = persons
+        description = _unescape(block.get('description'))
+        if description:
+            data['plot outline'] = description
+        if block.get('image'):
+            data['cover url'] = block['image']
+        duration = _re_duration.match(block.get('duration') or '')
+        if duration and (duration.group(1) or duration.group(2)):
+            minutes = int(duration.group(1) or 0) * 60 + int(duration.group(2) or 0)
+            data['runtimes'] = [str(minutes)]
+        imdbID = analyze_imdbid(block.get('url'))
+        if imdbID:
+            data['imdbID'] = imdbID
+        return data
+
+
+class JSONLDPersonParser(JSONLDParserBase):
+    """Parser for the JSON-LD data of the main page of a given person.
+
+    Example::
+
+        jparser = JSONLDPersonParser()
+        result = jparser.parse(main_html_string)
+    """
+    _types = ('Person',)
+    jsonKeys = ('name', 'headshot', 'birth date', 'death date', 'imdbID')
+
+    def process_jsonld(self, block):
+        data = {}
+        name = _unescape(block.get('name'))
+        if name:
+            data['name'] = name
+        if block.get('image'):
+            data['headshot'] = block['image']
+        for key, jsonKey in (('birth date', 'birthDate'), ('death date', 'deathDate')):
+            if block.get(jsonKey):
+                data[key] = block[jsonKey]
+        imdbID = analyze_imdbid(block.get('url'))
+        if imdbID:
+            data['imdbID'] = imdbID
+        return data
+
+
+_OBJECTS = {
+    'movie_parser': ((JSONLDMovieParser,), None),
+    'person_parser': ((JSONLDPersonParser,), None)
+}
@@ -670,6 +670,22 @@ class DOMHTMLMovieParser(DOMParserBase):
         )
     ]
 
+    _keysRules = {
+        'year': ('title',),
+        'kind': ('title',),
+        'series years': ('title', 'series years'),
+        'director': ('misc sections', 'thin director'),
+        'writer': ('misc sections', 'thin writer'),
+        'akas': ('akas', 'other akas'),
+        'languages': ('language',),
+        'seasons': ('number of seasons',),
+        'season': ('season/episode',),
+        'episode': ('season/episode',),
+        'top 250 rank': ('top/bottom rank',),
+        'bottom 100 rank': ('top/bottom rank',),
+        'episode of': ('title', 'tv series link')
+    }
+
     preprocessors = [
         ('/releaseinfo">', '"><span imdbpy="airdate">'),
         (re.compile(r'(<b class="blackcatheader">.+?</b>)', re.I), r'</div><div>\1'),
@@ -0,0 +1,135 @@
+# Copyright 2020 Davide Alberani <da@erlug.linux.it>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+
+"""
+This module provides a pool of processes used by
+:class:`imdb.parser.http.IMDbHTTPAccessSystem` to parse the retrieved pages
+out of the main process, so that many pages can be parsed at the same time
+without being limited by the global interpreter lock.
+
+The pages are parsed by the workers with their own instances of the parsers,
+built like the ones of the access system; the results are sent back
+pickled, and the modFunct of the parser of the main process is set again
+in the Movie and Person instances.
+"""
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import logging
+import pickle
+from importlib import import_module
+from io import BytesIO
+
+from imdb._exceptions import IMDbError
+
+
+_logger = logging.getLogger('imdbpy.parser.http.parsepool')
+
+
+class _ResultPickler(pickle.Pickler):
+    """Pickle a parsed result, without the modFunct of the parser
+    (it's not always picklable)."""
+    def __init__(self, file, modFunct):
+        pickle.Pickler.__init__(self, file, pickle.HIGHEST_PROTOCOL)
+        self._modFunct = modFunct
+
+    def persistent_id(self, obj):
+        if obj is not None and obj is self._modFunct:
+            return 'modFunct'
+        return None
+
+
+class _ResultUnpickler(pickle.Unpickler):
+    """Load a parsed result, using the modFunct of the current parser."""
+    def __init__(self, file, modFunct):
+        pickle.Unpickler.__init__(self, file)
+        self._modFunct = modFunct
+
+    def persistent_load(self, pid):
+        return self._modFunct
+
+
+class _ModFunct(object):
+    """Placeholder for the modFunct of the parsers of the main process;
+    in the worker processes, it leaves the strings unchanged."""
+    def __call__(self, s, titlesRefs, namesRefs):
+        return s
+
+
+# Parsers instanced by a worker process, by module and name.
+_parsers = {}
+_modFunct = _ModFunct()
+
+
+def _get_parser(moduleName, name, accessSystem):
+    """Return the parser with the given name in the _OBJECTS dictionary
+    of the given module, instancing it if needed."""
+    parser = _parsers.get((moduleName, name))
+    if parser is None:
+        entry = import_module(moduleName)._OBJECTS[name]
+        parser = entry[0][0]()
+        for key, value in (entry[1] or {}).items():
+            setattr(parser, key, value)
+        parser._modFunct = _modFunct
+        _parsers[(moduleName, name)] = parser
+    parser._as = accessSystem
+    return parser
+
+
+def parse_page(moduleName, name, accessSystem, content, encoding, kwds):
+    """Parse a page in a worker process, and return the pickled result."""
+    parser = _get_parser(moduleName, name, accessSystem)
+    result = parser.parse(content, encoding=encoding, **kwds)
+    stream = BytesIO()
+    _ResultPickler(stream, _modFunct).dump(result)
+    return stream.getvalue()
+
+
+class ParsePool(object):
+    """A pool of processes parsing the pages; processes is the number of
+    workers (by default, the number of processors)."""
+    def __init__(self, processes=None):
+        # Imported here: the multiprocessing machinery is slow to import,
+        # and it's not needed if the pages are parsed in the main process.
+        try:
+            from concurrent.futures import ProcessPoolExecutor
+        except ImportError:
+            # Python 2 without the futures package.
+            raise IMDbError('a pool of processes needs the concurrent.futures module')
+        self.processes = processes
+        self._executor = ProcessPoolExecutor(max_workers=processes)
+
+    def parse(self, parser, content, encoding=None, **kwds):
+        """Parse a page with the given parser in a worker process, waiting
+        for the result; None is returned if the parser was not built by
+        an access system, or if the pool is not working."""
+        objectName = getattr(parser, '_objectName', None)
+        if objectName is None:
+            return None
+        moduleName, name = objectName
+        try:
+            future = self._executor.submit(parse_page, moduleName, name, parser._as,
+                                           content, encoding, kwds)
+            data = future.result()
+        except Exception:
+            _logger.warning('unable to parse a page with %s in a worker process',
+                            name, exc_info=True)
+            return None
+        return _ResultUnpickler(BytesIO(data), parser._modFunct).load()
+
+    def shutdown(self, wait=True):
+        """Stop the worker processes."""
+        self._executor.shutdown(wait=wait)
@@ -30,6 +30,7 @@ import logging
 import os
 import re
 import sys
+import time
 from argparse import ArgumentParser
 from collections import deque
 from functools import partial
@@ -152,7 +153,7 @@ class HTMLNormalizer(HTMLParser):
             # stack empty -> not in omit mode
             if '@' in tag:
                 # email address in angular brackets
-                print('&lt;%s&gt;' % tag, end='')
+                self.emit_data('<%s>' % tag)
                 return
             if (tag == 'li') and (self._open_tags[-1] == 'li'):
                 _logger.debug('opened "li" without closing previous "li", adding closing tag')
@@ -166,18 +167,11 @@ class HTMLNormalizer(HTMLParser):
                     _logger.debug('no value for "%s" attribute of "%s", adding empty value',
                                   attr_name, tag)
                     attr_value = ''
-                markup = '%(name)s="%(value)s"' % {
-                    'name': attr_name,
-                    'value': html_escape(attr_value, quote=True)
-                }
-                attributes.append(markup)
-            line = '<%(tag)s%(attrs)s%(slash)s>' % {
-                'tag': tag,
-                'attrs': (' ' + ' '.join(attributes)) if len(attributes) > 0 else '',
-                'slash': ' /' if tag in self.SELF_CLOSING_TAGS else ''
-            }
-            print(line, end='')
-            if tag not in self.SELF_CLOSING_TAGS:
+                attributes.append((attr_name, attr_value))
+            self.emit_starttag(tag, attributes)
+            if tag in self.SELF_CLOSING_TAGS:
+                self.emit_endtag(tag)
+            else:
                 self._open_tags.append(tag)
 
     def handle_endtag(self, tag):
@@ -191,7 +185,7 @@ class HTMLNormalizer(HTMLParser):
                     self.handle_endtag('li')
                 if tag == last:
                     # expected end tag
-                    print('</%(tag)s>' % {'tag': tag}, end='')
+                    self.emit_endtag(tag)
                     self._open_tags.pop()
                 elif tag not in self._open_tags:
                     _logger.debug('closing tag "%s" without opening tag', tag)
@@ -199,8 +193,8 @@ class HTMLNormalizer(HTMLParser):
                 elif tag == self._open_tags[-2]:
                     _logger.debug('unexpected closing tag "%s" instead of "%s", closing both',
                                   tag, last)
-                    print('</%(tag)s>' % {'tag': last}, end='')
-                    print('</%(tag)s>' % {'tag': tag}, end='')
+                    self.emit_endtag(last)
+                    self.emit_endtag(tag)
                     self._open_tags.pop()
                     self._open_tags.pop()
         elif (tag in self.omit_tags) and (tag == self._open_omitted_tags[-1]):
@@ -211,20 +205,52 @@ class HTMLNormalizer(HTMLParser):
         """Process collected character data."""
         if not self._open_omitted_tags:
             # stack empty -> not in omit mode
-            line = html_escape(data)
-            print(line.decode('utf-8') if PY2 and isinstance(line, bytes) else line, end='')
+            self.emit_data(data)
 
     def handle_entityref(self, name):
         """Process an entity reference."""
         # XXX: doesn't get called if convert_charrefs=True
         num = name2codepoint.get(name)  # we are sure we're on PY2 here
         if num is not None:
-            print('&#%(ref)d;' % {'ref': num}, end='')
+            self.handle_data(unichr(num))   # noqa: F821
 
     def handle_charref(self, name):
         """Process a character reference."""
         # XXX: doesn't get called if convert_charrefs=True
-        print('&#%(ref)s;' % {'ref': name}, end='')
+        num = int(name[1:], 16) if name[:1] in ('x', 'X') else int(name)
+        self.handle_data(unichr(num))   # noqa: F821
+
+    def emit_starttag(self, tag, attrs):
+        """Output the start of an element.
+
+        :sig: (str, Sequence[Tuple[str, str]]) -> None
+        :param tag: Tag of the element.
+        :param attrs: Names and values of the attributes of the element.
+        """
+        line = '<%(tag)s%(attrs)s%(slash)s>' % {
+            'tag': tag,
+            'attrs': ''.join(' %s="%s"' % (name, html_escape(value, quote=True)) for name, value in attrs),
+            'slash': ' /' if tag in self.SELF_CLOSING_TAGS else ''
+        }
+        print(line, end='')
+
+    def emit_endtag(self, tag):
+        """Output the end of an element.
+
+        :sig: (str) -> None
+        :param tag: Tag of the element.
+        """
+        if tag not in self.SELF_CLOSING_TAGS:
+            print('</%(tag)s>' % {'tag': tag}, end='')
+
+    def emit_data(self, data):
+        """Output character data.
+
+        :sig: (str) -> None
+        :param data: Data to output.
+        """
+        line = html_escape(data)
+        print(line.decode('utf-8') if PY2 and isinstance(line, bytes) else line, end='')
 
     # def feed(self, data):
         # super().feed(data)
@@ -233,6 +259,67 @@ class HTMLNormalizer(HTMLParser):
         #     print('</%(tag)s>' % {'tag': tag}, end='')
 
 
+_XML_ATTR_SPACES = re.compile('\r\n?|[\n\t]')
+
+
+class HTMLTreeBuilder(HTMLNormalizer):
+    """HTML cleaner building an XML tree.
+
+    The tree is the same that would be built from the XHTML content
+    generated by the normalizer, without generating and parsing it.
+    """
+
+    def __init__(self, omit_tags=None, omit_attrs=None):
+        """Initialize this builder.
+
+        :sig: (Optional[Iterable[str]], Optional[Iterable[str]]) -> None
+        :param omit_tags: Tags to remove, along with all their content.
+        :param omit_attrs: Attributes to remove.
+        """
+        if PY2:
+            HTMLNormalizer.__init__(self, omit_tags=omit_tags, omit_attrs=omit_attrs)
+        else:
+            super().__init__(omit_tags=omit_tags, omit_attrs=omit_attrs)
+        self._builder = ElementTree.TreeBuilder()
+
+    def updatepos(self, i, j):
+        """Skip counting the lines and columns of the parsed content.
+
+        The position is only used for the error messages of the parser,
+        but counting it takes a good part of the parsing time.
+        """
+        return j
+
+    def emit_starttag(self, tag, attrs):
+        """Start a new element."""
+        # attribute values are normalized like an XML parser would do
+        self._builder.start(tag, {name: _XML_ATTR_SPACES.sub(' ', value) for name, value in attrs})
+
+    def emit_endtag(self, tag):
+        """End the last element."""
+        self._builder.end(tag)
+
+    def emit_data(self, data):
+        """Add character data to the last element."""
+        self._builder.data(data.replace('\r\n', '\n').replace('\r', '\n') if '\r' in data else data)
+
+    def close(self):
+        """Process the remaining data and close the open elements.
+
+        :sig: () -> Element
+        :return: Root element of the tree.
+        """
+        if PY2:
+            HTMLNormalizer.close(self)
+        else:
+            super().close()
+        while self._open_tags:
+            self.emit_endtag(self._open_tags.pop())
+        root = self._builder.close()
+        root.tail = None
+        return root
+
+
 def html_to_xhtml(document, omit_tags=None, omit_attrs=None):
     """Clean HTML and convert to XHTML.
 
@@ -249,6 +336,20 @@ def html_to_xhtml(document, omit_tags=None, omit_attrs=None):
     return out.getvalue()
 
 
+def html_to_tree(document, omit_tags=None, omit_attrs=None):
+    """Clean HTML and build an XML tree, like the one of its XHTML conversion.
+
+    :sig: (str, Optional[Iterable[str]], Optional[Iterable[str]]) -> Element
+    :param document: HTML document to clean and convert.
+    :param omit_tags: Tags to exclude from the tree.
+    :param omit_attrs: Attributes to exclude from the tree.
+    :return: Root element of the tree.
+    """
+    builder = HTMLTreeBuilder(omit_tags=omit_tags, omit_attrs=omit_attrs)
+    builder.feed(document)
+    return builder.close()
+
+
 ###########################################################
 # DATA EXTRACTION OPERATIONS
 ###########################################################
@@ -330,6 +431,79 @@ else:
 _EMPTY = {}     # empty result singleton
 
 
+# function called with the time spent by every rule (see set_rule_timer)
+_rule_timer = None
+
+_wall_time = getattr(time, 'perf_counter', time.time)
+_cpu_time = getattr(time, 'thread_time', None) or getattr(time, 'process_time', None) or time.clock
+
+
+def set_rule_timer(timer):
+    """Set the function used to time the application of the rules.
+
+    :sig: (Optional[Callable[[str, float, float, int], None]]) -> None
+    :param timer: Function called after a rule is applied, with the key of
+        the rule, the wall and CPU time, and the number of extracted items;
+        None to stop timing the rules.
+    """
+    global _rule_timer
+    _rule_timer = timer
+
+
+def _rule_name(rule):
+    """Get the name of a rule, for the timer.
+
+    :sig: (Rule) -> str
+    :param rule: Rule to get the name of.
+    :return: Key of the rule, or the path generating the keys.
+    """
+    if isinstance(rule.key, str):
+        return rule.key
+    path = getattr(rule.key, 'path', None)
+    return '[%s]' % getattr(path, 'path', '?')
+
+
+def _apply_timed(timer, rules, extracts, element, data, shared):
+    """Apply the rules to an element, timing every one of them.
+
+    :sig:
+        (
+            Callable[[str, float, float, int], None],
+            Sequence[Rule],
+            Sequence[Callable[[Element, MutableMapping], Mapping[str, Any]]],
+            Element,
+            MutableMapping[str, Any],
+            MutableMapping
+        ) -> None
+    :param timer: Function receiving the times (see set_rule_timer).
+    :param rules: Rules to apply.
+    :param extracts: Functions extracting the data of the rules.
+    :param element: Element to apply the rules to.
+    :param data: Mapping to store the extracted items in.
+    :param shared: Results shared by the rules for this application.
+    """
+    for rule, extract in zip(rules, extracts):
+        wall, cpu = _wall_time(), _cpu_time()
+        extracted = extract(element, shared)
+        timer(_rule_name(rule), _wall_time() - wall, _cpu_time() - cpu,
+              sum(len(v) if isinstance(v, list) else 1 for v in extracted.values()))
+        data.update(extracted)
+
+
+def _collect(compiled, element, shared):
+    """Get the data extracted by a compiled rule as a new mapping.
+
+    :sig: (Callable[[Element, MutableMapping[str, Any], MutableMapping], None], Element, MutableMapping) -> Mapping
+    :param compiled: Function compiled from a rule (see Rule.compile).
+    :param element: Element to apply the rule to.
+    :param shared: Results shared by the rules for this application.
+    :return: Extracted data.
+    """
+    data = {}
+    compiled(element, data, shared)
+    return data
+
+
 # sigalias: Reducer = Callable[[Sequence[str]], str]
 # sigalias: PathTransformer = Callable[[str], Any]
 # sigalias: MapTransformer = Callable[[Mapping[str, Any]], Any]
@@ -375,6 +549,38 @@ class Extractor:
             return value
         return value if self.transform is None else self.transform(value)
 
+    def compile_apply(self):
+        """Build a function equivalent to the apply method of this extractor.
+
+        :sig: () -> Callable[[Element], ExtractedItem]
+        :return: Function for getting the raw data from an element.
+        """
+        return self.apply
+
+    def compile(self):
+        """Get a function equivalent to the extract method of this extractor.
+
+        The function is built only once and stored in the extractor:
+        the attributes are looked up and the methods are dispatched
+        when it's built, instead of at every element.
+
+        :sig: () -> Callable[[Element], Any]
+        :return: Function for getting the processed data from an element.
+        """
+        compiled = self.__dict__.get('_compiled')
+        if compiled is None:
+            apply, transform = self.compile_apply(), self.transform
+            if transform is None:
+                compiled = apply
+            else:
+                def compiled(element):
+                    value = apply(element)
+                    if (value is None) or (value is _EMPTY):
+                        return value
+                    return transform(value)
+            self._compiled = compiled
+        return compiled
+
     @staticmethod
     def from_map(item):
         """Generate an extractor from a description map.
@@ -463,6 +669,19 @@ class Path(Extractor):
             # _logger.debug('reduced using "%s": "%s"', self.reduce, value)
         return value
 
+    def compile_apply(self):
+        """Build a function equivalent to the apply method of this extractor.
+
+        :sig: () -> Callable[[Element], str]
+        :return: Function for getting the text out of an element.
+        """
+        path, reduce = self.path, self.reduce
+
+        def apply(element):
+            selected = path(element)
+            return reduce(selected) if len(selected) > 0 else None
+        return apply
+
 
 class Rules(Extractor):
     """An extractor for getting data items out of an XML element."""
@@ -513,11 +732,49 @@ class Rules(Extractor):
             _logger.debug('Moving root to %s element', subroot.tag)
 
         data = {}
-        for rule in self.rules:
-            extracted = rule.extract(subroot)
-            data.update(extracted)
+        timer = _rule_timer
+        if timer is None:
+            for rule in self.rules:
+                extracted = rule.extract(subroot)
+                data.update(extracted)
+        else:
+            extracts = [lambda e, shared, extract=rule.extract: extract(e) for rule in self.rules]
+            _apply_timed(timer, self.rules, extracts, subroot, data, {})
         return data if len(data) > 0 else _EMPTY
 
+    def compile_apply(self):
+        """Build a function equivalent to the apply method of this extractor.
+
+        :sig: () -> Callable[[Element], Mapping[str, Any]]
+        :return: Function for getting the mapping out of an element.
+        """
+        selects = _share_labelled_paths(self.rules) if _USE_LXML else {}
+        rules = tuple(rule.compile(selects.get(index)) for index, rule in enumerate(self.rules))
+        timed = (tuple(self.rules), tuple(partial(_collect, rule) for rule in rules))
+        section = self.section
+
+        def apply(element):
+            if section is None:
+                subroot = element
+            else:
+                subroots = section(element)
+                if len(subroots) == 0:
+                    _logger.debug('No section root found')
+                    return _EMPTY
+                if len(subroots) > 1:
+                    raise ValueError('Section path should select exactly one element')
+                subroot = subroots[0]
+            data = {}
+            shared = {}
+            timer = _rule_timer
+            if timer is None:
+                for rule in rules:
+                    rule(subroot, data, shared)
+            else:
+                _apply_timed(timer, timed[0], timed[1], subroot, data, shared)
+            return data if len(data) > 0 else _EMPTY
+        return apply
+
 
 class Rule:
     """A rule describing how to get a data item out of an XML element."""
@@ -590,6 +847,159 @@ class Rule:
                 # _logger.debug('extracted value for "%s": "%s"', key, data[key])
         return data
 
+    def compile(self, select=None):
+        """Get a function equivalent to the extract method of this rule.
+
+        The function stores the extracted items in the mapping passed
+        as its second argument; the third argument is a mapping for
+        the results shared by the rules of the same section, valid
+        for a single application.  Unless a select function is given,
+        the function is built only once and stored in the rule.
+
+        :sig:
+            (
+                Optional[Callable[[Element, MutableMapping], Sequence]]
+            ) -> Callable[[Element, MutableMapping[str, Any], MutableMapping], None]
+        :param select: Function replacing the first path of the extractor.
+        :return: Function for extracting the data out of an element.
+        """
+        compiled = self.__dict__.get('_compiled') if select is None else None
+        if compiled is not None:
+            return compiled
+        key, foreach = self.key, self.foreach
+        get_key = None if isinstance(key, str) else key.compile()
+        extractor = self.extractor
+        items, transform = extractor.foreach, extractor.transform
+        if items is not None:
+            # don't try to transform list items by default, it might waste a lot of time
+            apply = extractor.compile_apply()
+
+            def get_value(subroot, shared):
+                selected = items(subroot) if select is None else select(subroot, shared)
+                values = [v for v in map(apply, selected) if (v is not None) and (v is not _EMPTY)]
+                if len(values) == 0:
+                    return None
+                return values if transform is None else list(map(transform, values))
+        elif select is None:
+            extract = extractor.compile()
+
+            def get_value(subroot, shared):
+                return extract(subroot)
+        else:
+            reduce = extractor.reduce
+
+            def get_value(subroot, shared):
+                selected = select(subroot, shared)
+                if len(selected) == 0:
+                    return None
+                value = reduce(selected)
+                if (value is None) or (value is _EMPTY) or (transform is None):
+                    return value
+                return transform(value)
+
+        def compiled(element, data, shared):
+            for subroot in ((element,) if foreach is None else foreach(element)):
+                name = key if get_key is None else get_key(subroot)
+                if name is None:
+                    continue
+                value = get_value(subroot, shared)
+                if (value is None) or (value is _EMPTY):
+                    continue
+                data[name] = value
+        if select is None:
+            self._compiled = compiled
+        return compiled
+
+
+_LABELLED_PATH = re.compile(r'^//(\w+)\[starts-with\(text\(\), "([^"]+)"\)\]/\.\.(/.+)$')
+
+
+def _get_first_path(rule):
+    """Get the first path applied by a rule to its element, if it can be shared.
+
+    :sig: (Rule) -> Optional[str]
+    :param rule: Rule to get the path of.
+    :return: Path given to the XPath evaluator, or None.
+    """
+    if rule.foreach is not None:
+        return None
+    extractor = rule.extractor
+    if extractor.foreach is not None:
+        return extractor.foreach.path
+    if isinstance(extractor, Path):
+        return extractor.path.path
+    return None
+
+
+def _share_labelled_paths(rules):
+    """Find the rules selecting the elements near a label.
+
+    Paths like ``//td[starts-with(text(), "Genre")]/..//li/a`` scan the whole
+    tree for the labelling element; the labelling elements of the rules
+    with the same tag are found together, with a single scan of their
+    first text nodes that are then compared to all the labels.
+
+    :sig: (Sequence[Rule]) -> Mapping[int, Callable[[Element, MutableMapping], Sequence]]
+    :param rules: Rules of a section.
+    :return: Select functions for the rules that share a scan, by position.
+    """
+    groups = {}
+    for index, rule in enumerate(rules):
+        path = _get_first_path(rule)
+        match = _LABELLED_PATH.match(path) if path is not None else None
+        if match is not None:
+            tag, label, rest = match.groups()
+            groups.setdefault(tag, []).append((index, label, rest, path))
+    selects = {}
+    for tag, members in groups.items():
+        if len(members) < 2:
+            continue
+        labels = tuple(sorted(set(label for _, label, _, _ in members)))
+        scan = XPath('//%s/text()[1]' % tag)
+        for index, label, rest, path in members:
+            selects[index] = partial(_select_labelled, scan, labels, label, XPath('.' + rest), XPath(path))
+    return selects
+
+
+def _select_labelled(scan, labels, label, rest, path, element, shared):
+    """Select the nodes near a label, scanning the tree only once.
+
+    :sig: (XPath, Sequence[str], str, XPath, XPath, Element, MutableMapping) -> Sequence
+    :param scan: Path selecting the first text nodes of the labelling elements.
+    :param labels: Labels found by the scan.
+    :param label: Label of the elements to select the nodes near to.
+    :param rest: Path selecting the nodes, relative to the parent of the label.
+    :param path: Whole path of the nodes, for the labels in more than one place.
+    :param element: Element to apply the path to.
+    :param shared: Results of the scans for this application.
+    :return: Selected nodes.
+    """
+    parents = shared.get(scan)
+    if parents is None:
+        parents = shared[scan] = {}
+        for text in scan(element):
+            # the string value of text() is the one of the first text node
+            if not text.startswith(labels):
+                continue
+            labelled = text.getparent()
+            if text.is_tail:
+                labelled = labelled.getparent()
+            parent = labelled.getparent()
+            if parent is None:
+                continue
+            for name in labels:
+                if text.startswith(name):
+                    found = parents.setdefault(name, [])
+                    if not any(parent is p for p in found):
+                        found.append(parent)
+    found = parents.get(label)
+    if not found:
+        return []
+    if len(found) > 1:
+        # the nodes of many parents must be merged in document order
+        return path(element)
+    return rest(found[0])
+
 
 def remove_elements(root, path):
     """Remove selected elements from the tree.
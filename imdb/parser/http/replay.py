@@ -0,0 +1,254 @@
+# Copyright 2020 Davide Alberani <da@erlug.linux.it>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+
+"""
+This module provides a local web server replaying the pages recorded in a
+cache (see :mod:`imdb.parser.http.cache`), like the one filled by the test
+suite, so that the http access system can be used and load-tested without
+network access::
+
+    from imdb import IMDb
+    from imdb.parser.http.replay import ReplayServer
+
+    server = ReplayServer('tests/.cache', latency=0.1, errorRate=0.05).start()
+    ia = IMDb(imdbURL_base=server.url)
+    movie = ia.get_movie('0133093')
+    server.stop()
+
+The pages are looked up by their path, under the URL they were recorded
+from (https://www.imdb.com/, by default); the server can add latency,
+answer with errors and limit the rate of the requests.
+
+It can also be started from the command line::
+
+    python -m imdb.parser.http.replay tests/.cache --port 8080 --latency 0.1
+"""
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import logging
+import random
+import sys
+import threading
+import time
+from argparse import ArgumentParser
+
+from imdb import PY2
+
+from .cache import make_cache
+
+if PY2:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+else:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+
+
+_logger = logging.getLogger('imdbpy.parser.http.replay')
+
+# URL the pages were recorded from.
+DEFAULT_ORIGIN = 'https://www.imdb.com/'
+
+
+class _Quota(object):
+    """The requests that can be answered: *rate* per second, with bursts
+    of up to *burst* requests."""
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.burst = float(burst or max(1, rate))
+        self._tokens = self.burst
+        self._updated = time.time()
+        self._lock = threading.Lock()
+
+    def take(self):
+        """Take a token; return 0 if it was available, or else the seconds
+        to wait for the next one."""
+        with self._lock:
+            now = time.time()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+            return (1 - self._tokens) / self.rate
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    """Answer the requests with the recorded pages."""
+    server_version = 'IMDbPYReplay/1.0'
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        server.count('requests')
+        delay = server.get_latency()
+        if delay > 0:
+            time.sleep(delay)
+        if server.quota is not None:
+            wait = server.quota.take()
+            if wait > 0:
+                server.count('throttled')
+                self._send(429, b'', headers={'Retry-After': '%d' % max(1, round(wait))})
+                return
+        if server.errorRate and server.random() < server.errorRate:
+            server.count('errors')
+            self._send(server.errorStatus, b'')
+            return
+        response = server.get_response(self.path)
+        if response is None:
+            server.count('missing')
+            self._send(404, b'')
+            return
+        etag = response.etag
+        if etag and self.headers.get('If-None-Match') == etag:
+            server.count('not modified')
+            self._send(304, None, headers={'ETag': etag})
+            return
+        server.count('served')
+        headers = {'Content-Type': 'text/html; charset=%s' % (response.charset or 'utf-8')}
+        if etag:
+            headers['ETag'] = etag
+        if response.lastModified:
+            headers['Last-Modified'] = response.lastModified
+        self._send(200, response.content, headers=headers)
+
+    def _send(self, status, content, headers=None):
+        """Send a response with the given status, content and headers."""
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if content is not None:
+            self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        if content:
+            self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        _logger.debug('%s - %s', self.address_string(), format % args)
+
+
+class ReplayServer(ThreadingMixIn, HTTPServer):
+    """A web server replaying the pages stored in a cache.
+
+    *cache* -- the cache with the recorded pages: an instance of
+               imdb.parser.http.cache.ResponseCache or a string like
+               the ones accepted by imdb.parser.http.cache.make_cache
+               (e.g. the path of a directory, or "sqlite:/path/to/file.db").
+    *host*, *port* -- address of the server; by default, a free port
+                      on the local host.
+    *origin* -- URL the pages were recorded from.
+    *latency* -- seconds waited before answering to every request...
+    *jitter* -- ...plus a random number of seconds up to this one.
+    *errorRate* -- fraction of the requests answered with errorStatus
+                   (by default, "503 Service Unavailable").
+    *rateLimit* -- maximum number of requests per second; the other
+                   ones are answered with "429 Too Many Requests"...
+    *rateBurst* -- ...after a burst of this number of requests.
+    *seed* -- seed of the random numbers, to replay the same errors."""
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, cache, host='127.0.0.1', port=0, origin=DEFAULT_ORIGIN,
+                 latency=0, jitter=0, errorRate=0, errorStatus=503,
+                 rateLimit=None, rateBurst=None, seed=None):
+        self.cache = make_cache(cache, ttl=None)
+        self.origin = origin.rstrip('/')
+        self.latency = float(latency or 0)
+        self.jitter = float(jitter or 0)
+        self.errorRate = float(errorRate or 0)
+        self.errorStatus = int(errorStatus)
+        self.quota = _Quota(rateLimit, rateBurst) if rateLimit else None
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._thread = None
+        self.stats = {}
+        HTTPServer.__init__(self, (host, port), ReplayHandler)
+
+    @property
+    def url(self):
+        """The URL to give as imdbURL_base to the access system."""
+        host, port = self.server_address[:2]
+        return 'http://%s:%d/' % (host, port)
+
+    def count(self, event):
+        """Count an event in the stats."""
+        with self._lock:
+            self.stats[event] = self.stats.get(event, 0) + 1
+
+    def random(self):
+        """Return a random number between 0 and 1."""
+        with self._lock:
+            return self._random.random()
+
+    def get_latency(self):
+        """Return the seconds to wait before answering to a request."""
+        if not self.jitter:
+            return self.latency
+        return self.latency + self.random() * self.jitter
+
+    def get_response(self, path):
+        """Return the recorded response for the given path, or None."""
+        return self.cache.get(self.origin + path)
+
+    def start(self):
+        """Serve the requests in a background thread; return the server."""
+        self._thread = threading.Thread(target=self.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the server started by the start method."""
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+def main(argv=None):
+    parser = ArgumentParser(prog='python -m imdb.parser.http.replay',
+                            description='serve the pages recorded in a cache')
+    parser.add_argument('cache', help='directory of the cache, or "sqlite:PATH"')
+    parser.add_argument('--host', default='127.0.0.1', help='address of the server (default: 127.0.0.1)')
+    parser.add_argument('-p', '--port', type=int, default=8080, help='port of the server (default: 8080)')
+    parser.add_argument('--origin', default=DEFAULT_ORIGIN,
+                        help='URL the pages were recorded from (default: %s)' % DEFAULT_ORIGIN)
+    parser.add_argument('--latency', type=float, default=0, help='seconds waited for every request')
+    parser.add_argument('--jitter', type=float, default=0, help='maximum random seconds added to the latency')
+    parser.add_argument('--error-rate', type=float, default=0, help='fraction of requests answered with errors')
+    parser.add_argument('--error-status', type=int, default=503, help='status of the errors (default: 503)')
+    parser.add_argument('--rate-limit', type=float, help='maximum number of requests per second')
+    parser.add_argument('--rate-burst', type=int, help='size of the bursts of requests')
+    parser.add_argument('--seed', type=int, help='seed of the random numbers')
+    args = parser.parse_args(argv)
+    server = ReplayServer(args.cache, host=args.host, port=args.port, origin=args.origin,
+                          latency=args.latency, jitter=args.jitter, errorRate=args.error_rate,
+                          errorStatus=args.error_status, rateLimit=args.rate_limit,
+                          rateBurst=args.rate_burst, seed=args.seed)
+    print('serving %s on %s (use it as imdbURL_base)' % (args.cache, server.url))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(', '.join('%s: %d' % item for item in sorted(server.stats.items())))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -64,6 +64,8 @@ def custom_analyze_title4kwd(title, yearNote, outline):
 
 class DOMHTMLSearchMovieKeywordParser(DOMHTMLSearchMovieParser):
     """A parser for the movie search by keyword page."""
+    # The page is modified by preprocess_string.
+    _streamItems = None
 
     rules = [
         Rule(
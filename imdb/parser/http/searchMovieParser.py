@@ -35,6 +35,8 @@ from .utils import DOMParserBase, analyze_imdbid
 
 class DOMHTMLSearchMovieParser(DOMParserBase):
     """A parser for the title search page."""
+    # The results can be parsed while the page is downloaded.
+    _streamItems = ('td', 'result_text')
 
     rules = [
         Rule(
@@ -0,0 +1,233 @@
+# Copyright 2020 Davide Alberani <da@erlug.linux.it>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+
+"""
+This module provides the tools used by :class:`imdb.parser.http.IMDbURLopener`
+to be a good citizen of the web: a rate limiter for every host, a policy
+to retry failed requests, and a circuit breaker that stops sending requests
+to a host that keeps failing.
+
+Rate limiters are shared by every thread (and every instance of the access
+system) contacting the same host; circuit breakers belong to a single
+instance of IMDbURLopener.
+"""
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import logging
+import random
+import threading
+import time
+from email.utils import mktime_tz, parsedate_tz
+
+from imdb._exceptions import IMDbDataAccessError
+
+
+_logger = logging.getLogger('imdbpy.parser.http.throttling')
+
+# HTTP status codes of the errors worth a retry.
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class TokenBucket(object):
+    """A rate limiter that allows *rate* requests per second, with
+    bursts of up to *burst* requests.
+
+    The rate is adaptive: it's halved every time the server answers with
+    a "429 Too Many Requests" and slowly restored after every successful
+    request."""
+    def __init__(self, rate, burst=None):
+        self.maxRate = float(rate)
+        self.rate = self.maxRate
+        self.burst = float(burst or max(1, rate))
+        self._tokens = self.burst
+        self._updated = time.time()
+        self._blockedUntil = 0
+        self._lock = threading.Lock()
+
+    def configure(self, rate, burst=None):
+        """Change the maximum rate and the size of the bursts."""
+        with self._lock:
+            self.maxRate = float(rate)
+            self.rate = min(self.rate, self.maxRate)
+            self.burst = float(burst or max(1, rate))
+
+    def _reserve(self):
+        """Take a token; return the seconds to wait before using it."""
+        with self._lock:
+            now = time.time()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = 0
+            if self._tokens < 0:
+                wait = -self._tokens / self.rate
+            return max(wait, self._blockedUntil - now)
+
+    def acquire(self):
+        """Block until a request can be sent."""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    def throttle(self, retryAfter=None):
+        """Called when the server complains about too many requests:
+        slow down and, if asked, stop for a while."""
+        with self._lock:
+            self.rate = max(self.maxRate / 64, self.rate / 2)
+            if retryAfter:
+                self._blockedUntil = max(self._blockedUntil, time.time() + retryAfter)
+        _logger.info('slowing down to %.2f requests per second', self.rate)
+
+    def success(self):
+        """Called after a successful request: restore the rate."""
+        if self.rate < self.maxRate:
+            with self._lock:
+                self.rate = min(self.maxRate, self.rate + self.maxRate / 20)
+
+
+class CircuitBreaker(object):
+    """Stop sending requests to a host after *threshold* consecutive
+    failed requests; after *recoveryTimeout* seconds, a single trial
+    request is let through: if it succeeds, requests are allowed again,
+    otherwise they're suspended for another recoveryTimeout seconds."""
+    def __init__(self, threshold=5, recoveryTimeout=30):
+        self.threshold = threshold
+        self.recoveryTimeout = recoveryTimeout
+        self.failures = 0
+        self.openedAt = None
+        # When the trial request was let through, if it's in progress.
+        self.trialAt = None
+        self._lock = threading.Lock()
+
+    def check(self, url):
+        """Raise an IMDbDataAccessError if requests are not allowed."""
+        if self.openedAt is None:
+            return
+        with self._lock:
+            if self.openedAt is None:
+                return
+            now = time.time()
+            remaining = self.openedAt + self.recoveryTimeout - now
+            if remaining <= 0:
+                # A trial request that never ended doesn't block the others forever.
+                if self.trialAt is None or self.trialAt + self.recoveryTimeout <= now:
+                    self.trialAt = now
+                    return
+                errmsg = 'too many consecutive failures; waiting for the result of a trial request'
+            else:
+                errmsg = ('too many consecutive failures; requests suspended'
+                          ' for %d more seconds' % remaining)
+        raise IMDbDataAccessError(
+            {'url': url,
+             'errmsg': errmsg,
+             'error type': 'circuit breaker open'}
+        )
+
+    def success(self):
+        if self.failures or self.openedAt is not None:
+            with self._lock:
+                self.failures = 0
+                self.openedAt = None
+                self.trialAt = None
+
+    def failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.trialAt is not None or self.failures >= self.threshold:
+                if self.openedAt is None:
+                    _logger.warning('%d consecutive failures: suspending the requests'
+                                    ' for %d seconds', self.failures, self.recoveryTimeout)
+                self.openedAt = time.time()
+                self.trialAt = None
+
+
+class RetryPolicy(object):
+    """Retry a failed request up to *maxRetries* times, waiting a random
+    time between 0 and backoff * 2 ** attempt (at most *maxBackoff*) seconds,
+    or the time requested by the server with the Retry-After header."""
+    def __init__(self, maxRetries=3, backoff=0.5, maxBackoff=60, statuses=RETRY_STATUSES):
+        self.maxRetries = maxRetries
+        self.backoff = backoff
+        self.maxBackoff = maxBackoff
+        self.statuses = statuses
+
+    def is_transient(self, status):
+        """Return true if the error is worth a retry; a None status means
+        a network error (e.g. a timeout)."""
+        return status is None or status in self.statuses
+
+    def get_delay(self, attempt, retryAfter=None):
+        """Return the seconds to wait before the given retry (starting from 0),
+        or None if the request must not be retried."""
+        if attempt >= self.maxRetries:
+            return None
+        if retryAfter is not None:
+            if retryAfter > self.maxBackoff:
+                return None
+            return retryAfter
+        return random.uniform(0, min(self.maxBackoff, self.backoff * 2 ** attempt))
+
+
+def parse_retry_after(value):
+    """Return the seconds to wait, from the value of a Retry-After header
+    (a number of seconds or a date), or None."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return int(value)
+    date = parsedate_tz(value)
+    if date is None:
+        return None
+    return max(0, mktime_tz(date) - time.time())
+
+
+def get_error_info(exc):
+    """Return a tuple with the HTTP status code (None for network errors)
+    and the seconds the server asked to wait, for the given
+    IMDbDataAccessError."""
+    info = exc.args[0] if exc.args and isinstance(exc.args[0], dict) else {}
+    # HTTPError exceptions raised by urllib have a code attribute;
+    # otherwise errcode is the HTTP status only for HTTP errors.
+    status = getattr(info.get('original exception'), 'code', None)
+    if status is None and info.get('error type') == 'http_error_default':
+        status = info.get('errcode')
+    if not isinstance(status, int):
+        status = None
+    headers = info.get('headers') or {}
+    return status, parse_retry_after(headers.get('Retry-After'))
+
+
+_registryLock = threading.Lock()
+_rateLimiters = {}
+
+
+def get_rate_limiter(host, rate, burst=None):
+    """Return the rate limiter shared by every request to the given host."""
+    with _registryLock:
+        limiter = _rateLimiters.get(host)
+        if limiter is None:
+            limiter = _rateLimiters[host] = TokenBucket(rate, burst)
+        elif limiter.maxRate != rate:
+            limiter.configure(rate, burst)
+        return limiter
+
+
+def reset():
+    """Forget the rate limiters shared by the requests to every host."""
+    with _registryLock:
+        _rateLimiters.clear()
@@ -0,0 +1,175 @@
+# Copyright 2020 Davide Alberani <da@erlug.linux.it>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+
+"""
+This module provides the instrumentation used to find where the time
+is spent retrieving and parsing the pages: once a :class:`TimingStats`
+instance is set with :func:`set_stats` (or with the set_timings method of
+:class:`imdb.parser.http.IMDbHTTPAccessSystem`), the wall and CPU time of
+every stage is recorded, by kind of page, by parser and by rule.
+
+The stages are:
+
+- ``retrieve``: download of a page (or read from the cache);
+- ``decode``: conversion of a page to a unicode string;
+- ``preprocess``: preprocessors of a parser;
+- ``dom``: building of the DOM;
+- ``preprocess_dom``, ``gather_refs``, ``rules``, ``postprocess``
+  and ``add_refs``: the other steps of DOMParserBase.parse;
+- ``rule``: a single rule of a parser (included in the ``rules`` stage).
+
+The instrumentation is off by default, and costs a check of a global
+variable for every step.
+"""
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import re
+import threading
+import time
+
+try:
+    from urllib.parse import urlparse
+except ImportError:
+    from urlparse import urlparse
+
+
+# Wall clock, and CPU time of the current thread.
+_wall_time = getattr(time, 'perf_counter', time.time)
+_cpu_time = getattr(time, 'thread_time', None) or getattr(time, 'process_time', None) or time.clock
+
+# Statistics in use, or None if the instrumentation is off.
+_stats = None
+
+# Name of the parser applying the rules, per-thread.
+_local = threading.local()
+
+_re_ids = re.compile(r'\d+')
+
+
+class TimingStats(object):
+    """The times recorded for the stages of the retrieval and of the parsing
+    of the pages; the records are summed by stage and name (the kind of page,
+    the parser, or the parser and the key of a rule).
+
+    If callback is set, it's called with every record: stage, name, wall
+    and CPU time (in seconds), bytes in input and number of extracted items."""
+    def __init__(self, callback=None):
+        self.callback = callback
+        self._lock = threading.Lock()
+        self._totals = {}
+
+    def add(self, stage, name, wall, cpu, size=0, items=0):
+        """Record the time spent by a stage."""
+        with self._lock:
+            entry = self._totals.get((stage, name))
+            if entry is None:
+                entry = self._totals[(stage, name)] = [0, 0.0, 0.0, 0, 0]
+            entry[0] += 1
+            entry[1] += wall
+            entry[2] += cpu
+            entry[3] += size
+            entry[4] += items
+        if self.callback is not None:
+            self.callback(stage, name, wall, cpu, size, items)
+
+    def clear(self):
+        """Forget the recorded times."""
+        with self._lock:
+            self._totals = {}
+
+    def get_stats(self, stage=None):
+        """Return a dictionary with the totals by (stage, name), or by name
+        for the given stage; every total is a dictionary with the number
+        of calls, the wall and CPU time, the bytes and the items."""
+        with self._lock:
+            totals = list(self._totals.items())
+        stats = {}
+        for (entryStage, name), (calls, wall, cpu, size, items) in totals:
+            if stage is not None and entryStage != stage:
+                continue
+            stats[name if stage is not None else (entryStage, name)] = {
+                'calls': calls, 'wall': wall, 'cpu': cpu, 'bytes': size, 'items': items
+            }
+        return stats
+
+    def report(self, limit=20):
+        """Return a table with the records that took the longest wall time."""
+        stats = self.get_stats()
+        lines = ['%-14s %-50s %7s %10s %10s %10s %8s' %
+                 ('stage', 'name', 'calls', 'wall ms', 'cpu ms', 'KB', 'items')]
+        for key in sorted(stats, key=lambda k: stats[k]['wall'], reverse=True)[:limit]:
+            entry = stats[key]
+            lines.append('%-14s %-50s %7d %10.2f %10.2f %10.1f %8d' %
+                         (key[0], key[1][:50], entry['calls'], entry['wall'] * 1000,
+                          entry['cpu'] * 1000, entry['bytes'] / 1024, entry['items']))
+        return '\n'.join(lines)
+
+
+class Clock(object):
+    """Measure the stages of a single task, one after the other."""
+    __slots__ = ('stats', 'name', '_wall', '_cpu')
+
+    def __init__(self, stats, name):
+        self.stats = stats
+        self.name = name
+        self._wall = _wall_time()
+        self._cpu = _cpu_time()
+
+    def lap(self, stage, size=0, items=0):
+        """Record the time spent since the start or the previous lap."""
+        wall = _wall_time()
+        cpu = _cpu_time()
+        self.stats.add(stage, self.name, wall - self._wall, cpu - self._cpu, size, items)
+        self._wall = wall
+        self._cpu = cpu
+
+
+def get_stats():
+    """Return the TimingStats in use, or None."""
+    return _stats
+
+
+def set_stats(stats):
+    """Record the times in the given TimingStats, for every access
+    system of this process; None disables the instrumentation."""
+    global _stats
+    _stats = stats
+    from . import piculet
+    piculet.set_rule_timer(_time_rule if stats is not None else None)
+
+
+def start(name):
+    """Return a Clock for a task with the given name, or None if the
+    instrumentation is off; the rules applied by this thread are
+    recorded under this name, until another task is started."""
+    stats = _stats
+    if stats is None:
+        return None
+    _local.name = name
+    return Clock(stats, name)
+
+
+def page_name(url):
+    """Name of the kind of page of the given URL: its path, without IDs."""
+    return _re_ids.sub('#', urlparse(url).path or '/')
+
+
+def _time_rule(key, wall, cpu, items):
+    """Record the time spent by a rule of a parser."""
+    stats = _stats
+    if stats is not None:
+        stats.add('rule', '%s:%s' % (getattr(_local, 'name', None), key), wall, cpu, 0, items)
@@ -24,6 +24,8 @@ from __future__ import absolute_import, division, print_function, unicode_litera
 
 import logging
 import re
+import threading
+from functools import partial
 
 from imdb import PY2
 from imdb.Character import Character
@@ -31,7 +33,8 @@ from imdb.Movie import Movie
 from imdb.Person import Person
 from imdb.utils import _Container, flatten
 
-from .piculet import _USE_LXML, ElementTree, Rules, build_tree, html_to_xhtml
+from . import timing
+from .piculet import _USE_LXML, ElementTree, Rules, build_tree, html_to_tree
 from .piculet import xpath as piculet_xpath
 from .piculet import Rule, Path
 
@@ -50,6 +53,15 @@ re_yearKind_index = re.compile(
 # Match imdb ids in href tags
 re_imdbid = re.compile(r'(title/tt|name/nm|company/co|user/ur)([0-9]+)')
 
+# Encodings of the pages that can be preprocessed and parsed as bytes.
+_BYTES_ENCODINGS = ('utf-8', 'utf8', 'ascii', 'us-ascii')
+
+# What \s and [^\s] match in a unicode pattern, as bytes patterns
+# for a utf8 content.
+_BYTES_SPACE = (r'(?:[\t-\r\x1c-\x1f ]|\xc2[\x85\xa0]|\xe1\x9a\x80|'
+                r'\xe2\x80[\x80-\x8a\xa8\xa9\xaf]|\xe2\x81\x9f|\xe3\x80\x80)')
+_BYTES_NOT_SPACE = r'(?:(?!%s)(?:[\x00-\x7f]|[\xc0-\xff][\x80-\xbf]*))' % _BYTES_SPACE
+
 
 def analyze_imdbid(href):
     """Return an imdbID from an URL."""
@@ -64,30 +76,140 @@ def analyze_imdbid(href):
 _modify_keys = list(Movie.keys_tomodify_list) + list(Person.keys_tomodify_list)
 
 
-def _putRefs(d, re_titles, re_names, lastKey=None):
+class RefsMatcher(object):
+    """Find the occurrences of many strings (e.g. the titles and the names
+    referenced in a page) in a text, with a single scan of the text,
+    using an Aho-Corasick automaton.
+
+    The result is the same of a regular expression made by the alternation
+    of the escaped strings: at the leftmost position where a match starts,
+    the first string (in the given order) that matches is used."""
+    def __init__(self, strings):
+        # Every state of the automaton is represented by its index in
+        # these lists: the transitions, the failure link and the strings
+        # (their indexes) that end in this state.
+        goto = [{}]
+        fail = [0]
+        output = [()]
+        lengths = []
+        for idx, string in enumerate(strings):
+            lengths.append(len(string))
+            if not string:
+                continue
+            state = 0
+            for char in string:
+                nextState = goto[state].get(char)
+                if nextState is None:
+                    nextState = len(goto)
+                    goto[state][char] = nextState
+                    goto.append({})
+                    fail.append(0)
+                    output.append(())
+                state = nextState
+            output[state] += (idx,)
+        queue = list(goto[0].values())
+        for state in queue:
+            for char, nextState in goto[state].items():
+                queue.append(nextState)
+                f = fail[state]
+                while f and char not in goto[f]:
+                    f = fail[f]
+                f = goto[f].get(char, 0)
+                fail[nextState] = f
+                output[nextState] += output[f]
+        self.strings = list(strings)
+        # The strings found by the sub method.
+        self.matched = set()
+        # Used to skip the text that can't start a match.
+        self._reFirst = None
+        if goto[0]:
+            self._reFirst = re.compile('[%s]' % ''.join(re.escape(c) for c in goto[0]), re.U)
+        self._goto = goto
+        self._fail = fail
+        self._output = output
+        self._lengths = lengths
+
+    def __bool__(self):
+        return len(self._goto) > 1
+
+    __nonzero__ = __bool__
+
+    def finditer(self, text):
+        """Yield the (start, end) positions of the non-overlapping matches."""
+        if not self:
+            return
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        lengths = self._lengths
+        searchFirst = self._reFirst.search
+        # The best (first in order) string matching at every start position.
+        best = {}
+        state = 0
+        pos = 0
+        textLen = len(text)
+        while pos < textLen:
+            if not state:
+                match = searchFirst(text, pos)
+                if match is None:
+                    break
+                pos = match.start()
+            char = text[pos]
+            pos += 1
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for idx in output[state]:
+                start = pos - lengths[idx]
+                if best.get(start, idx) >= idx:
+                    best[start] = idx
+        last = 0
+        for start in sorted(best):
+            if start < last:
+                continue
+            last = start + lengths[best[start]]
+            yield start, last
+
+    def sub(self, fmt, text):
+        """Return the text with every match replaced by fmt % match."""
+        chunks = []
+        last = 0
+        for start, end in self.finditer(text):
+            chunks.append(text[last:start])
+            string = text[start:end]
+            self.matched.add(string)
+            chunks.append(fmt % string)
+            last = end
+        if not chunks:
+            return text
+        chunks.append(text[last:])
+        return ''.join(chunks)
+
+
+def _putRefs(d, titlesMatcher, namesMatcher, lastKey=None):
     """Iterate over the strings inside list items or dictionary values,
     substitutes movie titles and person names with the (qv) references."""
     if isinstance(d, list):
         for i in range(len(d)):
             if isinstance(d[i], str):
                 if lastKey in _modify_keys:
-                    if re_names:
-                        d[i] = re_names.sub(r"'\1' (qv)", d[i])
-                    if re_titles:
-                        d[i] = re_titles.sub(r'_\1_ (qv)', d[i])
+                    if namesMatcher:
+                        d[i] = namesMatcher.sub("'%s' (qv)", d[i])
+                    if titlesMatcher:
+                        d[i] = titlesMatcher.sub('_%s_ (qv)', d[i])
             elif isinstance(d[i], (list, dict)):
-                _putRefs(d[i], re_titles, re_names, lastKey=lastKey)
+                _putRefs(d[i], titlesMatcher, namesMatcher, lastKey=lastKey)
     elif isinstance(d, dict):
         for k, v in list(d.items()):
             lastKey = k
             if isinstance(v, str):
                 if lastKey in _modify_keys:
-                    if re_names:
-                        d[k] = re_names.sub(r"'\1' (qv)", v)
-                    if re_titles:
-                        d[k] = re_titles.sub(r'_\1_ (qv)', v)
+                    if namesMatcher:
+                        d[k] = namesMatcher.sub("'%s' (qv)", v)
+                    if titlesMatcher:
+                        d[k] = titlesMatcher.sub('_%s_ (qv)', v)
             elif isinstance(v, (list, dict)):
-                _putRefs(d[k], re_titles, re_names, lastKey=lastKey)
+                _putRefs(d[k], titlesMatcher, namesMatcher, lastKey=lastKey)
 
 
 _b_p_logger = logging.getLogger('imdbpy.parser.http.build_person')
@@ -371,29 +493,307 @@ def build_movie(txt, movieID=None, roleID=None, status=None,
     return m
 
 
+class _TextMatch(object):
+    """A match of a bytes pattern, with the groups decoded as strings;
+    it's passed to the replacement functions of the preprocessors."""
+    def __init__(self, match):
+        self._match = match
+
+    def group(self, *args):
+        ret = self._match.group(*args)
+        if isinstance(ret, tuple):
+            return tuple(_decode_group(g) for g in ret)
+        return _decode_group(ret)
+
+    def groups(self, default=None):
+        return tuple(_decode_group(g) if g is not None else default
+                     for g in self._match.groups())
+
+
+def _decode_group(group):
+    # Undecodable bytes are kept as they are, when the result is encoded.
+    return group.decode('utf-8', 'surrogateescape') if group is not None else None
+
+
+def _bytes_sub(funct):
+    """Wrap a replacement function of a preprocessor, to be used with
+    a bytes pattern."""
+    def sub(match):
+        return funct(_TextMatch(match)).encode('utf-8', 'surrogateescape')
+    return sub
+
+
+def _to_bytes_pattern(pattern):
+    """Return the given (ascii) regular expression, converted to match
+    the same text in utf8 bytes, or None if this is not possible."""
+    result = []
+    idx = 0
+    inClass = negated = False
+    while idx < len(pattern):
+        char = pattern[idx]
+        if char == '\\':
+            escape = pattern[idx:idx + 2]
+            if escape == r'\s' and not inClass:
+                result.append(_BYTES_SPACE)
+            elif escape[1:] in 'sSwWdDbB':
+                return None
+            else:
+                result.append(escape)
+            idx += 2
+            continue
+        if not inClass and pattern.startswith(r'[^\s]', idx):
+            result.append(_BYTES_NOT_SPACE)
+            idx += 5
+            continue
+        result.append(char)
+        idx += 1
+        if inClass:
+            if char == ']':
+                inClass = False
+                # A negated class matches a single byte of a character.
+                if negated and pattern[idx:idx + 1] not in ('*', '+'):
+                    return None
+        elif char == '[':
+            inClass = True
+            negated = pattern[idx:idx + 1] == '^'
+        elif char == '.' and pattern[idx:idx + 1] not in ('*', '+'):
+            return None
+    return ''.join(result)
+
+
+def _to_bytes_preprocessor(src, sub):
+    """Return the given preprocessor, converted to work on utf8 bytes,
+    or None if the conversion is not possible."""
+    if isinstance(getattr(src, 'sub', None), Callable):
+        pattern = src.pattern
+        if not isinstance(pattern, str):
+            return None
+        try:
+            pattern.encode('ascii')
+            if isinstance(sub, str):
+                sub = sub.encode('ascii')
+        except UnicodeError:
+            return None
+        pattern = _to_bytes_pattern(pattern)
+        if pattern is None:
+            return None
+        if isinstance(sub, Callable):
+            sub = _bytes_sub(sub)
+        return re.compile(pattern.encode('ascii'), src.flags & ~re.UNICODE), sub
+    if isinstance(src, str) and isinstance(sub, str):
+        try:
+            return src.encode('ascii'), sub.encode('ascii')
+        except UnicodeError:
+            return None
+    return None
+
+
+def _required_literal(pattern, flags):
+    """Return a string found in every match of the given regular expression
+    (its literal prefix), or None if it's not known or it can't be looked
+    for with the in operator (for a case-insensitive pattern)."""
+    if isinstance(pattern, bytes):
+        literal = _required_literal(pattern.decode('latin-1'), flags)
+        return literal.encode('latin-1') if literal is not None else None
+    start = 0
+    while pattern[start:start + 1] == '(' and pattern[start + 1:start + 2] != '?':
+        start += 1
+    # The prefix is inside the first groups: an alternative of these groups
+    # (or of the whole pattern) may not contain it, and they can't be optional.
+    idx = depth = 0
+    prefixDepth = start
+    inClass = False
+    while idx < len(pattern):
+        char = pattern[idx]
+        if char == '\\':
+            idx += 1
+        elif inClass:
+            inClass = char != ']'
+        elif char == '[':
+            inClass = True
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+            if depth < prefixDepth and pattern[idx + 1:idx + 2] in ('?', '*', '{'):
+                return None
+            prefixDepth = min(prefixDepth, depth)
+        elif char == '|' and depth <= prefixDepth:
+            return None
+        idx += 1
+    idx = start
+    literal = []
+    while idx < len(pattern):
+        char = pattern[idx]
+        step = 1
+        if char == '\\':
+            char = pattern[idx + 1:idx + 2]
+            if not char or char.isalnum():
+                break
+            step = 2
+        elif char in '.^$*+?{}[]()':
+            break
+        quantifier = pattern[idx + step:idx + step + 1]
+        if quantifier in ('?', '*', '{'):
+            break
+        literal.append(char)
+        if quantifier == '+':
+            break
+        idx += step
+    literal = ''.join(literal)
+    if not literal or (flags & re.I and literal.lower() != literal.upper()):
+        return None
+    return literal
+
+
+def _compile_preprocessors(preprocessors):
+    """Compile a list of preprocessors (see DOMParserBase.preprocessors) into
+    a list of (function, required text, is a custom function) tuples; the
+    function is not called if the required text is not in the page."""
+    plan = []
+    for src, sub in preprocessors:
+        if isinstance(getattr(src, 'sub', None), Callable):
+            plan.append((partial(src.sub, sub), _required_literal(src.pattern, src.flags), False))
+        elif isinstance(src, (str, bytes)) or (PY2 and isinstance(src, unicode)):
+            plan.append((partial(_replace, src, sub), None, False))
+        elif isinstance(src, Callable):
+            plan.append((src, None, True))
+    return plan
+
+
+def _replace(src, sub, text):
+    return text.replace(src, sub)
+
+
+class DOMStream(object):
+    """Build the DOM of a page incrementally, while its content is read
+    from the network; the completed elements with the given tag and class
+    are counted, and feed returns True once the wanted number of them
+    was found, so that the rest of the page can be skipped.
+
+    It requires lxml."""
+    def __init__(self, tag, cls, wanted=None):
+        self.tag = tag
+        self.cls = cls
+        self.wanted = wanted
+        self.reset()
+
+    def reset(self, charset=None):
+        """Prepare to read a new page, encoded with the given charset."""
+        import lxml.html
+        self._parser = lxml.etree.HTMLPullParser(events=('end',), tag=self.tag,
+                                                 encoding=charset or 'utf-8')
+        self._parser.set_element_class_lookup(lxml.html.HtmlElementClassLookup())
+        self._pending = b''
+        self.count = 0
+        self.fed = False
+        self.stopped = False
+
+    def feed(self, chunk):
+        """Feed a chunk of the page (as bytes); return True if the
+        wanted elements were all found."""
+        if self.stopped:
+            return True
+        if not chunk:
+            return False
+        self.fed = True
+        # Same as the replacement done by DOMParserBase.parse, taking care
+        # of the entities split between two chunks.
+        chunk = self._pending + chunk
+        cut = chunk.rfind(b'&', max(0, len(chunk) - 5))
+        if cut != -1:
+            self._pending = chunk[cut:]
+            chunk = chunk[:cut]
+        else:
+            self._pending = b''
+        self._parser.feed(chunk.replace(b'&nbsp;', b' '))
+        for event, element in self._parser.read_events():
+            if element.get('class') == self.cls:
+                self.count += 1
+        if self.wanted is not None and self.count >= self.wanted:
+            self.stopped = True
+        return self.stopped
+
+    def get_dom(self):
+        """Return the dom built so far, or None if nothing was read."""
+        if not self.fed:
+            return None
+        if self._pending:
+            self._parser.feed(self._pending.replace(b'&nbsp;', b' '))
+            self._pending = b''
+        try:
+            return self._parser.close()
+        except Exception:
+            return None
+
+
+class _ParseContext(object):
+    """The state of a single parsing of a page: every call of the parse
+    method gets its own, so that a parser can be used by many threads."""
+    __slots__ = ('getRefs', 'keys', 'namesRefs', 'titlesRefs')
+
+    def __init__(self, getRefs=False, keys=None):
+        self.getRefs = getRefs
+        self.keys = set(keys) if keys else None
+        # Names and titles references.
+        self.namesRefs = {}
+        self.titlesRefs = {}
+
+
+def _context_property(name, doc):
+    """Return a property to access an attribute of the current context
+    of a parser."""
+    return property(lambda self: getattr(self._get_context(), name),
+                    lambda self, value: setattr(self._get_context(), name, value),
+                    doc=doc)
+
+
 class DOMParserBase(object):
     """Base parser to handle HTML data from the IMDb's web server."""
     _defGetRefs = False
     _containsObjects = False
+    # Added to the hash of the source code of the parser, to invalidate
+    # the results stored by imdb.parser.http.cache.ParseCache.
+    _version = 2
 
     preprocessors = []
     rules = []
+    # The keys of the rules needed to compute the keys of the result that
+    # are not named after a rule (see the keys argument of the parse method).
+    _keysRules = {}
+    # Tag and class of the elements extracted by the foreach of the rules,
+    # for the parsers that can read a page while it's downloaded and stop
+    # early (see the get_stream method).
+    _streamItems = None
 
     _logger = logging.getLogger('imdbpy.parser.http.domparser')
 
+    # The state of the page being parsed, kept in the context of the
+    # current call of the parse method (see _start).
+    getRefs = _context_property('getRefs', 'Gather the references to movies and persons.')
+    _keys = _context_property('keys', 'Keys to be returned, or None for all of them.')
+    _namesRefs = _context_property('namesRefs', 'References to persons.')
+    _titlesRefs = _context_property('titlesRefs', 'References to movies.')
+
     def __init__(self):
         """Initialize the parser."""
         self._modFunct = None
         self._as = 'http'
         self._cname = self.__class__.__name__
+        self._local = threading.local()
         self._init()
         self.reset()
 
+    def _get_context(self):
+        """Return the context of the page being parsed by this thread."""
+        context = getattr(self._local, 'context', None)
+        if context is None:
+            context = self._local.context = _ParseContext(self._defGetRefs)
+        return context
+
     def reset(self):
         """Reset the parser."""
-        # Names and titles references.
-        self._namesRefs = {}
-        self._titlesRefs = {}
+        self._local.context = _ParseContext(self._defGetRefs)
         self._reset()
 
     def _init(self):
@@ -404,34 +804,107 @@ class DOMParserBase(object):
         """Subclasses can override this method, if needed."""
         pass
 
-    def parse(self, html_string, getRefs=None, **kwds):
+    def parse(self, html_string, getRefs=None, keys=None, encoding=None, **kwds):
         """Return the dictionary generated from the given html string;
         getRefs can be used to force the gathering of movies/persons
-        references."""
-        self.reset()
-        if getRefs is not None:
-            self.getRefs = getRefs
-        else:
-            self.getRefs = self._defGetRefs
-        if PY2 and isinstance(html_string, str):
-            html_string = html_string.decode('utf-8')
-        # Temporary fix: self.parse_dom must work even for empty strings.
-        html_string = self.preprocess_string(html_string)
-        if html_string:
-            html_string = html_string.replace('&nbsp;', ' ')
-            dom = self.get_dom(html_string)
+        references.
+
+        The page can also be given as bytes, in the given encoding
+        (utf8 by default): in this case, if possible, it's not decoded
+        before building the dom (see preprocess_bytes).
+
+        If keys is set, only the rules needed to get the given keys are
+        applied, and the other keys are removed from the result.
+
+        The state of the parsing is kept in a context of this call,
+        so the same parser can be used at the same time by many threads."""
+        caller = self._start(getRefs, keys)
+        clock = timing.start(self._cname)
+        try:
+            if PY2 and isinstance(html_string, str):
+                html_string = html_string.decode('utf-8')
+            size = len(html_string or '')
+            if isinstance(html_string, bytes):
+                html_string = self.preprocess_bytes(html_string, encoding)
+            else:
+                # Temporary fix: self.parse_dom must work even for empty strings.
+                html_string = self.preprocess_string(html_string)
+            if clock is not None:
+                clock.lap('preprocess', size)
+            dom = None
+            if html_string:
+                if isinstance(html_string, bytes):
+                    if b'&nbsp;' in html_string:
+                        html_string = html_string.replace(b'&nbsp;', b' ')
+                elif '&nbsp;' in html_string:
+                    html_string = html_string.replace('&nbsp;', ' ')
+                dom = self.get_dom(html_string)
+                if clock is not None:
+                    clock.lap('dom', len(html_string))
+            return self._parse_tree(dom, clock)
+        finally:
+            self._end(caller)
+
+    def get_stream(self, results=None):
+        """Return a DOMStream used to read a page while it's downloaded,
+        stopping after the given number of results, or None if this parser
+        doesn't support it; the dom is then parsed by parse_stream."""
+        if self._streamItems is None or not _USE_LXML:
+            return None
+        tag, cls = self._streamItems
+        return DOMStream(tag, cls, results)
+
+    def parse_stream(self, stream, getRefs=None, keys=None, **kwds):
+        """Like the parse method, for the dom read by the given DOMStream."""
+        caller = self._start(getRefs, keys)
+        clock = timing.start(self._cname)
+        try:
+            return self._parse_tree(stream.get_dom(), clock)
+        finally:
+            self._end(caller)
+
+    def _start(self, getRefs, keys):
+        """Prepare to parse a new page, in a new context; the context
+        of the caller is returned, and must be given to _end."""
+        local = self._local
+        caller = getattr(local, 'context', None)
+        local.context = _ParseContext(self._defGetRefs if getRefs is None else getRefs, keys)
+        local.depth = getattr(local, 'depth', 0) + 1
+        self._reset()
+        return caller
+
+    def _end(self, caller):
+        """At the end of a parsing, restore the context of the caller if
+        it's parsing a page too; otherwise, the context is kept until
+        the next parsing, for the code inspecting the parser."""
+        local = self._local
+        local.depth -= 1
+        if local.depth > 0:
+            local.context = caller
+
+    def _parse_tree(self, dom, clock=None):
+        """Apply the rules to the given dom (None for an empty page) and
+        return the final data; the stages are timed by the clock, if set
+        (see imdb.parser.http.timing)."""
+        if dom is not None:
             try:
                 dom = self.preprocess_dom(dom)
             except Exception:
                 self._logger.error('%s: caught exception preprocessing DOM',
                                    self._cname, exc_info=True)
+            if clock is not None:
+                clock.lap('preprocess_dom')
             if self.getRefs:
                 try:
                     self.gather_refs(dom)
                 except Exception:
                     self._logger.warn('%s: unable to gather refs: %s',
                                       self._cname, exc_info=True)
+                if clock is not None:
+                    clock.lap('gather_refs', items=len(self._titlesRefs) + len(self._namesRefs))
             data = self.parse_dom(dom)
+            if clock is not None:
+                clock.lap('rules', items=len(data) if isinstance(data, dict) else 0)
         else:
             data = {}
         try:
@@ -439,17 +912,29 @@ class DOMParserBase(object):
         except Exception:
             self._logger.error('%s: caught exception postprocessing data',
                                self._cname, exc_info=True)
+        if self._keys and isinstance(data, dict):
+            data = dict((k, v) for k, v in data.items() if k in self._keys)
         if self._containsObjects:
             self.set_objects_params(data)
+        if clock is not None:
+            clock.lap('postprocess', items=len(data) if isinstance(data, dict) else 0)
         data = self.add_refs(data)
+        if clock is not None:
+            clock.lap('add_refs')
         return data
 
     def get_dom(self, html_string):
-        """Return a dom object, from the given string."""
+        """Return a dom object, from the given string (or utf8 bytes,
+        only if lxml is used)."""
         try:
-            if not _USE_LXML:
-                html_string = html_to_xhtml(html_string, omit_tags={"script"})
-            dom = build_tree(html_string, force_html=True)
+            if isinstance(html_string, bytes):
+                import lxml.html
+                parser = lxml.html.HTMLParser(encoding='utf-8')
+                return lxml.html.fromstring(html_string, parser=parser)
+            if _USE_LXML:
+                dom = build_tree(html_string, force_html=True)
+            else:
+                dom = html_to_tree(html_string, omit_tags={"script"})
             if dom is None:
                 dom = build_tree('')
                 self._logger.error('%s: using a fake empty DOM', self._cname)
@@ -488,42 +973,111 @@ class DOMParserBase(object):
         """Here we can modify the text, before it's parsed."""
         if not html_string:
             return html_string
-        try:
-            preprocessors = self.preprocessors
-        except AttributeError:
-            return html_string
-        for src, sub in preprocessors:
-            # re._pattern_type is present only since Python 2.5.
-            if isinstance(getattr(src, 'sub', None), Callable):
-                html_string = src.sub(sub, html_string)
-            elif isinstance(src, str) or isinstance(src, unicode):
-                html_string = html_string.replace(src, sub)
-            elif isinstance(src, Callable):
-                try:
-                    html_string = src(html_string)
-                except Exception:
-                    _msg = '%s: caught exception preprocessing html'
-                    self._logger.error(_msg, self._cname, exc_info=True)
-                    continue
+        return self._apply_preprocessors(self._get_preprocessors()[1], html_string)
+
+    def _apply_preprocessors(self, plan, html_string):
+        """Apply the preprocessors compiled by _compile_preprocessors."""
+        for funct, required, custom in plan:
+            if required is not None and required not in html_string:
+                continue
+            if not custom:
+                html_string = funct(html_string)
+                continue
+            try:
+                html_string = funct(html_string)
+            except Exception:
+                _msg = '%s: caught exception preprocessing html'
+                self._logger.error(_msg, self._cname, exc_info=True)
         return html_string
 
+    def _get_preprocessors(self):
+        """Return a tuple with the preprocessors, their compiled version,
+        the version converted to work on bytes (None if not possible) and
+        the compiled version of the latter; they are computed once for
+        every class."""
+        preprocessors = getattr(self, 'preprocessors', None) or []
+        cls = self.__class__
+        compiled = cls.__dict__.get('_compiledPreprocessors')
+        if compiled is not None and compiled[0] is preprocessors:
+            return compiled
+        bytesPreprocessors = None
+        if cls.preprocess_string is DOMParserBase.preprocess_string:
+            bytesPreprocessors = []
+            for src, sub in preprocessors:
+                converted = _to_bytes_preprocessor(src, sub)
+                if converted is None:
+                    bytesPreprocessors = None
+                    break
+                bytesPreprocessors.append(converted)
+        compiled = (preprocessors, _compile_preprocessors(preprocessors), bytesPreprocessors,
+                    _compile_preprocessors(bytesPreprocessors or []))
+        if preprocessors is getattr(cls, 'preprocessors', None):
+            cls._compiledPreprocessors = compiled
+        return compiled
+
+    def preprocess_bytes(self, content, encoding=None):
+        """Apply the preprocessors to a page given as bytes. If lxml is used,
+        the encoding is utf8 and the preprocessors can work on the bytes,
+        the page is not decoded; otherwise it's returned as a preprocessed
+        string."""
+        encoding = (encoding or 'utf-8').lower()
+        preprocessors, plan, bytesPreprocessors, bytesPlan = self._get_preprocessors()
+        if not _USE_LXML or bytesPreprocessors is None or encoding not in _BYTES_ENCODINGS:
+            return self.preprocess_string(content.decode(encoding, 'replace'))
+        return self._apply_preprocessors(bytesPlan, content)
+
+    def _get_bytes_preprocessors(self):
+        """Return the preprocessors converted to work on bytes, or None
+        if it's not possible."""
+        return self._get_preprocessors()[2]
+
     def gather_refs(self, dom):
-        """Collect references."""
-        grParser = GatherRefs()
-        grParser._as = self._as
-        grParser._modFunct = self._modFunct
-        refs = grParser.parse_dom(dom)
-        refs = grParser.postprocess_data(refs)
-        self._namesRefs = refs['names refs']
-        self._titlesRefs = refs['titles refs']
+        """Collect references; the Person and Movie instances are built
+        by add_refs, only for the references that are actually used."""
+        self._namesRefs, self._titlesRefs = _gather_refs(dom)
 
     def preprocess_dom(self, dom):
         """Last chance to modify the dom, before the rules are applied."""
         return dom
 
+    def get_rules(self):
+        """Return the rules needed to get the requested keys; all the rules
+        are used if the keys were not set, or if some of them are not
+        known to be produced by a rule."""
+        if not self._keys:
+            return self.rules
+        ruleKeys = set()
+        for key in self._keys:
+            ruleKeys.update(self._keysRules.get(key, (key,)))
+        rules = [rule for rule in self.rules if isinstance(rule.key, str) and rule.key in ruleKeys]
+        knownKeys = set(self._keysRules).union(rule.key for rule in rules)
+        if not self._keys.issubset(knownKeys):
+            return self.rules
+        return rules
+
+    def _get_rules_plan(self, rules):
+        """Return the function compiled from the given rules; the ones
+        of all the rules of the parser, and of the subsets selected by
+        the requested keys, are compiled only once for every class (or
+        for every instance, if the rules are set by the instance)."""
+        owner = self if 'rules' in self.__dict__ else self.__class__
+        allRules = owner.rules
+        plans = owner.__dict__.get('_compiledRules')
+        if plans is None or plans[0] is not allRules:
+            plans = (allRules, {})
+            setattr(owner, '_compiledRules', plans)
+        planKey = tuple(id(rule) for rule in rules)
+        compiled = plans[1].get(planKey)
+        if compiled is not None and compiled[0] == rules:
+            return compiled[1]
+        compiled = (list(rules), Rules(rules).compile())
+        if rules is allRules or all(any(rule is r for r in allRules) for rule in rules):
+            plans[1][planKey] = compiled
+        return compiled[1]
+
     def parse_dom(self, dom):
         """Parse the given dom according to the rules specified in self.rules."""
-        return Rules(self.rules).extract(dom)
+        return self._get_rules_plan(self.get_rules())(dom)
 
     def postprocess_data(self, data):
         """Here we can modify the data."""
@@ -539,26 +1093,32 @@ class DOMParserBase(object):
     def add_refs(self, data):
         """Modify data according to the expected output."""
         if self.getRefs:
-            titl_re = r'(%s)' % '|'.join(
-                [re.escape(x) for x in list(self._titlesRefs.keys())]
-            )
-            if titl_re != r'()':
-                re_titles = re.compile(titl_re, re.U)
-            else:
-                re_titles = None
-            nam_re = r'(%s)' % '|'.join(
-                [re.escape(x) for x in list(self._namesRefs.keys())]
-            )
-            if nam_re != r'()':
-                re_names = re.compile(nam_re, re.U)
-            else:
-                re_names = None
-            _putRefs(data, re_titles, re_names)
+            titlesMatcher = RefsMatcher(list(self._titlesRefs.keys()))
+            namesMatcher = RefsMatcher(list(self._namesRefs.keys()))
+            _putRefs(data, titlesMatcher, namesMatcher)
+            self._titlesRefs = self._build_refs(self._titlesRefs, titlesMatcher.matched, Movie)
+            self._namesRefs = self._build_refs(self._namesRefs, namesMatcher.matched, Person)
         return {'data': data,
                 'titlesRefs': self._titlesRefs,
                 'namesRefs': self._namesRefs
                 }
 
+    def _build_refs(self, refs, used, cls):
+        """Return a dictionary of Movie or Person instances, from the
+        dictionary of the links collected by gather_refs, keeping only
+        the used references."""
+        result = {}
+        for text, link in refs.items():
+            if text not in used:
+                continue
+            if cls is Movie:
+                result[text] = Movie(movieID=analyze_imdbid(link), title=text,
+                                     accessSystem=self._as, modFunct=self._modFunct)
+            else:
+                result[text] = Person(personID=analyze_imdbid(link), name=text,
+                                      accessSystem=self._as, modFunct=self._modFunct)
+        return result
+
 
 def _parse_ref(text, link, info):
     """Manage links to references."""
@@ -569,6 +1129,58 @@ def _parse_ref(text, link, info):
     return text.replace('\n', ' '), link
 
 
+def _add_ref(refs, text, link, info):
+    """Add a reference collected by _gather_refs."""
+    text, link = _parse_ref(text, link, info)
+    text = text.strip()
+    link = link.strip()
+    if text and link:
+        refs[text] = link
+
+
+def _gather_refs(root):
+    """Return two dictionaries, mapping the text of the links to persons
+    and movies to their URL, with a single walk of the tree.
+
+    Like in GatherRefs, the text of the links to movies includes the year
+    and kind found in the text that follows them."""
+    namesRefs = {}
+    titlesRefs = {}
+    # Links to movies waiting for the text node that follows them.
+    pending = []
+    stack = [root]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, tuple):
+            # All the descendants of the element were visited.
+            element, ref = item
+            if ref is not None:
+                pending.append(ref)
+            text = element.tail if element is not root else None
+        else:
+            element = item
+            ref = None
+            tag = element.tag
+            if tag == 'a':
+                link = element.get('href') or ''
+                if link.startswith('/name/nm') or link.startswith('/title/tt'):
+                    text = (element.text or '') + ''.join([child.tail or '' for child in element])
+                    if link.startswith('/name/nm'):
+                        _add_ref(namesRefs, text, link, '')
+                    else:
+                        ref = (text, link)
+            stack.append((element, ref))
+            stack.extend(reversed(list(element)))
+            text = element.text if isinstance(tag, str) else None
+        if text and pending:
+            for refText, refLink in pending:
+                _add_ref(titlesRefs, refText, refLink, text.strip())
+            pending = []
+    for refText, refLink in pending:
+        _add_ref(titlesRefs, refText, refLink, '')
+    return namesRefs, titlesRefs
+
+
 class GatherRefs(DOMParserBase):
     """Parser used to gather references to movies, persons."""
     _common_rules = [
@@ -40,16 +40,35 @@ PY2 = sys.hexversion < 0x3000000
 # Logger for imdb.utils module.
 _utils_logger = logging.getLogger('imdbpy.utils')
 
+
+class _LazyRegex(object):
+    """A regular expression compiled only when it's used for the first
+    time; the attributes of the compiled pattern are then cached."""
+    def __init__(self, pattern, flags=0):
+        self._pattern = pattern
+        self._flags = flags
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        compiled = self.__dict__.get('_compiled')
+        if compiled is None:
+            compiled = self._compiled = re.compile(self._pattern, self._flags)
+        value = getattr(compiled, name)
+        setattr(self, name, value)
+        return value
+
+
 # The regular expression for the "long" year format of IMDb, like
 # "(1998)" and "(1986/II)", where the optional roman number (that I call
 # "imdbIndex" after the slash is used for movies with the same title
 # and year of release.
 # XXX: probably L, C, D and M are far too much! ;-)
-re_year_index = re.compile(r'\(([0-9\?]{4}(/[IVXLCDM]+)?)\)')
-re_m_episode = re.compile(r'\(TV Episode\)\s+-\s+', re.I)
-re_m_series = re.compile(r'Season\s+(\d+)\s+\|\s+Episode\s+(\d+)\s+-', re.I)
-re_m_imdbIndex = re.compile(r'\(([IVXLCDM]+)\)')
-re_m_kind = re.compile(
+re_year_index = _LazyRegex(r'\(([0-9\?]{4}(/[IVXLCDM]+)?)\)')
+re_m_episode = _LazyRegex(r'\(TV Episode\)\s+-\s+', re.I)
+re_m_series = _LazyRegex(r'Season\s+(\d+)\s+\|\s+Episode\s+(\d+)\s+-', re.I)
+re_m_imdbIndex = _LazyRegex(r'\(([IVXLCDM]+)\)')
+re_m_kind = _LazyRegex(
     r'\((TV episode|TV Series|TV mini-series|mini|TV|Video|Video Game|VG|Short|TV Movie|TV Short|V)\)',
     re.I
 )
@@ -65,14 +84,14 @@ KIND_MAP = {
 }
 
 # Match only the imdbIndex (for name strings).
-re_index = re.compile(r'^\(([IVXLCDM]+)\)$')
+re_index = _LazyRegex(r'^\(([IVXLCDM]+)\)$')
 
 # Match things inside parentheses.
-re_parentheses = re.compile(r'(\(.*\))')
+re_parentheses = _LazyRegex(r'(\(.*\))')
 
 # Match the number of episodes.
-re_episodes = re.compile('\s?\((\d+) episodes\)', re.I)
-re_episode_info = re.compile(
+re_episodes = _LazyRegex('\s?\((\d+) episodes\)', re.I)
+re_episode_info = _LazyRegex(
     r'{\s*(.+?)?\s?(\([0-9\?]{4}-[0-9\?]{1,2}-[0-9\?]{1,2}\))?\s?(\(#[0-9]+\.[0-9]+\))?}'
 )
 
@@ -759,13 +778,13 @@ def cmpCompanies(p1, p2):
 
 # References to titles, names and characters.
 # XXX: find better regexp!
-re_titleRef = re.compile(
+re_titleRef = _LazyRegex(
     r'_(.+?(?: \([0-9\?]{4}(?:/[IVXLCDM]+)?\))?(?: \(mini\)| \(TV\)| \(V\)| \(VG\))?)_ \(qv\)'
 )
 # FIXME: doesn't match persons with ' in the name.
-re_nameRef = re.compile(r"'([^']+?)' \(qv\)")
+re_nameRef = _LazyRegex(r"'([^']+?)' \(qv\)")
 # XXX: good choice?  Are there characters with # in the name?
-re_characterRef = re.compile(r"#([^']+?)# \(qv\)")
+re_characterRef = _LazyRegex(r"#([^']+?)# \(qv\)")
 
 
 # Functions used to filter the text strings.
@@ -866,7 +885,7 @@ class RolesList(list):
 # Replace & with &amp;, but only if it's not already part of a charref.
 # _re_amp = re.compile(r'(&)(?!\w+;)', re.I)
 # _re_amp = re.compile(r'(?<=\W)&(?=[^a-zA-Z0-9_#])')
-_re_amp = re.compile(r'&(?![^a-zA-Z0-9_#]{1,5};)')
+_re_amp = _LazyRegex(r'&(?![^a-zA-Z0-9_#]{1,5};)')
 
 
 def escape4xml(value):
@@ -108,6 +108,12 @@ params = {
     'data_files': data_files,
     'install_requires': ['SQLAlchemy', 'lxml'],
     'extras_require': {
+        'async': [
+            'aiohttp'
+        ],
+        'brotli': [
+            'brotli'
+        ],
         'dev': [
             'flake8',
             'flake8-isort',
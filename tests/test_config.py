@@ -0,0 +1,61 @@
+import os
+import subprocess
+import sys
+
+import imdb
+from imdb.utils import _LazyRegex, analyze_title
+
+
+ROOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+
+SCRIPT = '''
+import sys
+import imdb
+imdb.IMDb()
+print(sorted(name for name in ('configparser', 'pkgutil', 'sqlite3') if name in sys.modules))
+'''
+
+
+def _use_dir(monkeypatch, path):
+    monkeypatch.chdir(str(path))
+    monkeypatch.setenv('HOME', str(path))
+
+
+def test_unused_modules_should_not_be_imported(tmpdir):
+    env = dict(os.environ, PYTHONPATH=os.path.abspath(ROOT_DIR), HOME=str(tmpdir))
+    out = subprocess.check_output([sys.executable, '-c', SCRIPT], cwd=str(tmpdir), env=env)
+    assert out.decode('utf-8').strip() == '[]'
+
+
+def test_read_config_without_files_should_be_empty(tmpdir, monkeypatch):
+    _use_dir(monkeypatch, tmpdir)
+    monkeypatch.setattr(imdb, '_config_files', lambda: [str(tmpdir.join('imdbpy.cfg'))])
+    assert imdb._read_config() == {}
+
+
+def test_read_config_should_be_cached_until_the_file_changes(tmpdir, monkeypatch):
+    _use_dir(monkeypatch, tmpdir)
+    conf = tmpdir.join('imdbpy.cfg')
+    monkeypatch.setattr(imdb, '_config_files', lambda: [str(conf)])
+    conf.write('[imdbpy]\naccessSystem = http\nreraiseExceptions = on\n')
+    options = imdb._read_config()
+    assert options == {'accessSystem': 'http', 'reraiseExceptions': True}
+    options['accessSystem'] = 's3'
+    assert imdb._read_config() == {'accessSystem': 'http', 'reraiseExceptions': True}
+    conf.write('[imdbpy]\naccessSystem = http\nreraiseExceptions = off\ntimeout = 5\n')
+    assert imdb._read_config() == {'accessSystem': 'http', 'reraiseExceptions': False, 'timeout': '5'}
+
+
+def test_read_config_with_arguments_should_read_the_given_files(tmpdir):
+    conf = tmpdir.join('other.cfg')
+    conf.write('[imdbpy]\nloggingLevel = debug\n')
+    assert imdb._read_config(confFile=[str(conf)]) == {'loggingLevel': 'debug'}
+    assert imdb.ConfigParserWithCase(confFile=[str(conf)]).get('imdbpy', 'loggingLevel') == 'debug'
+
+
+def test_lazy_regex_should_work_like_a_compiled_one():
+    regex = _LazyRegex(r'\((\d{4})\)')
+    assert '_compiled' not in regex.__dict__
+    assert regex.findall('Amelie (2001) (2002)') == ['2001', '2002']
+    assert regex.pattern == r'\((\d{4})\)'
+    assert analyze_title('Amelie (2001) (TV)') == {'title': 'Amelie', 'year': 2001, 'kind': 'tv movie'}
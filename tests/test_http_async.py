@@ -0,0 +1,92 @@
+from pytest import importorskip
+
+import asyncio
+
+from imdb import IMDb
+
+
+importorskip('aiohttp')
+
+
+def run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def test_async_get_movie_should_have_title(page_cache):
+    async def main():
+        async with IMDb('async', cache=page_cache) as ia:
+            return await ia.get_movie('0133093', info=['main'])    # Matrix
+    movie = run(main())
+    assert movie['title'] == 'The Matrix'
+
+
+def test_async_get_movies_concurrently_should_keep_their_ids(page_cache):
+    movie_ids = ['0133093', '0094226', '0068646']   # Matrix, Untouchables, Godfather
+
+    async def main():
+        async with IMDb('async', concurrency=3, cache=page_cache) as ia:
+            return await asyncio.gather(*[ia.get_movie(movie_id, info=['main'])
+                                          for movie_id in movie_ids])
+    movies = run(main())
+    assert [m.movieID for m in movies] == movie_ids
+    assert [m['imdbID'] for m in movies] == movie_ids
+
+
+def test_async_search_movie_should_list_results(page_cache):
+    async def main():
+        async with IMDb('async', cache=page_cache) as ia:
+            return await ia.search_movie('matrix')
+    movies = run(main())
+    assert 0 < len(movies)
+
+
+def test_async_get_movies_should_consume_the_ids_while_retrieving():
+    taken = []
+    running = []
+    peak = [0]
+
+    def movie_ids():
+        for movie_id in range(10):
+            taken.append(movie_id)
+            yield movie_id
+
+    async def get_movie(movie_id, info, modFunct, keys=None):
+        running.append(movie_id)
+        peak[0] = max(peak[0], len(running))
+        await asyncio.sleep(0.01 * (movie_id % 3))
+        running.remove(movie_id)
+        return movie_id
+
+    async def main():
+        async with IMDb('async', workers=3) as ia:
+            ia.get_movie = get_movie
+            results = ia.get_movies(movie_ids())
+            first = await next(results)
+            assert len(taken) <= 4
+            return [first] + [await result for result in results]
+    movies = run(main())
+    assert sorted(movies) == list(range(10))
+    assert peak[0] == 3
+
+
+def test_async_get_people_awaited_together_should_return_every_person():
+    running = []
+    peak = [0]
+
+    async def get_person(person_id, info, modFunct):
+        running.append(person_id)
+        peak[0] = max(peak[0], len(running))
+        await asyncio.sleep(0.001)
+        running.remove(person_id)
+        return person_id
+
+    async def main():
+        async with IMDb('async', workers=2) as ia:
+            ia.get_person = get_person
+            return await asyncio.gather(*ia.get_people(iter(range(7))))
+    assert sorted(run(main())) == list(range(7))
+    assert peak[0] == 2
@@ -0,0 +1,12 @@
+def test_get_movies_should_return_every_movie(ia):
+    movie_ids = ['0133093', '0094226', '0068646']   # Matrix, Untouchables, Godfather
+    movies = list(ia.get_movies(movie_ids, info=['main']))
+    assert sorted(m.movieID for m in movies) == sorted(movie_ids)
+    assert all('title' in m for m in movies)
+
+
+def test_get_people_should_return_every_person(ia):
+    person_ids = ['0000206', '0000001']     # Keanu Reeves, Fred Astaire
+    people = list(ia.get_people(person_ids, info=['main']))
+    assert sorted(p.personID for p in people) == sorted(person_ids)
+    assert all('name' in p for p in people)
@@ -0,0 +1,142 @@
+from pytest import fixture
+
+import pickle
+
+from imdb.Movie import Movie
+from imdb.Person import Person
+from imdb.parser.http.cache import (CachedResponse, FileSystemCache, MemoryCache,
+                                    ParseCache, SQLiteCache, make_cache)
+from imdb.parser.http.movieParser import DOMHTMLMovieParser
+from imdb.parser.http.personParser import DOMHTMLMaindetailsParser
+from imdb.parser.http.utils import DOMParserBase
+
+
+URL = 'https://www.imdb.com/title/tt0133093/'
+
+
+@fixture(params=['memory', 'file', 'sqlite'])
+def cache(request, tmpdir):
+    if request.param == 'memory':
+        return MemoryCache()
+    elif request.param == 'file':
+        return FileSystemCache(str(tmpdir))
+    return SQLiteCache(str(tmpdir.join('cache.db')))
+
+
+def test_cache_should_return_stored_response(cache):
+    cache.set(CachedResponse(URL, b'<html></html>', charset='utf-8', etag='"x"'))
+    response = cache.get(URL)
+    assert response.content == b'<html></html>'
+    assert response.charset == 'utf-8'
+    assert response.etag == '"x"'
+
+
+def test_cache_should_return_none_for_missing_response(cache):
+    assert cache.get(URL) is None
+
+
+def test_cache_should_evict_least_recently_used_responses(cache):
+    cache.maxSize = 25
+    cache.set(CachedResponse(URL + '1', b'x' * 10))
+    cache.set(CachedResponse(URL + '2', b'x' * 10))
+    cache.get(URL + '1')
+    cache.set(CachedResponse(URL + '3', b'x' * 10))
+    assert cache.get(URL + '1') is not None
+    assert cache.get(URL + '2') is None
+    assert cache.get_stats()['evicted'] == 1
+
+
+def test_cache_ttl_should_depend_on_url():
+    cache = MemoryCache(ttl=[(r'/chart/', 60), (r'', None)])
+    assert cache.get_ttl('https://www.imdb.com/chart/top') == 60
+    assert cache.get_ttl(URL) is None
+
+
+def test_cache_should_expire_old_responses():
+    cache = MemoryCache(ttl=60)
+    assert cache.is_fresh(CachedResponse(URL, b'', stored=1000), now=1059)
+    assert not cache.is_fresh(CachedResponse(URL, b'', stored=1000), now=1061)
+
+
+def test_make_cache_should_parse_strings(tmpdir):
+    assert isinstance(make_cache('memory'), MemoryCache)
+    assert isinstance(make_cache(str(tmpdir)), FileSystemCache)
+    assert isinstance(make_cache('sqlite:' + str(tmpdir.join('c.db'))), SQLiteCache)
+
+
+class CountingParser(DOMParserBase):
+    calls = 0
+
+    def parse(self, html_string, getRefs=None, **kwds):
+        CountingParser.calls += 1
+        return {'data': {'title': html_string[:10]}}
+
+
+def test_parse_cache_should_skip_parsing_unchanged_content(cache):
+    parseCache = ParseCache(cache)
+    parser = CountingParser()
+    CountingParser.calls = 0
+    for i in range(2):
+        result = parseCache.get(parser, URL, '<html>1</html>', {})
+        if result is None:
+            result = parser.parse('<html>1</html>')
+            parseCache.set(parser, URL, '<html>1</html>', {}, result)
+    assert result == {'data': {'title': '<html>1</h'}}
+    assert CountingParser.calls == 1
+
+
+def test_parse_cache_should_miss_changed_content_or_parser_version(cache):
+    parseCache = ParseCache(cache)
+    parser = CountingParser()
+    parseCache.set(parser, URL, '<html>1</html>', {}, {'data': {}})
+    assert parseCache.get(parser, URL, '<html>2</html>', {}) is None
+    parser._version += 1
+    assert parseCache.get(parser, URL, '<html>1</html>', {}) is None
+
+
+def test_parse_cache_sharing_the_page_cache_should_keep_its_own_counters(cache):
+    cache.set(CachedResponse(URL, b'<html>1</html>'))
+    parseCache = ParseCache(cache)
+    parser = CountingParser()
+    assert parseCache.get(parser, URL, '<html>1</html>', {}) is None
+    parseCache.set(parser, URL, '<html>1</html>', {}, {'data': {}})
+    assert parseCache.get(parser, URL, '<html>1</html>', {}) == {'data': {}}
+    stats = parseCache.get_stats()
+    assert (stats['hits'], stats['misses'], stats['stored']) == (1, 1, 1)
+    assert stats['hit ratio'] == 0.5
+    pageStats = cache.get_stats()
+    assert (pageStats['hits'], pageStats['misses']) == (0, 0)
+
+
+def test_parse_cache_should_store_objects_as_json(cache):
+    parseCache = ParseCache(cache)
+    parser = CountingParser()
+    parser._modFunct = lambda s, titlesRefs, namesRefs: s
+    person = Person(personID='0000206', name='Keanu Reeves', currentRole='Neo',
+                    modFunct=parser._modFunct, accessSystem='http')
+    result = {'data': {'cast': [person], 'episodes': {1: {1: Movie(movieID='0000001', title='Pilot')}},
+                       'akas': ('The Matrix',)}}
+    parseCache.set(parser, URL, '<html>1</html>', {}, result)
+    stored = cache.get(parseCache.make_url(parser, URL, '<html>1</html>', {}))
+    assert stored.content.startswith(b'{')
+    loaded = parseCache.get(parser, URL, '<html>1</html>', {})
+    assert loaded == result
+    cast = loaded['data']['cast'][0]
+    assert vars(cast) == vars(person)
+    assert cast.modFunct is parser._modFunct
+    assert str(cast.currentRole) == 'Neo'
+    assert loaded['data']['episodes'][1][1]['title'] == 'Pilot'
+
+
+def test_parse_cache_should_not_load_pickled_results(cache):
+    parseCache = ParseCache(cache)
+    parser = CountingParser()
+    url = parseCache.make_url(parser, URL, '<html>1</html>', {})
+    cache.set(CachedResponse(url, pickle.dumps({'data': {}})))
+    assert parseCache.get(parser, URL, '<html>1</html>', {}) is None
+
+
+def test_parse_cache_version_should_depend_on_parser_class():
+    versions = set(ParseCache.get_parser_version(parser)
+                   for parser in (CountingParser(), DOMHTMLMovieParser(), DOMHTMLMaindetailsParser()))
+    assert len(versions) == 3
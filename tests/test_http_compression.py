@@ -0,0 +1,31 @@
+import gzip
+import io
+import zlib
+
+from imdb.parser.http import read_content
+
+
+PAGE = b'<html><body>' + b'<a href="/title/tt0133093/">The Matrix</a>' * 1000 + b'</body></html>'
+
+
+def test_read_content_should_return_plain_content():
+    assert read_content(io.BytesIO(PAGE)) == PAGE
+
+
+def test_read_content_should_decode_gzip():
+    assert read_content(io.BytesIO(gzip.compress(PAGE)), 'gzip') == PAGE
+
+
+def test_read_content_should_decode_deflate():
+    assert read_content(io.BytesIO(zlib.compress(PAGE)), 'deflate') == PAGE
+
+
+def test_read_content_should_decode_raw_deflate():
+    compressor = zlib.compressobj(9, zlib.DEFLATED, -zlib.MAX_WBITS)
+    content = compressor.compress(PAGE) + compressor.flush()
+    assert read_content(io.BytesIO(content), 'deflate') == PAGE
+
+
+def test_read_content_should_decode_truncated_content():
+    content = gzip.compress(PAGE)
+    assert PAGE.startswith(read_content(io.BytesIO(content[:len(content) // 2]), 'gzip'))
@@ -0,0 +1,31 @@
+from imdb.parser.http.piculet import ElementTree, html_to_tree, html_to_xhtml
+
+
+DOCUMENTS = [
+    '<html><body><p class="x">Amélie &amp; Nino<br>Paris</p></body></html>',
+    '<!DOCTYPE html>\n<html><head><meta charset="utf-8"><script>var a = "<b>";</script></head>\n'
+    '<body><!-- comment --><div id="a" hidden>text</div>\r\n<img src="x.jpg" alt="a\n\tb"/></body></html>',
+    '<html><body><ul><li>one<li>two</ul><a href="/title/tt0211915/?ref_=a&amp;b=1">x</a></body></html>',
+    '<html><body><div><span>unexpected</div></span><p>mail <me@example.com> here</p></body></html>',
+    '<html><body><table><tr><td>Genres</td><td><a>Comedy</a></td></tr></table>&lt;tail&gt;</body></html>\n',
+]
+
+
+def _xhtml_tree(document, **kwds):
+    return ElementTree.tostring(ElementTree.fromstring(html_to_xhtml(document, **kwds)))
+
+
+def test_tree_should_be_the_one_of_the_xhtml_content():
+    for document in DOCUMENTS:
+        assert ElementTree.tostring(html_to_tree(document)) == _xhtml_tree(document)
+
+
+def test_tree_should_omit_tags_and_attributes():
+    for document in DOCUMENTS:
+        kwds = {'omit_tags': {'script', 'table'}, 'omit_attrs': {'id', 'class'}}
+        assert ElementTree.tostring(html_to_tree(document, **kwds)) == _xhtml_tree(document, **kwds)
+
+
+def test_tree_should_close_the_open_tags():
+    root = html_to_tree('<html><body><div><p>text')
+    assert ElementTree.tostring(root) == b'<html><body><div><p>text</p></div></body></html>'
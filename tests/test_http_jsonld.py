@@ -0,0 +1,137 @@
+import json
+
+from imdb import IMDb
+from imdb.parser.http.cache import CachedResponse, MemoryCache
+from imdb.parser.http.jsonldParser import JSONLDMovieParser, JSONLDPersonParser, extract_jsonld
+
+
+MOVIE = {
+    '@context': 'http://schema.org',
+    '@type': 'Movie',
+    'url': '/title/tt0133093/',
+    'name': 'The Matrix',
+    'image': 'https://m.media-amazon.com/images/M/matrix.jpg',
+    'genre': ['Action', 'Sci-Fi'],
+    'director': [
+        {'@type': 'Person', 'url': '/name/nm0905154/', 'name': 'Lana Wachowski'},
+        {'@type': 'Person', 'url': '/name/nm0905152/', 'name': 'Lilly Wachowski'}
+    ],
+    'creator': [
+        {'@type': 'Person', 'url': '/name/nm0905152/', 'name': 'Lilly Wachowski'},
+        {'@type': 'Organization', 'url': '/company/co0002663/'}
+    ],
+    'description': 'Thomas A. Anderson is a man living two lives.',
+    'datePublished': '1999-03-31',
+    'aggregateRating': {'@type': 'AggregateRating', 'ratingCount': 1602735, 'ratingValue': '8.7'},
+    'duration': 'PT2H16M'
+}
+
+PAGE = '''<html><head><title>The Matrix</title>
+<script type="application/ld+json">%s</script>
+</head><body></body></html>''' % json.dumps(MOVIE)
+
+PERSON_PAGE = '''<html><head><script type="application/ld+json">
+{"@type": "Person", "url": "/name/nm0000206/", "name": "Keanu Reeves",
+ "image": "https://m.media-amazon.com/images/M/keanu.jpg", "birthDate": "1964-09-02"}
+</script></head><body></body></html>'''
+
+
+def test_extract_jsonld_should_work_on_bytes_and_strings():
+    assert extract_jsonld(PAGE) == [MOVIE]
+    assert extract_jsonld(PAGE.encode('utf-8')) == [MOVIE]
+
+
+def test_extract_jsonld_should_skip_invalid_blocks():
+    assert extract_jsonld('<script type="application/ld+json">{invalid</script>') == []
+
+
+def test_jsonld_movie_parser_should_map_keys():
+    data = JSONLDMovieParser().parse(PAGE)['data']
+    assert data['title'] == 'The Matrix'
+    assert data['year'] == 1999
+    assert data['kind'] == 'movie'
+    assert data['genres'] == ['Action', 'Sci-Fi']
+    assert data['rating'] == 8.7
+    assert data['votes'] == 1602735
+    assert [p.personID for p in data['director']] == ['0905154', '0905152']
+    assert [p['name'] for p in data['writer']] == ['Lilly Wachowski']
+    assert data['runtimes'] == ['136']
+    assert data['imdbID'] == '0133093'
+
+
+def test_jsonld_movie_parser_should_filter_keys():
+    data = JSONLDMovieParser().parse(PAGE, keys=['rating', 'genres', 'cast'])['data']
+    assert data == {'rating': 8.7, 'genres': ['Action', 'Sci-Fi']}
+
+
+def test_jsonld_movie_parser_without_data_should_return_nothing():
+    assert JSONLDMovieParser().parse('<html><body></body></html>')['data'] == {}
+
+
+def test_jsonld_person_parser_should_map_keys():
+    data = JSONLDPersonParser().parse(PERSON_PAGE)['data']
+    assert data == {'name': 'Keanu Reeves', 'headshot': 'https://m.media-amazon.com/images/M/keanu.jpg',
+                    'birth date': '1964-09-02', 'imdbID': '0000206'}
+
+
+REFERENCE_PAGE = '''<html><head>
+<meta property="og:title" content="The Matrix (1999)"/>
+<meta property="pageId" content="tt0133093"/>
+</head><body>
+<table class="cast_list">
+<tr class="odd"><td class="primary_photo"><a href="/name/nm0000206/"><img/></a></td>
+<td><a href="/name/nm0000206/">Keanu Reeves</a></td><td>...</td>
+<td class="character"><a href="/title/tt0133093/characters/nm0000206">Neo</a></td></tr>
+</table>
+</body></html>'''
+
+
+def _jsonld_access():
+    cache = MemoryCache(ttl=None)
+    for url, page in (('https://www.imdb.com/title/tt0133093/', PAGE),
+                      ('https://www.imdb.com/title/tt0133093/reference', REFERENCE_PAGE),
+                      ('https://www.imdb.com/name/nm0000206/', PERSON_PAGE)):
+        cache.set(CachedResponse(url, page.encode('utf-8'), charset='utf-8'))
+    ia = IMDb(jsonLD=True, cache=cache, maxRetries=0)
+    ia.retrieved = []
+    retrieve = ia._retrieve_raw
+
+    def _retrieve_raw(url, *args, **kwds):
+        ia.retrieved.append(url)
+        return retrieve(url, *args, **kwds)
+    ia._retrieve_raw = _retrieve_raw
+    return ia
+
+
+def test_jsonld_access_should_take_the_requested_keys_from_the_structured_data():
+    ia = _jsonld_access()
+    movie = ia.get_movie('0133093', info=['main'], keys=['rating', 'genres'])
+    assert movie['genres'] == ['Action', 'Sci-Fi']
+    assert movie['rating'] == 8.7
+    assert 'cast' not in movie
+    assert ia.retrieved == ['https://www.imdb.com/title/tt0133093/']
+
+
+def test_jsonld_access_without_keys_should_make_a_single_request():
+    ia = _jsonld_access()
+    movie = ia.get_movie('0133093', info=['main'])
+    assert [person['name'] for person in movie['cast']] == ['Keanu Reeves']
+    assert 'main' in movie.current_info
+    assert ia.retrieved == ['https://www.imdb.com/title/tt0133093/reference']
+
+
+def test_jsonld_access_with_other_keys_should_use_only_the_usual_parser():
+    ia = _jsonld_access()
+    movie = ia.get_movie('0133093', info=['main'], keys=['genres', 'cast'])
+    assert [person['name'] for person in movie['cast']] == ['Keanu Reeves']
+    assert 'rating' not in movie
+    assert 'main' not in movie.current_info
+    assert ia.retrieved == ['https://www.imdb.com/title/tt0133093/reference']
+
+
+def test_jsonld_access_should_fill_the_person_keys_missing_from_the_page():
+    ia = _jsonld_access()
+    person = ia.get_person('0000206', info=['main'])
+    assert person['headshot'] == 'https://m.media-amazon.com/images/M/keanu.jpg'
+    assert person['birth date'] == '1964-09-02'
+    assert ia.retrieved == ['https://www.imdb.com/name/nm0000206/']
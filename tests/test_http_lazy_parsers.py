@@ -0,0 +1,35 @@
+import os
+import subprocess
+import sys
+
+from imdb.parser.http import _ModuleProxy
+from imdb.parser.http.movieParser import DOMHTMLMovieParser
+
+
+ROOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+
+SCRIPT = '''
+import sys
+import imdb
+ia = imdb.IMDb()
+print(sorted(name for name in sys.modules if name.endswith('Parser')))
+ia.mProxy.movie_parser
+print(sorted(name for name in sys.modules if name.endswith('Parser')))
+'''
+
+
+def test_parser_modules_should_be_imported_on_first_use():
+    env = dict(os.environ, PYTHONPATH=ROOT_DIR)
+    out = subprocess.check_output([sys.executable, '-c', SCRIPT], env=env).decode('utf-8').splitlines()
+    assert out[0] == '[]'
+    assert out[1] == "['imdb.parser.http.movieParser']"
+
+
+def test_proxy_should_build_the_parsers_of_the_module():
+    proxy = _ModuleProxy('movieParser', defaultKeys={'_as': 'http'})
+    parser = proxy.movie_parser
+    assert isinstance(parser, DOMHTMLMovieParser)
+    assert parser._as == 'http'
+    assert parser._objectName == ('imdb.parser.http.movieParser', 'movie_parser')
+    assert proxy.movie_parser is parser
+    assert proxy.DOMHTMLMovieParser is DOMHTMLMovieParser
@@ -569,3 +569,9 @@ def test_movie_box_office_should_be_a_dict(ia):
     movie = ia.get_movie('0133093', info=['main'])      # Matrix
     assert isinstance(movie.get('box office'), dict)
     assert len(movie.get('box office', {})) == 3
+
+
+def test_movie_with_keys_should_contain_only_the_requested_keys(ia):
+    movie = ia.get_movie('0133093', info=['main'], keys=['rating', 'genres'])     # Matrix
+    assert sorted(movie.keys()) == ['genres', 'rating']
+    assert movie.current_info == []
@@ -28,3 +28,13 @@ def test_movie_synopsis_should_be_some_text(ia):
 def test_movie_synopsis_if_none_should_be_excluded(ia):
     movie = ia.get_movie('1863157', info=['plot'])  # Ates Parcasi
     assert 'synopsis' not in movie
+
+
+def test_movie_plot_and_synopsis_should_share_the_same_page(ia):
+    movie = ia.get_movie('0133093', info=['plot'])  # Matrix
+    urls = []
+    retrieve = ia._retrieve_raw
+    ia._retrieve_raw = lambda url, *args, **kwds: urls.append(url) or retrieve(url, *args, **kwds)
+    ia.update(movie, info=['plot', 'synopsis'], override=1)
+    assert len(urls) == 1
+    assert 'plot' in movie
@@ -1,5 +1,7 @@
 from pytest import mark
 
+from imdb.parser.http import IMDbHTTPAccessSystem
+
 
 def test_series_episodes_should_be_a_map_of_seasons_and_episodes(ia):
     movie = ia.get_movie('0412142', info=['episodes'])      # House M.D.
@@ -24,3 +26,37 @@ def test_series_episodes_should_contain_rating_and_votes(ia):
     votes = episodes[1][1]['votes']
     assert 8.3 <= rating <= 9.0
     assert votes > 4400
+
+
+def test_update_series_seasons_should_fetch_only_requested_seasons(ia):
+    movie = ia.get_movie('0412142', info=['main'])      # House M.D.
+    ia.update_series_seasons(movie, [2, 4])
+    assert list(sorted(movie.get('episodes'))) == [2, 4]
+
+
+def test_update_series_seasons_incremental_should_add_missing_seasons(ia):
+    movie = ia.get_movie('0412142', info=['main'])      # House M.D.
+    ia.update_series_seasons(movie, [1])
+    first_season = movie['episodes'][1]
+    ia.update_series_seasons(movie, 'all', incremental=True)
+    assert list(sorted(movie.get('episodes'))) == list(range(1, 9))
+    assert movie['episodes'][1] is first_season
+    assert movie['number of episodes'] == sum(len(s) for s in movie['episodes'].values())
+
+
+def test_series_episodes_should_not_change_the_parsed_pages():
+    ia = IMDbHTTPAccessSystem()
+    url = ia.urls['movie_main'] % '0412142' + 'episodes'
+
+    def parse(parser, pageURL, page, **kwds):
+        season = int(pageURL.split('season=')[1]) if 'season=' in pageURL else 1
+        return {'data': {'_seasons': [1, 2], '_current_season': 1,
+                         'episodes': {season: {1: 'episode %d' % season}}}}
+    ia._retrieve_page = lambda pageURL: (b'', 'utf-8')
+    ia._parse_content = parse
+    with ia._memo_scope():
+        episodes = ia.get_movie_episodes('0412142')
+        assert sorted(episodes['data']['episodes']) == [1, 2]
+        assert episodes['data']['number of episodes'] == 2
+        page = ia._parse_page(ia.mProxy.season_episodes_parser, url)
+        assert list(page['data']['episodes']) == [1]
@@ -0,0 +1,47 @@
+from imdb.parser.http import IMDbHTTPAccessSystem
+from imdb.parser.http.movieParser import DOMHTMLMovieParser
+
+
+PAGE = '''<html><head>
+<meta property="og:title" content="Amélie (2001)"/>
+<meta property="pageId" content="tt0211915"/>
+</head><body>
+<table class="cast_list">
+<tr class="odd"><td class="primary_photo"><a href="/name/nm0851582/"><img/></a></td>
+<td><a href="/name/nm0851582/">Audrey Tautou</a></td><td>...</td>
+<td class="character"><a href="/title/tt0211915/characters/nm0851582">Amélie Poulain</a></td></tr>
+</table>
+<span class="ipl-rating-star__rating">8.3</span>
+</body></html>'''.encode('utf-8')
+
+
+def test_pages_should_be_parsed_by_the_pool_like_in_the_main_process():
+    ia = IMDbHTTPAccessSystem(parseProcesses=1, defaultModFunct=lambda s, t, n: s)
+    try:
+        parser = ia.mProxy.movie_parser
+        expected = parser.parse(PAGE, encoding='utf-8')
+        result = ia._parsePool.parse(parser, PAGE, 'utf-8')
+        assert result is not None
+        assert result['data'] == expected['data']
+        assert result['data']['cast'][0].modFunct is ia._defModFunct
+        assert result['data']['cast'][0].accessSystem == 'http'
+    finally:
+        ia.set_parse_processes(None)
+
+
+def test_access_system_should_parse_the_pages_in_the_pool():
+    ia = IMDbHTTPAccessSystem(parseProcesses=1)
+    try:
+        parser = ia.mProxy.movie_parser
+        result = ia._parse_content(parser, 'https://www.imdb.com/title/tt0211915/reference', (PAGE, 'utf-8'))
+        assert result['data']['title'] == 'Amélie'
+    finally:
+        ia.set_parse_processes(None)
+
+
+def test_parsers_not_built_by_the_access_system_should_be_run_in_the_main_process():
+    ia = IMDbHTTPAccessSystem(parseProcesses=1)
+    try:
+        assert ia._parsePool.parse(DOMHTMLMovieParser(), PAGE, 'utf-8') is None
+    finally:
+        ia.set_parse_processes(None)
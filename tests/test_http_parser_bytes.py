@@ -0,0 +1,56 @@
+import random
+
+from imdb.parser.http import movieParser, personParser
+from imdb.parser.http.movieParser import DOMHTMLMovieParser
+
+
+PAGE = '''<html><head>
+<meta property="og:title" content="Amélie (2001)"/>
+<meta property="pageId" content="tt0211915"/>
+</head><body><table>
+<tr><td>Genres</td><td><ul><li><a href="/genre/Comedy">Comédie&nbsp;日本</a></li>
+<li><a href="/genre/Romance">Romance</a></li></ul></td></tr>
+</table>
+<span class="ipl-rating-star__rating">8.3</span>
+<span class="ipl-rating-star__total-votes">(700,000)</span>
+</body></html>'''
+
+PIECES = ['<h5>', '</h5>', '<h4', '</table>\n</div>', '</div>', '.<br><br>', '<br/>', '<p>', '</p>',
+          '<span class="tv-extra">TV mini-series', '</span>', '<td class="character">', '</td>',
+          ' / ', '\n', ' ', '\t', '\xa0', '\x1c', ' ', '　', 'é', '日本', 'a', 'X']
+
+
+def _preprocessors():
+    for module in (movieParser, personParser):
+        for (cls,), _ in module._OBJECTS.values():
+            parser = cls()
+            converted = parser._get_bytes_preprocessors()
+            if converted:
+                for original, bytesVersion in zip(parser.preprocessors, converted):
+                    yield original, bytesVersion
+
+
+def test_bytes_preprocessors_should_match_the_string_preprocessors():
+    rnd = random.Random(42)
+    for (src, sub), (bsrc, bsub) in _preprocessors():
+        for _ in range(200):
+            text = ''.join(rnd.choice(PIECES) for _ in range(rnd.randint(1, 30)))
+            if isinstance(src, str):
+                expected = text.replace(src, sub)
+                result = text.encode('utf-8').replace(bsrc, bsub)
+            else:
+                expected = src.sub(sub, text)
+                result = bsrc.sub(bsub, text.encode('utf-8'))
+            assert result.decode('utf-8') == expected
+
+
+def test_parse_bytes_should_return_the_same_data_of_a_string():
+    parser = DOMHTMLMovieParser()
+    assert parser.parse(PAGE.encode('utf-8'), encoding='utf-8') == parser.parse(PAGE)
+
+
+def test_parse_bytes_in_other_encodings_should_decode_them():
+    parser = DOMHTMLMovieParser()
+    data = parser.parse(PAGE.replace('&nbsp;日本', '').encode('latin-1'), encoding='latin-1')['data']
+    assert data['title'] == 'Amélie'
+    assert data['genres'] == ['Comédie', 'Romance']
@@ -0,0 +1,52 @@
+from imdb.parser.http.movieParser import DOMHTMLMovieParser
+
+
+PAGE = '''<html><head>
+<meta property="og:title" content="The Matrix (1999)"/>
+<meta property="pageId" content="tt0133093"/>
+</head><body><table>
+<tr><td>Genres</td><td><ul><li><a href="/genre/Action">Action</a></li>
+<li><a href="/genre/Sci-Fi">Sci-Fi</a></li></ul></td></tr>
+</table>
+<span class="ipl-rating-star__rating">8.7</span>
+<span class="ipl-rating-star__total-votes">(1,234,567)</span>
+</body></html>'''
+
+
+def test_parse_without_keys_should_return_every_key():
+    data = DOMHTMLMovieParser().parse(PAGE)['data']
+    assert set(data) == {'title', 'year', 'kind', 'genres', 'rating', 'votes', 'imdbID'}
+
+
+def test_parse_with_keys_should_return_only_the_requested_keys():
+    data = DOMHTMLMovieParser().parse(PAGE, keys=['rating', 'genres'])['data']
+    assert data == {'rating': 8.7, 'genres': ['Action', 'Sci-Fi']}
+
+
+def test_parse_with_keys_should_apply_only_the_needed_rules():
+    parser = DOMHTMLMovieParser()
+    parser.parse(PAGE, keys=['rating', 'year'])
+    assert [rule.key for rule in parser.get_rules()] == ['title', 'rating']
+
+
+def test_parse_with_unknown_keys_should_apply_every_rule():
+    parser = DOMHTMLMovieParser()
+    data = parser.parse(PAGE, keys=['producer', 'votes'])['data']
+    assert parser.get_rules() is parser.rules
+    assert data == {'votes': 1234567}
+
+
+EPISODE_PAGE = '''<html><head>
+<meta property="og:title" content="&quot;House M.D.&quot; Pilot (TV Episode 2004)"/>
+<meta property="pageId" content="tt0606035"/>
+</head><body>
+<a href="/title/tt0412142/episodes">All Episodes (177)</a>
+</body></html>'''
+
+
+def test_parse_episode_of_should_build_the_series():
+    data = DOMHTMLMovieParser().parse(EPISODE_PAGE, keys=['episode of'])['data']
+    series = data['episode of']
+    assert series.movieID == '0412142'
+    assert series['title'] == 'House M.D.'
+    assert series['kind'] == 'tv series'
@@ -0,0 +1,65 @@
+import threading
+
+from imdb.parser.http import IMDbHTTPAccessSystem
+from imdb.parser.http.piculet import Path, Rule
+from imdb.parser.http.utils import DOMParserBase
+
+
+PAGE = '<html><body><p>Quote by <a href="/name/nm%07d/">Actor %d</a></p></body></html>'
+
+
+class QuoteParser(DOMParserBase):
+    _defGetRefs = True
+    rules = [Rule(key='quotes', extractor=Path('//p//text()'))]
+
+    def __init__(self, barrier):
+        self.barrier = barrier
+        DOMParserBase.__init__(self)
+
+    def postprocess_data(self, data):
+        # every thread waits for the others in the middle of the parsing
+        self.barrier.wait(timeout=10)
+        return data
+
+
+def test_parser_should_be_shared_by_many_threads():
+    threads = 4
+    parser = QuoteParser(threading.Barrier(threads))
+    results = {}
+
+    def parse(index):
+        results[index] = parser.parse(PAGE % (index, index))
+
+    workers = [threading.Thread(target=parse, args=(i,)) for i in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    for index in range(threads):
+        name = 'Actor %d' % index
+        assert results[index]['data'] == {'quotes': "Quote by '%s' (qv)" % name}
+        assert list(results[index]['namesRefs']) == [name]
+        assert results[index]['namesRefs'][name].personID == '%07d' % index
+
+
+def test_nested_parsing_should_restore_the_context_of_the_caller():
+    parser = QuoteParser(threading.Barrier(1))
+    outer = []
+
+    def postprocess_data(data):
+        if not outer:
+            outer.append(parser.parse(PAGE % (2, 2), getRefs=False))
+        return data
+    parser.postprocess_data = postprocess_data
+    result = parser.parse(PAGE % (1, 1))
+    assert outer[0]['namesRefs'] == {}
+    assert list(result['namesRefs']) == ['Actor 1']
+
+
+def test_proxy_should_return_the_same_parser_to_every_thread():
+    ia = IMDbHTTPAccessSystem()
+    parsers = []
+    worker = threading.Thread(target=lambda: parsers.append(ia.mProxy.movie_parser))
+    worker.start()
+    worker.join()
+    assert parsers[0] is ia.mProxy.movie_parser
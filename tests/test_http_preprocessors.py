@@ -0,0 +1,67 @@
+import random
+import re
+
+from imdb.parser.http import companyParser, movieParser, personParser, searchMovieAdvancedParser
+from imdb.parser.http.utils import _required_literal
+
+
+PIECES = ['<h5>', '</h5>', '<h4>', '</h4>\n', '<h3>', '</h3>', '<H5>', '<br>', '<br/>', '<br />', '<BR>', '<p>', '</p>',
+          '</table>\n</div>', '</div>', '<hr/>\n', '<tr><td>', '</td></tr>\n\n</table>', '</tr>\n\n', '<td',
+          '<td class="character">', '</td>', ' / ', '<a href="/title/tt0133093/">', '</a> (', '<small>', '</small>',
+          '<b class="blackcatheader">', '</b>', '<span class="tv-extra">TV mini-series', '</span>',
+          'Directors:', 'Stars:', '<span', 'Gross:', '<span name="nv"', 'Episode:', 'Add a Plot',
+          '<div id="tn15bot">', '.<br><br>', '\n', ' ', 'a', 'X', 'é']
+
+
+def _parsers():
+    for module in (movieParser, personParser, companyParser, searchMovieAdvancedParser):
+        for (cls,), _ in module._OBJECTS.values():
+            if cls.preprocessors:
+                yield cls()
+
+
+def _sequential(preprocessors, text):
+    for src, sub in preprocessors:
+        if hasattr(src, 'sub'):
+            text = src.sub(sub, text)
+        else:
+            text = text.replace(src, sub)
+    return text
+
+
+def test_required_literal_should_be_the_prefix_of_the_pattern():
+    assert _required_literal('(<div id="tn15bot">)', 0) == '<div id="tn15bot">'
+    assert _required_literal('Directors?:(.*?)(<span|</p>)', 0) == 'Director'
+    assert _required_literal('(Gross:.*?<span name=)"nv"', 0) == 'Gross:'
+
+
+def test_required_literal_should_be_none_if_not_known():
+    assert _required_literal('((<br/>|</p>|</table>))\n?<br/>(?!<a)', 0) is None
+    assert _required_literal('(<h5>)', re.I) is None
+    assert _required_literal('[abc]+', 0) is None
+    assert _required_literal('(ab)?c', 0) is None
+    assert _required_literal('((ab))*c', 0) is None
+    assert _required_literal('(ab){0,2}c', 0) is None
+    assert _required_literal('(ab)|c', 0) is None
+
+
+def test_required_literal_should_stop_before_a_quantifier():
+    assert _required_literal('ab{0,2}c', 0) == 'a'
+    assert _required_literal('ab?c', 0) == 'a'
+    assert _required_literal('(ab)+c', 0) == 'ab'
+
+
+def test_compiled_preprocessors_should_match_the_sequential_application():
+    rnd = random.Random(42)
+    for parser in _parsers():
+        for _ in range(300):
+            text = ''.join(rnd.choice(PIECES) for _ in range(rnd.randint(1, 40)))
+            expected = _sequential(parser.preprocessors, text)
+            assert parser.preprocess_string(text) == expected
+            if parser._get_bytes_preprocessors() is not None:
+                assert parser.preprocess_bytes(text.encode('utf-8')) == expected.encode('utf-8')
+
+
+def test_compiled_preprocessors_should_be_shared_by_the_instances():
+    first, second = movieParser.DOMHTMLMovieParser(), movieParser.DOMHTMLMovieParser()
+    assert first._get_preprocessors() is second._get_preprocessors()
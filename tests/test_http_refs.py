@@ -0,0 +1,87 @@
+import random
+import re
+
+from imdb.parser.http.piculet import Path, Rule
+from imdb.parser.http.utils import (DOMParserBase, GatherRefs, RefsMatcher, _gather_refs, _putRefs,
+                                    analyze_imdbid)
+
+
+def regex_sub(strings, fmt, text):
+    regex = re.compile(r'(%s)' % '|'.join(re.escape(x) for x in strings), re.U)
+    return regex.sub(fmt, text)
+
+
+def test_refs_matcher_should_tag_references():
+    matcher = RefsMatcher(['Julia Roberts', 'Roberts'])
+    text = matcher.sub("'%s' (qv)", 'Julia Roberts and Eric Roberts')
+    assert text == "'Julia Roberts' (qv) and Eric 'Roberts' (qv)"
+
+
+def test_refs_matcher_should_prefer_the_first_string_like_a_regex():
+    strings = ['The Matrix', 'The Matrix Reloaded']
+    text = 'The Matrix Reloaded (2003)'
+    assert RefsMatcher(strings).sub('_%s_ (qv)', text) == regex_sub(strings, r'_\1_ (qv)', text)
+
+
+def test_refs_matcher_should_match_the_alternation_regex():
+    rnd = random.Random(42)
+    for i in range(1000):
+        strings = list(set(''.join(rnd.choice('ab c\xe8') for j in range(rnd.randint(1, 5)))
+                           for k in range(rnd.randint(1, 8))))
+        text = ''.join(rnd.choice('ab c\xe8.') for j in range(rnd.randint(0, 50)))
+        assert RefsMatcher(strings).sub("'%s' (qv)", text) == regex_sub(strings, r"'\1' (qv)", text)
+
+
+def test_refs_matcher_without_strings_should_be_false():
+    assert not RefsMatcher([])
+    assert RefsMatcher([]).sub('_%s_ (qv)', 'The Matrix') == 'The Matrix'
+
+
+def test_put_refs_should_modify_only_some_keys():
+    data = {'quotes': ['Neo: I know kung fu.'], 'title': 'Neo'}
+    _putRefs(data, RefsMatcher([]), RefsMatcher(['Neo']))
+    assert data == {'quotes': ["'Neo' (qv): I know kung fu."], 'title': 'Neo'}
+
+
+PAGE = '''<html><body>
+<p class="quote"><a href="/name/nm0000206/">Keanu Reeves</a> in
+<a href="/title/tt0133093/">The Matrix</a> (1999): Keanu Reeves says whoa.</p>
+<div><a href="/name/nm0000401/">Laurence <b>F.</b> Fishburne</a><!-- x --><i></i>
+<a href="/title/tt0234215/">The Matrix Reloaded</a><span>(2003) (V)</span>
+<a href="/title/tt0242653/">The Matrix Revolutions</a></div>
+</body></html>'''
+
+
+class QuotesParser(DOMParserBase):
+    _defGetRefs = True
+    rules = [
+        Rule(
+            key='quotes',
+            extractor=Path('//p[@class="quote"]//text()')
+        )
+    ]
+
+    def postprocess_data(self, data):
+        return {'quotes': [data['quotes']]}
+
+
+def test_gather_refs_should_match_gather_refs_parser():
+    parser = GatherRefs()
+    dom = parser.get_dom(PAGE)
+    refs = parser.postprocess_data(parser.parse_dom(dom))
+    names, titles = _gather_refs(dom)
+    assert list(names) == list(refs['names refs'])
+    assert list(titles) == list(refs['titles refs'])
+    assert [analyze_imdbid(link) for link in titles.values()] == \
+        [movie.movieID for movie in refs['titles refs'].values()]
+    assert list(titles) == ['The Matrix (1999)', 'The Matrix Reloaded (2003) (V)', 'The Matrix Revolutions']
+
+
+def test_parse_should_build_only_used_refs():
+    result = QuotesParser().parse(PAGE)
+    assert result['data']['quotes'] == \
+        ["'Keanu Reeves' (qv) in\n_The Matrix (1999)_ (qv): 'Keanu Reeves' (qv) says whoa."]
+    assert list(result['namesRefs']) == ['Keanu Reeves']
+    assert result['namesRefs']['Keanu Reeves'].personID == '0000206'
+    assert list(result['titlesRefs']) == ['The Matrix (1999)']
+    assert result['titlesRefs']['The Matrix (1999)'].movieID == '0133093'
@@ -0,0 +1,81 @@
+import time
+
+from pytest import fixture, raises
+
+from imdb import IMDb
+from imdb._exceptions import IMDbDataAccessError
+from imdb.parser.http.cache import CachedResponse, MemoryCache
+from imdb.parser.http.replay import ReplayServer
+
+try:
+    from urllib.error import HTTPError
+    from urllib.request import Request, urlopen
+except ImportError:
+    from urllib2 import HTTPError, Request, urlopen
+
+
+PAGE = '''<html><head>
+<meta property="og:title" content="The Matrix (1999)"/>
+<meta property="pageId" content="tt0133093"/>
+</head><body><table>
+<tr><td>Genres</td><td><ul><li><a href="/genre/Action">Action</a></li>
+<li><a href="/genre/Sci-Fi">Sci-Fi</a></li></ul></td></tr>
+</table></body></html>'''
+
+URL = 'https://www.imdb.com/title/tt0133093/reference'
+
+
+@fixture
+def replay():
+    servers = []
+
+    def start(**kwds):
+        cache = MemoryCache(ttl=None)
+        cache.set(CachedResponse(URL, PAGE.encode('utf-8'), charset='utf-8', etag='"matrix"'))
+        server = ReplayServer(cache, **kwds).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
+
+
+def _status(url, headers=None):
+    try:
+        return urlopen(Request(url, headers=headers or {}), timeout=10).getcode()
+    except HTTPError as e:
+        return e.code
+
+
+def test_access_system_should_retrieve_replayed_pages(replay):
+    server = replay()
+    ia = IMDb(imdbURL_base=server.url, maxRetries=0)
+    movie = ia.get_movie('0133093', info=['main'])
+    assert movie.get('title') == 'The Matrix'
+    assert movie.get('genres') == ['Action', 'Sci-Fi']
+    assert server.stats['served'] == 1
+
+
+def test_replay_should_answer_missing_pages_with_not_found(replay):
+    server = replay()
+    assert _status(server.url + 'title/tt0000001/reference') == 404
+    assert _status(server.url + 'title/tt0133093/reference', {'If-None-Match': '"matrix"'}) == 304
+    assert server.stats == {'requests': 2, 'missing': 1, 'not modified': 1}
+
+
+def test_replay_should_inject_errors(replay):
+    server = replay(errorRate=1, errorStatus=500)
+    ia = IMDb(imdbURL_base=server.url, maxRetries=0)
+    with raises(IMDbDataAccessError):
+        ia.urlOpener.retrieve_unicode(server.url + 'title/tt0133093/reference')
+    assert server.stats == {'requests': 1, 'errors': 1}
+
+
+def test_replay_should_throttle_and_delay_requests(replay):
+    server = replay(rateLimit=1, rateBurst=2, latency=0.05)
+    start = time.time()
+    statuses = [_status(server.url + 'title/tt0133093/reference') for _ in range(3)]
+    assert time.time() - start >= 0.15
+    assert statuses == [200, 200, 429]
+    assert server.stats['throttled'] == 1
@@ -0,0 +1,88 @@
+from imdb.parser.http import companyParser, movieParser, personParser
+from imdb.parser.http.movieParser import DOMHTMLMovieParser
+from imdb.parser.http.piculet import Rules
+
+
+PAGE = '''<html><head>
+<meta property="og:title" content="Amélie (2001)"/>
+<meta property="pageId" content="tt0211915"/>
+</head><body>
+<h1 class="header">Amélie <span>(2001)</span></h1>
+<table>
+<tr><td>Genres</td><td><ul><li><a href="/genre/Comedy">Comedy</a></li>
+<li><a href="/genre/Romance">Romance</a></li></ul></td></tr>
+<tr><td>Directed by</td><td><ul><li><a href="/name/nm0000466/">Jean-Pierre Jeunet</a></li></ul></td></tr>
+</table>
+<table class="cast_list">
+<tr class="odd"><td class="primary_photo"><a href="/name/nm0851582/"><img/></a></td>
+<td><a href="/name/nm0851582/">Audrey Tautou</a></td><td>...</td>
+<td class="character"><a href="/title/tt0211915/characters/nm0851582">Amélie Poulain</a></td></tr>
+<tr class="even"><td class="primary_photo"><a href="/name/nm0396558/"><img/></a></td>
+<td><a href="/name/nm0396558/">Mathieu Kassovitz</a></td><td>...</td>
+<td class="character">Nino Quincampoix</td></tr>
+</table>
+<span class="ipl-rating-star__rating">8.3</span>
+<span class="ipl-rating-star__total-votes">(700,000)</span>
+<div class="soda">Nothing to see here.</div>
+</body></html>'''
+
+
+def _parsers():
+    for module in (movieParser, personParser, companyParser):
+        for (cls,), _ in module._OBJECTS.values():
+            if cls.rules:
+                yield cls()
+
+
+def test_compiled_rules_should_match_the_extracted_data():
+    for parser in _parsers():
+        dom = parser.preprocess_dom(parser.get_dom(parser.preprocess_string(PAGE)))
+        assert parser.parse_dom(dom) == Rules(parser.rules).extract(dom)
+
+
+def test_compiled_rules_should_match_the_extracted_data_for_some_keys():
+    parser = DOMHTMLMovieParser()
+    data = parser.parse(PAGE, keys=['genres'])['data']
+    assert data['genres'] == ['Comedy', 'Romance']
+
+
+def test_compiled_rules_should_be_shared_by_the_instances():
+    first, second = DOMHTMLMovieParser(), DOMHTMLMovieParser()
+    assert first._get_rules_plan(first.rules) is second._get_rules_plan(second.rules)
+
+
+def test_compiled_rules_set_by_the_instance_should_be_reused():
+    parser = movieParser.DOMHTMLEpisodesParser()
+    assert 'rules' in vars(parser)
+    assert parser._get_rules_plan(parser.get_rules()) is parser._get_rules_plan(parser.get_rules())
+    other = movieParser.DOMHTMLEpisodesParser()
+    assert other._get_rules_plan(other.rules) is not parser._get_rules_plan(parser.rules)
+
+
+DETAILS = '''<html><body>
+<table class="titlereference-list">
+<tr><td class="label">Genres</td><td><ul><li><a href="/genre/Comedy">Comedy</a></li>
+<li><a href="/genre/Romance">Romance</a></li></ul></td></tr>
+<tr><td class="label">Runtime</td><td><ul><li>122 min</li></ul></td></tr>
+<tr><td class="label"><!-- countries -->Countries</td><td><ul><li><a href="/country/fr">France</a></li>
+<li><a href="/country/de">Germany</a></li></ul></td></tr>
+<tr><td class="label"><b>Language</b></td><td><ul><li><a href="/language/fr">French</a></li></ul></td></tr>
+<tr><td class="label">Color</td><td><ul><li><a href="/color">Color (Eastmancolor)</a></li></ul></td></tr>
+<tr><td class="label">Aspect Ratio</td><td><ul><li>2.35 : 1</li></ul></td></tr>
+</table>
+<table><tr><td>Sound Mix</td><td><ul><li><a href="/sound/dts">DTS</a></li></ul></td></tr>
+<tr><td>Sound Mix</td><td><ul><li><a href="/sound/dolby">Dolby Digital (5.1)</a></li></ul></td></tr></table>
+<table><tr><td>Color</td><td><ul><li><a href="/color/bw">Black and White</a></li></ul></td></tr></table>
+</body></html>'''
+
+
+def test_labelled_rules_should_match_the_extracted_data():
+    parser = DOMHTMLMovieParser()
+    dom = parser.preprocess_dom(parser.get_dom(parser.preprocess_string(DETAILS)))
+    data = parser.parse_dom(dom)
+    assert data == Rules(parser.rules).extract(dom)
+    assert data['genres'] == ['Comedy', 'Romance']
+    assert data['country codes'] == ['fr', 'de']
+    assert data['color info'] == ['Color::(Eastmancolor)', 'Black and White']
+    assert data['sound mix'] == ['DTS', 'Dolby Digital::(5.1)']
+    assert 'language' not in data
@@ -0,0 +1,44 @@
+import gzip
+from io import BytesIO
+
+from imdb.parser.http import read_content
+from imdb.parser.http.searchMovieParser import DOMHTMLSearchMovieParser
+
+
+ROWS = ''.join(
+    '<tr><td class="primary_photo"><a href="/title/tt%07d/"><img src="http://img/%d.jpg"/></a></td>'
+    '<td class="result_text"> <a href="/title/tt%07d/">Movie&nbsp;%d</a> (%d) <i>"Aka %d"</i></td></tr>'
+    % (i, i, i, i, 1950 + i, i) for i in range(1, 101)
+)
+
+PAGE = ('<html><head><title>Find</title></head><body><table class="findList">%s</table>%s</body></html>'
+        % (ROWS, '<div>footer</div>' * 10000)).encode('utf-8')
+
+
+def test_search_stream_should_return_the_first_results():
+    parser = DOMHTMLSearchMovieParser()
+    full = parser.parse(PAGE.decode('utf-8'))['data']
+    stream = parser.get_stream(10)
+    content = read_content(BytesIO(PAGE), None, stream)
+    assert stream.stopped
+    assert len(content) < len(PAGE)
+    assert parser.parse_stream(stream)['data'][:10] == full[:10]
+
+
+def test_search_stream_should_read_compressed_pages():
+    parser = DOMHTMLSearchMovieParser()
+    full = parser.parse(PAGE.decode('utf-8'))['data']
+    stream = parser.get_stream(5)
+    read_content(BytesIO(gzip.compress(PAGE)), 'gzip', stream)
+    assert stream.stopped
+    assert parser.parse_stream(stream)['data'][:5] == full[:5]
+
+
+def test_search_stream_should_read_the_whole_page_with_few_results():
+    parser = DOMHTMLSearchMovieParser()
+    full = parser.parse(PAGE.decode('utf-8'))['data']
+    stream = parser.get_stream(200)
+    content = read_content(BytesIO(PAGE), None, stream)
+    assert not stream.stopped
+    assert content == PAGE
+    assert parser.parse_stream(stream)['data'] == full
@@ -0,0 +1,129 @@
+from pytest import raises
+
+import time
+
+from imdb._exceptions import IMDbDataAccessError
+from imdb.parser.http import IMDbURLopener
+from imdb.parser.http.throttling import (CircuitBreaker, RetryPolicy, TokenBucket,
+                                         get_error_info, parse_retry_after)
+
+
+def test_retry_policy_should_retry_transient_errors_only():
+    policy = RetryPolicy()
+    assert policy.is_transient(None)
+    assert policy.is_transient(429)
+    assert policy.is_transient(503)
+    assert not policy.is_transient(404)
+
+
+def test_retry_policy_should_stop_after_max_retries():
+    policy = RetryPolicy(maxRetries=2, backoff=1)
+    assert 0 <= policy.get_delay(0) <= 1
+    assert 0 <= policy.get_delay(1) <= 2
+    assert policy.get_delay(2) is None
+
+
+def test_retry_policy_should_honor_retry_after():
+    policy = RetryPolicy(maxBackoff=10)
+    assert policy.get_delay(0, retryAfter=7) == 7
+    assert policy.get_delay(0, retryAfter=600) is None
+
+
+def test_parse_retry_after_should_read_seconds_and_dates():
+    assert parse_retry_after('120') == 120
+    assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0
+    assert parse_retry_after(None) is None
+
+
+def test_get_error_info_should_read_http_status():
+    error = IMDbDataAccessError({'errcode': 503, 'error type': 'http_error_default',
+                                 'headers': {'Retry-After': '3'}})
+    assert get_error_info(error) == (503, 3)
+
+
+def test_get_error_info_should_ignore_errno():
+    error = IMDbDataAccessError({'errcode': 111, 'errmsg': 'Connection refused'})
+    assert get_error_info(error) == (None, None)
+
+
+def test_token_bucket_should_limit_rate():
+    bucket = TokenBucket(rate=100, burst=1)
+    start = time.time()
+    for i in range(11):
+        bucket.acquire()
+    assert time.time() - start >= 0.09
+
+
+def test_token_bucket_should_slow_down_when_throttled():
+    bucket = TokenBucket(rate=10)
+    bucket.throttle()
+    assert bucket.rate == 5
+    bucket.success()
+    assert 5 < bucket.rate <= 10
+
+
+def test_circuit_breaker_should_open_after_consecutive_failures():
+    breaker = CircuitBreaker(threshold=2, recoveryTimeout=60)
+    breaker.failure()
+    breaker.check('http://example.com/')
+    breaker.failure()
+    with raises(IMDbDataAccessError):
+        breaker.check('http://example.com/')
+    breaker.success()
+    breaker.check('http://example.com/')
+
+
+def test_circuit_breaker_should_let_a_single_trial_request_through():
+    breaker = CircuitBreaker(threshold=1, recoveryTimeout=0.05)
+    breaker.failure()
+    with raises(IMDbDataAccessError):
+        breaker.check('http://example.com/')
+    time.sleep(0.06)
+    breaker.check('http://example.com/')
+    with raises(IMDbDataAccessError):
+        breaker.check('http://example.com/')
+    breaker.failure()
+    with raises(IMDbDataAccessError):
+        breaker.check('http://example.com/')
+    time.sleep(0.06)
+    breaker.check('http://example.com/')
+    breaker.success()
+    breaker.check('http://example.com/')
+    breaker.check('http://example.com/')
+
+
+def _failing_opener(threshold):
+    opener = IMDbURLopener()
+    opener.retryPolicy = RetryPolicy(maxRetries=2, backoff=0)
+    opener.failureThreshold = threshold
+    calls = []
+
+    def fetch(url, size, headers):
+        calls.append(url)
+        raise IMDbDataAccessError({'errcode': 503, 'error type': 'http_error_default', 'url': url})
+    return opener, fetch, calls
+
+
+def test_circuit_breaker_should_count_failed_requests_not_attempts():
+    opener, fetch, calls = _failing_opener(threshold=2)
+    with raises(IMDbDataAccessError):
+        opener.fetch_with_retries(fetch, 'http://example.com/1')
+    assert len(calls) == 3
+    opener.get_circuit_breaker('example.com').check('http://example.com/')
+    with raises(IMDbDataAccessError):
+        opener.fetch_with_retries(fetch, 'http://example.com/2')
+    with raises(IMDbDataAccessError) as e:
+        opener.fetch_with_retries(fetch, 'http://example.com/3')
+    assert e.value.args[0]['error type'] == 'circuit breaker open'
+    assert len(calls) == 6
+
+
+def test_circuit_breaker_should_not_be_shared_between_openers():
+    opener, fetch, calls = _failing_opener(threshold=1)
+    with raises(IMDbDataAccessError):
+        opener.fetch_with_retries(fetch, 'http://example.com/')
+    with raises(IMDbDataAccessError):
+        opener.get_circuit_breaker('example.com').check('http://example.com/')
+    other = IMDbURLopener()
+    other.get_circuit_breaker('example.com').check('http://example.com/')
+    assert other.fetch_with_retries(lambda url, size, headers: 'ok', 'http://example.com/') == 'ok'
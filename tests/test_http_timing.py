@@ -0,0 +1,75 @@
+from imdb.parser.http import IMDbURLopener, timing
+from imdb.parser.http.movieParser import DOMHTMLMovieParser
+from imdb.parser.http.piculet import Rules
+from imdb.parser.http.timing import TimingStats
+
+
+PAGE = '''<html><head>
+<meta property="og:title" content="Amélie (2001)"/>
+<meta property="pageId" content="tt0211915"/>
+</head><body><table>
+<tr><td>Genres</td><td><ul><li><a href="/genre/Comedy">Comedy</a></li>
+<li><a href="/genre/Romance">Romance</a></li></ul></td></tr>
+</table>
+<span class="ipl-rating-star__rating">8.3</span>
+<span class="ipl-rating-star__total-votes">(700,000)</span>
+</body></html>'''
+
+
+def _timed(funct, *args, **kwds):
+    stats = TimingStats()
+    timing.set_stats(stats)
+    try:
+        return funct(*args, **kwds), stats
+    finally:
+        timing.set_stats(None)
+
+
+def test_parse_should_record_the_stages_and_the_rules():
+    parser = DOMHTMLMovieParser()
+    result, stats = _timed(parser.parse, PAGE, getRefs=True)
+    assert result == parser.parse(PAGE, getRefs=True)
+    stages = stats.get_stats()
+    for stage in ('preprocess', 'dom', 'preprocess_dom', 'gather_refs', 'rules', 'postprocess', 'add_refs'):
+        assert stages[(stage, 'DOMHTMLMovieParser')]['calls'] == 1
+    assert stages[('preprocess', 'DOMHTMLMovieParser')]['bytes'] == len(PAGE)
+    rules = stats.get_stats('rule')
+    assert rules['DOMHTMLMovieParser:genres']['items'] == 2
+    assert rules['DOMHTMLMovieParser:cast']['items'] == 0
+    assert all(entry['wall'] >= 0 and entry['cpu'] >= 0 for entry in rules.values())
+
+
+def test_extract_should_record_the_rules():
+    parser = DOMHTMLMovieParser()
+    dom = parser.get_dom(PAGE)
+    data, stats = _timed(Rules(parser.rules).extract, dom)
+    assert data == Rules(parser.rules).extract(dom)
+    rules = stats.get_stats('rule')
+    assert [entry['items'] for name, entry in rules.items() if name.endswith(':genres')] == [2]
+
+
+def test_nothing_should_be_recorded_when_disabled():
+    stats = TimingStats()
+    timing.set_stats(stats)
+    timing.set_stats(None)
+    DOMHTMLMovieParser().parse(PAGE)
+    assert stats.get_stats() == {}
+    assert timing.start('test') is None
+
+
+def test_retrieve_should_record_the_kind_of_page():
+    def fetch(url, size=-1, headers=None):
+        return b'<html></html>', 'utf-8', {}, url, 200
+    opener = IMDbURLopener()
+    records = []
+    stats = TimingStats(callback=lambda *record: records.append(record))
+    timing.set_stats(stats)
+    try:
+        content, charset = opener.retrieve('https://www.imdb.com/title/tt0211915/reference', fetch=fetch)
+        opener.decode_content(content, charset)
+    finally:
+        timing.set_stats(None)
+    assert [record[:2] for record in records] == [('retrieve', '/title/tt#/reference'),
+                                                  ('decode', '/title/tt#/reference')]
+    entry = stats.get_stats('retrieve')['/title/tt#/reference']
+    assert (entry['calls'], entry['bytes']) == (1, 13)